@@ -0,0 +1,97 @@
+"""
+Tiny threaded HTTP/1.1 server used by the benchmarks to stand in for
+remote APIs. Keep-alive is supported so pooled clients can reuse sockets.
+The server runs in a forked process so it does not compete with the
+client under test for the GIL.
+"""
+import json
+import multiprocessing
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(routes, latency=0.0):
+    """
+    routes: {(method, path_prefix): callable(handler, body) -> (status, dict|bytes, headers)}
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _dispatch(self, method):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+
+            for (route_method, prefix), fn in routes.items():
+                if route_method == method and self.path.startswith(prefix):
+                    if latency:
+                        time.sleep(latency)
+                    status, payload, headers = fn(self, body)
+                    break
+            else:
+                status, payload, headers = 404, {"error": "not found"}, {}
+
+            if not isinstance(payload, (bytes, bytearray)):
+                payload = json.dumps(payload).encode()
+                headers = {"Content-Type": "application/json", **headers}
+
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class FakeServer:
+    def __init__(self, routes, latency=0.0):
+        self.httpd = _Server(("127.0.0.1", 0), make_handler(routes, latency))
+        self.process = multiprocessing.get_context("fork").Process(
+            target=self.httpd.serve_forever,
+            daemon=True
+        )
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.process.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.join()
+        self.httpd.server_close()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name, samples_ms):
+    print(
+        f"{name:<32} n={len(samples_ms):<5} "
+        f"p50={percentile(samples_ms, 50):7.2f} ms  "
+        f"p99={percentile(samples_ms, 99):7.2f} ms"
+    )
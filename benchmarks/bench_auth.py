@@ -0,0 +1,81 @@
+"""
+Signup / login throughput through the auth router.
+
+    python -m benchmarks.bench_auth --users 200 --concurrency 20
+    python -m benchmarks.bench_auth --memory
+
+Requests go through the real FastAPI app in-process (httpx ASGI
+transport). By default the repositories talk to MONGO_URI (a local
+mongod is fine; the benchmark uses its own database and drops it);
+--memory swaps in the dict-backed stand-in from tests/conftest.py so only
+the handler, bcrypt and JWT costs are measured.
+"""
+import argparse
+import asyncio
+import time
+import httpx
+from fastapi import FastAPI
+
+from benchmarks._fake_server import report
+from src.db import mongo
+from src.db.repositories import UsersRepository
+from src.routers.auth import router as auth_router
+from tests.conftest import MemoryDB
+
+
+async def run(client, path, payloads, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one(payload):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(path, json=payload)
+            samples.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.text
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(p) for p in payloads))
+    return samples, time.perf_counter() - start
+
+
+async def main_async(args):
+    app = FastAPI()
+    app.include_router(auth_router)
+
+    if args.memory:
+        db = MemoryDB()
+        app.dependency_overrides[mongo.get_users_repository] = lambda: UsersRepository(db)
+    else:
+        await mongo.connect_mongo(db_name=args.db)
+
+    payloads = [
+        {"email": f"bench{i}@example.com", "password": f"password-{i}"}
+        for i in range(args.users)
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for path in ("/auth/signup", "/auth/login"):
+                samples, elapsed = await run(client, path, payloads, args.concurrency)
+                report(path, samples)
+                print(f"{'':<32} throughput={len(samples) / elapsed:7.1f} req/s")
+    finally:
+        if not args.memory:
+            await mongo.get_db().client.drop_database(args.db)
+            mongo.close_mongo()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--memory", action="store_true")
+    parser.add_argument("--db", default="autopilot_bench")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
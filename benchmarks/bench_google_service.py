@@ -0,0 +1,49 @@
+"""
+Per-call overhead of obtaining a Gmail service object.
+
+    python -m benchmarks.bench_google_service --calls 200
+
+Uses the discovery document bundled with google-api-python-client
+(static discovery), so no network access is needed.
+"""
+import argparse
+import time
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from benchmarks._fake_server import report
+from src.utils.google_services import get_service, invalidate_services
+
+
+def bench(fn, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--api", default="gmail")
+    parser.add_argument("--version", default="v1")
+    args = parser.parse_args()
+
+    creds = Credentials(token="bench-token", refresh_token="bench-refresh", client_id="bench")
+
+    report(
+        f"build({args.api}) per call",
+        bench(lambda: build(args.api, args.version, credentials=creds, cache_discovery=False), args.calls)
+    )
+
+    invalidate_services()
+    report(
+        f"get_service({args.api}) cached",
+        bench(lambda: get_service(args.api, args.version, creds), args.calls)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Cost of the get_current_user dependency per request.
+
+    python -m benchmarks.bench_jwt --calls 10000 --sessions 100
+
+Replays --calls requests spread over --sessions distinct tokens (as a
+busy worker at ~10k req/s would see within a second) through the
+dependency with the verified-token cache, and the same calls through a
+full python-jose decode for comparison.
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from jose import jwt
+
+from benchmarks._fake_server import report
+from src.auth.dependencies import get_current_user
+from src.auth.jwt import create_access_token, _verification_key, _verified
+from src.utils.config import JWT_ALGORITHM
+
+
+def bench(fn, tokens, calls):
+    samples = []
+    start = time.perf_counter()
+    for i in range(calls):
+        token = tokens[i % len(tokens)]
+        t0 = time.perf_counter()
+        fn(token)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples, time.perf_counter() - start
+
+
+def full_decode(token):
+    return jwt.decode(token, _verification_key(token), algorithms=[JWT_ALGORITHM])["user_id"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=10000)
+    parser.add_argument("--sessions", type=int, default=100)
+    args = parser.parse_args()
+
+    tokens = [create_access_token({"user_id": f"user-{i}"}) for i in range(args.sessions)]
+
+    for name, fn in (("full decode per call", full_decode), ("get_current_user cached", get_current_user)):
+        _verified.clear()
+        samples, elapsed = bench(fn, tokens, args.calls)
+        report(name, samples)
+        print(f"{'':<32} {args.calls / elapsed:,.0f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Per-hop latency of Perplexity calls against a local fake completions server.
+
+    python -m benchmarks.bench_llm_transport --requests 500 --latency 0.005
+
+Compares a bare requests.post (new connection per hop, the old behaviour)
+with the pooled sync session and the shared async client. The response
+cache is bypassed so every hop goes over the wire.
+"""
+import argparse
+import asyncio
+import os
+import time
+import requests
+
+from benchmarks._fake_server import FakeServer, report
+
+COMPLETION = {
+    "choices": [{"message": {"content": '{"agent": "none", "message": "hi"}'}}]
+}
+
+
+def completions(handler, body):
+    return 200, COMPLETION, {}
+
+
+def bench_bare(url, n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        requests.post(url, json={"messages": []}).json()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def bench_pooled(llm, n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        llm.call_perplexity_api("system", "user")
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def bench_async(llm, n, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await llm.acall_perplexity_api("system", "user")
+            samples.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(n)))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    with FakeServer({("POST", "/chat/completions"): completions}, args.latency) as server:
+        url = f"{server.url}/chat/completions"
+        os.environ["PPLX_API_URL"] = url
+        os.environ.setdefault("PPLX_API_KEY", "bench")
+
+        from src.core import llm as llm_module
+        from src.core.http import aclose_async_client
+        llm_module.PerplexityLLM._log_response = lambda *a: None
+        llm = llm_module.PerplexityLLM()
+
+        report("bare requests.post", bench_bare(url, args.requests))
+        report("pooled session", bench_pooled(llm, args.requests))
+
+        async def run_async():
+            try:
+                return await bench_async(llm, args.requests, args.concurrency)
+            finally:
+                await aclose_async_client()
+
+        start = time.perf_counter()
+        samples = asyncio.run(run_async())
+        elapsed = time.perf_counter() - start
+        report(f"async client (c={args.concurrency})", samples)
+        print(f"async throughput: {len(samples) / elapsed:.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Login storm vs. concurrent /chat latency.
+
+    python -m benchmarks.bench_password --logins 200 --chats 200
+    PASSWORD_HASH_WORKERS=0 python -m benchmarks.bench_password   # thread offload, for comparison
+
+Runs the real app in-process (httpx ASGI transport) with the auth
+repositories on the in-memory stand-in from bench_auth and Perplexity
+pointed at a local fake server, so /chat costs one routing round trip.
+Reports logins/sec, how many logins were shed with 503, and /chat
+p50/p99 alone and during the storm.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import httpx
+
+from benchmarks._fake_server import FakeServer, report
+
+
+def _pplx(handler, body):
+    reply = {"choices": [{"message": {"content": json.dumps({"agent": "none", "message": "hi"})}}]}
+    return 200, json.dumps(reply).encode(), {"Content-Type": "application/json"}
+
+
+async def chat_traffic(client, count, concurrency, tag):
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/chat", json={"message": f"{tag} small talk {i}"})
+            samples.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.text
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return samples
+
+
+async def login_storm(client, users, count, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = []
+
+    async def one(i):
+        async with semaphore:
+            response = await client.post("/auth/login", json=users[i % len(users)])
+            statuses.append(response.status_code)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return statuses, time.perf_counter() - start
+
+
+async def main_async(args):
+    # Imported here: settings are read at import, after main() sets the env
+    from main import app
+    from tests.conftest import MemoryDB
+    from src.db import mongo
+    from src.db.repositories import UsersRepository
+    from src.auth.password import hash_password, shutdown_password_pool
+
+    db = MemoryDB()
+    app.dependency_overrides[mongo.get_users_repository] = lambda: UsersRepository(db)
+
+    users = [{"email": f"storm{i}@example.com", "password": f"password-{i}"} for i in range(args.users)]
+    for user in users:
+        await db.users.insert_one({"email": user["email"], "password": hash_password(user["password"])})
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        report("/chat alone", await chat_traffic(client, args.chats, args.chat_concurrency, "alone"))
+
+        chats = asyncio.create_task(chat_traffic(client, args.chats, args.chat_concurrency, "storm"))
+        statuses, elapsed = await login_storm(client, users, args.logins, args.login_concurrency)
+        report("/chat during login storm", await chats)
+
+    ok = statuses.count(200)
+    print(f"logins: {ok} ok, {statuses.count(503)} shed (503) in {elapsed:.2f}s -> {ok / elapsed:.1f} logins/s")
+    shutdown_password_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--login-concurrency", type=int, default=50)
+    parser.add_argument("--chats", type=int, default=200)
+    parser.add_argument("--chat-concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.02, help="fake Perplexity latency (s)")
+    args = parser.parse_args()
+
+    with FakeServer({("POST", "/pplx"): _pplx}, latency=args.latency) as server:
+        os.environ.setdefault("PPLX_API_KEY", "bench")
+        os.environ["PPLX_API_URL"] = server.url + "/pplx"
+        os.environ.setdefault("JWT_SECRET", "bench")
+        os.environ["LLM_CACHE_ENABLED"] = "false"
+        os.environ["FAST_ROUTER_ENABLED"] = "false"
+        asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+read_emails metadata fetch: sequential messages.get vs the batch endpoint,
+against a local fake Gmail server with injected per-request latency.
+
+    python -m benchmarks.bench_read_emails --messages 20 --latency 0.05
+"""
+import argparse
+import json
+import os
+import re
+import time
+import googleapiclient
+import httplib2
+from googleapiclient.discovery import build_from_document
+
+from benchmarks._fake_server import FakeServer
+from src.tools.read_emails import list_message_ids, fetch_message_metadata
+
+DISCOVERY_DOC = os.path.join(
+    os.path.dirname(googleapiclient.__file__),
+    "discovery_cache", "documents", "gmail.v1.json"
+)
+
+
+def message(message_id):
+    return {
+        "id": message_id,
+        "snippet": f"snippet {message_id}",
+        "payload": {"headers": [
+            {"name": "From", "value": "Bench <bench@example.com>"},
+            {"name": "Subject", "value": f"Subject {message_id}"},
+            {"name": "Date", "value": "Mon, 13 Jan 2025 10:00:00 +0000"},
+        ]},
+    }
+
+
+def make_routes(total):
+    def list_messages(handler, body):
+        return 200, {"messages": [{"id": f"m{i}"} for i in range(total)]}, {}
+
+    def get_message(handler, body):
+        message_id = handler.path.split("?")[0].rsplit("/", 1)[-1]
+        return 200, message(message_id), {}
+
+    def batch(handler, body):
+        boundary = re.search(r'boundary="?([^";]+)"?', handler.headers["Content-Type"]).group(1)
+        parts = []
+        for part in body.decode().split(f"--{boundary}")[1:-1]:
+            content_id = re.search(r"Content-ID: <(.+?)>", part).group(1)
+            message_id = re.search(r"GET \S+/messages/([^?\s]+)", part).group(1)
+            parts.append(
+                f"--batch_bench\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n"
+                f"{json.dumps(message(message_id))}\r\n"
+            )
+        payload = ("".join(parts) + "--batch_bench--\r\n").encode()
+        return 200, payload, {"Content-Type": "multipart/mixed; boundary=batch_bench"}
+
+    return {
+        ("GET", "/gmail/v1/users/me/messages/"): get_message,
+        ("GET", "/gmail/v1/users/me/messages"): list_messages,
+        ("POST", "/batch"): batch,
+    }
+
+
+def build_service(root_url):
+    with open(DISCOVERY_DOC) as f:
+        doc = json.load(f)
+    doc["rootUrl"] = f"{root_url}/"
+    return build_from_document(doc, http=httplib2.Http())
+
+
+def sequential(service, ids):
+    return [
+        service.users().messages().get(
+            userId="me", id=message_id, format="metadata",
+            metadataHeaders=["From", "Subject", "Date"]
+        ).execute()
+        for message_id in ids
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with FakeServer(make_routes(args.messages), args.latency) as server:
+        service = build_service(server.url)
+        ids = list_message_ids(service, "is:unread", args.messages)
+
+        for name, fn in (("sequential get", sequential), ("batch endpoint", fetch_message_metadata)):
+            timings = []
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                result = fn(service, ids)
+                timings.append((time.perf_counter() - start) * 1000)
+            assert [m["id"] for m in result] == ids
+            print(f"{name:<16} {len(ids)} messages  mean={sum(timings) / len(timings):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
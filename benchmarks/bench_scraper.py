@@ -0,0 +1,94 @@
+"""
+HTML → markdown conversion: time and peak memory per page.
+
+    python -m benchmarks.bench_scraper [corpus_dir]
+
+corpus_dir holds saved *.html pages. Without it, synthetic pages of
+increasing size are generated. Each conversion runs in a forked child
+so peak RSS is measured per page.
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import re
+import resource
+import time
+import html2text
+from bs4 import BeautifulSoup
+
+from src.core.config import SCRAPE_MAX_BYTES
+from src.tools.scrape_website import html_to_markdown, HTMLParser, BS4_PARSER
+
+
+def legacy_convert(html):
+    # The original implementation: html.parser + prettify + html2text
+    soup = BeautifulSoup(html, "html.parser")
+    html_content = soup.prettify()
+    h = html2text.HTML2Text()
+    h.ignore_links = False
+    h.ignore_images = True
+    h.ignore_tables = True
+    markdown_content = h.handle(html_content)
+    return re.sub(r"\n{3,}", "\n\n", markdown_content).strip()
+
+
+def new_convert(html):
+    # fetch_html stops reading at SCRAPE_MAX_BYTES; apply the same cap here
+    return html_to_markdown(html.encode()[:SCRAPE_MAX_BYTES].decode(errors="ignore"))
+
+
+def synthetic_page(size_bytes):
+    paragraph = "<p>Lorem ipsum <a href='/x'>dolor</a> sit amet, consectetur adipiscing elit.</p>\n"
+    nav = "<nav>" + "<a href='/n'>menu</a>" * 50 + "</nav>"
+    script = "<script>" + "var x = 1;" * 500 + "</script>"
+    body = paragraph * (size_bytes // len(paragraph))
+    return f"<html><head>{script}</head><body>{nav}<main>{body}</main><footer>f</footer></body></html>"
+
+
+def _measure(fn, html, queue):
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    output = fn(html)
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, (peak_rss - start_rss) / 1024, len(output)))
+
+
+def measure(fn, html):
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(fn, html, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus", nargs="?")
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(args.corpus, "*.html"))):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((os.path.basename(path), f.read()))
+    else:
+        pages = [(f"synthetic-{kb}KB", synthetic_page(kb * 1024)) for kb in (100, 1024, 5 * 1024)]
+
+    backend = "selectolax" if HTMLParser is not None else f"bs4/{BS4_PARSER}"
+    print(f"new backend: {backend}")
+
+    for name, html in pages:
+        for label, fn in (("legacy", legacy_convert), ("new", new_convert)):
+            elapsed, peak_mb, out_len = measure(fn, html)
+            print(
+                f"{name:<24} {label:<7} {elapsed * 1000:9.1f} ms  "
+                f"peak +{peak_mb:7.1f} MB  output {out_len:>9} chars"
+            )
+
+
+if __name__ == "__main__":
+    main()
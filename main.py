@@ -1,14 +1,50 @@
+import json
 import uvicorn
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
+from fastapi.responses import StreamingResponse
+from typing import Optional
 from pydantic import BaseModel
 from src.agents.personal_assistant import PersonalAssistant
+from src.auth.dependencies import get_optional_user
+from src.core.context import current_user_id
+from src.agents.news_pipeline import get_news_pipeline, close_news_pipeline
+from src.agents.news_prewarm import NewsPrewarmer
+from src.core.config import NEWS_PREWARM_ENABLED
+from src.core.http import aclose_async_client, close_session
+from src.core.metrics import metrics
+from src.core.resilience import shutdown_executors
+from src.tools.scrape_websites import shutdown_convert_pool
+from src.db.mongo import connect_mongo, close_mongo
+from src.auth.jwt import check_signing_config
+from src.auth.password import shutdown_password_pool
 from src.routers.auth import router as auth_router
 from src.routers.google_oauth import router as google_router
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
 assistant = PersonalAssistant()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    check_signing_config()
+    await connect_mongo()
+    prewarmer = NewsPrewarmer(get_news_pipeline())
+    if NEWS_PREWARM_ENABLED:
+        prewarmer.start()
+    yield
+    await prewarmer.stop()
+    await aclose_async_client()
+    close_session()
+    shutdown_convert_pool()
+    close_news_pipeline()
+    close_mongo()
+    shutdown_password_pool()
+    shutdown_executors()
+
+
+app = FastAPI(lifespan=lifespan)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -22,10 +58,34 @@ app.include_router(google_router)
 class Query(BaseModel):
     message: str
 
+# Signed-in users get their own Google account; anonymous requests get
+# none unless ALLOW_ANONYMOUS_GOOGLE opts them into the server's token files.
 @app.post("/chat")
-def chat(data: Query):
-    result = assistant.invoke(data.message)
+async def chat(data: Query, user_id: Optional[str] = Depends(get_optional_user)):
+    current_user_id.set(user_id)
+    result = await assistant.ainvoke(data.message)
     return {"reply": result}
 
+@app.post("/chat/stream")
+async def chat_stream(data: Query, user_id: Optional[str] = Depends(get_optional_user)):
+    async def events():
+        # Set inside the generator: the body is iterated after the handler returns
+        current_user_id.set(user_id)
+        try:
+            async for event in assistant.astream(data.message):
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/metrics")
+def get_metrics():
+    return metrics.snapshot()
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,299 @@
+"""
+Handlers for every action the executor can run, registered with
+src.agents.actions. Payload models describe what the agents emit in
+their "data" object.
+"""
+from datetime import datetime, timedelta
+from typing import List, Literal, Optional, Union
+from urllib.parse import urlparse
+from pydantic import BaseModel, Field, model_validator
+from src.agents.actions import register_action
+from src.core.config import SCRAPE_MAX_URLS
+from src.tools.add_event_calendar import add_event_to_calendar
+from src.tools.get_calendar_events import get_calendar_events
+from src.tools.send_email import send_email
+from src.tools.read_emails import read_emails
+from src.tools.search_web import search_web_results, format_results
+from src.tools.scrape_website import scrape_website_to_markdown
+from src.tools.scrape_websites import ascrape_urls
+from src.tools.find_contact_email import find_contact_email
+from src.agents.news_pipeline import get_news_pipeline, cache_age
+from src.utils.presentation_builder import PresentationBuilder
+
+
+def parse_date_time(date_str: str, time_str: str):
+    """
+    date_str: 'today' | 'tomorrow' | '2025-12-12'
+    time_str: '9:00 PM' | '21:00'
+    returns ISO 8601 string (local tz)
+    """
+    now = datetime.now()
+
+    # Resolve date
+    if not date_str:
+        day = now.date()
+    elif date_str.lower() == "today":
+        day = now.date()
+    elif date_str.lower() == "tomorrow":
+        day = (now + timedelta(days=1)).date()
+    else:
+        day = datetime.fromisoformat(date_str).date()
+
+    # Resolve time
+    if not time_str:
+        dt_time = now.time()
+    else:
+        try:
+            dt_time = datetime.strptime(time_str.strip(), "%I:%M %p").time()
+        except ValueError:
+            try:
+                dt_time = datetime.strptime(time_str.strip(), "%I %p").time()
+            except ValueError:
+                dt_time = datetime.strptime(time_str.strip(), "%H:%M").time()
+
+    local_dt = datetime.combine(day, dt_time)
+    return local_dt.astimezone().isoformat()
+
+
+# ---------------- CALENDAR ----------------
+
+class CreateSchedulePayload(BaseModel):
+    title: str = "Untitled Event"
+    description: str = ""
+    date: str = "today"
+    time: str = "9:00 AM"
+
+
+@register_action("create_schedule", CreateSchedulePayload, upstream="calendar", timeout=30)
+def run_create_schedule(params: CreateSchedulePayload):
+    start_iso = parse_date_time(params.date, params.time)
+
+    result = add_event_to_calendar.invoke({
+        "title": params.title,
+        "description": params.description,
+        "start_time": start_iso
+    })
+
+    return {
+        "status": "event_created",
+        "details": result
+    }
+
+
+class ListEventsPayload(BaseModel):
+    start_date: str
+    end_date: str
+
+
+@register_action("list_events", ListEventsPayload, upstream="calendar", timeout=30)
+def run_list_events(params: ListEventsPayload):
+    events = get_calendar_events.invoke({
+        "start_date": params.start_date,
+        "end_date": params.end_date
+    })
+
+    return {
+        "status": "calendar_events",
+        "events": events
+    }
+
+
+# ---------------- EMAIL ----------------
+
+class SendEmailPayload(BaseModel):
+    to: Union[str, List[str]] = []
+    subject: str = "No Subject"
+    body: str = ""
+    mode: Literal["individual", "to", "bcc"] = "individual"
+
+
+@register_action("send_email", SendEmailPayload, upstream="gmail", timeout=120)
+def run_send_email(params: SendEmailPayload):
+    recipients = [params.to] if isinstance(params.to, str) else params.to
+
+    result = send_email.invoke({
+        "to": recipients,
+        "subject": params.subject,
+        "body": params.body,
+        "mode": params.mode
+    })
+
+    if result["status"] == "success":
+        return {
+            "status": "emails_sent",
+            "results": result["sent"]
+        }
+
+    response = {
+        "status": result["status"],
+        "results": result["sent"]
+    }
+    if result["status"] == "error":
+        response["error"] = "No emails were sent"
+    return response
+
+
+class ReadEmailsPayload(BaseModel):
+    from_date: str
+    to_date: str
+    email: Optional[str] = None
+
+
+@register_action("read_emails", ReadEmailsPayload, upstream="gmail", timeout=60)
+def run_read_emails(params: ReadEmailsPayload):
+    result = read_emails.invoke({
+        "from_date": params.from_date,
+        "to_date": params.to_date,
+        "email": params.email
+    })
+
+    human_text = PresentationBuilder.build(result)
+
+    return {
+        "status": "emails_fetched",
+        "emails": human_text
+    }
+
+
+class SummarizeEmailsPayload(BaseModel):
+    count: int = 5
+
+
+@register_action("summarize_emails", SummarizeEmailsPayload, upstream="gmail", timeout=60)
+def run_summarize_emails(params: SummarizeEmailsPayload):
+    now = datetime.now()
+    from_date = (now - timedelta(hours=24)).isoformat()
+    to_date = now.isoformat()
+
+    emails = read_emails.invoke({
+        "from_date": from_date,
+        "to_date": to_date,
+        "email": None
+    })
+
+    if isinstance(emails, dict) and "error" in emails:
+        return {
+            "status": "emails_summary",
+            "error": emails["error"]
+        }
+
+    latest = emails[:params.count]
+
+    return {
+        "status": "emails_summary",
+        "count": len(latest),
+        "summary": PresentationBuilder.build(latest)
+    }
+
+
+# ---------------- RESEARCH ----------------
+
+class SearchWebPayload(BaseModel):
+    query: str
+
+
+# Results are cached inside search_web_results with a query-aware TTL.
+@register_action("search_web", SearchWebPayload, upstream="tavily", timeout=30)
+def run_search_web(params: SearchWebPayload):
+    try:
+        items = search_web_results(params.query)
+    except Exception as e:
+        return {"error": f"Web search failed: {e}"}
+
+    return {
+        "status": "web_search",
+        "query": params.query,
+        "results": format_results(items),
+        "items": items
+    }
+
+
+class ScrapeWebsitePayload(BaseModel):
+    url: str
+
+
+def scrape_upstream(params: ScrapeWebsitePayload):
+    # One breaker/bulkhead per host: a slow site only affects itself
+    return f"scrape:{urlparse(params.url).hostname or 'unknown'}"
+
+
+@register_action("scrape_website", ScrapeWebsitePayload, upstream=scrape_upstream, timeout=60)
+def run_scrape_website(params: ScrapeWebsitePayload):
+    result = scrape_website_to_markdown.invoke({"url": params.url})
+
+    return {
+        "status": "website_scraped",
+        "url": params.url,
+        "content": result
+    }
+
+
+class ScrapeWebsitesPayload(BaseModel):
+    urls: List[str] = Field(min_length=1, max_length=SCRAPE_MAX_URLS)
+
+
+@register_action("scrape_websites", ScrapeWebsitesPayload, upstream="scrape_batch", timeout=120)
+async def run_scrape_websites(params: ScrapeWebsitesPayload):
+    results = await ascrape_urls(params.urls)
+
+    return {
+        "status": "websites_scraped",
+        "results": results
+    }
+
+
+# ---------------- CONTACTS ----------------
+
+class FindContactEmailPayload(BaseModel):
+    name: str
+
+
+@register_action("find_contact_email", FindContactEmailPayload, upstream="people", timeout=30, cache_ttl=300)
+def run_find_contact_email(params: FindContactEmailPayload):
+    result = find_contact_email.invoke({"name": params.name})
+    return {
+        "status": "success",
+        "action": "find_contact_email",
+        "result": result
+    }
+
+
+# ---------------- NEWS ----------------
+
+class FetchNewsPayload(BaseModel):
+    query: str
+    max_results: int = 7
+
+    @model_validator(mode="before")
+    @classmethod
+    def unwrap_data(cls, values):
+        # Older prompts nested the payload one level deeper: {"data": {...}}
+        if isinstance(values, dict) and isinstance(values.get("data"), dict):
+            return values["data"]
+        return values
+
+
+def fetch_news_articles(params: FetchNewsPayload):
+    """
+    Search + article extraction half of the fetch_news action, shared
+    with the streaming /chat path, which summarizes on its own.
+    """
+    return get_news_pipeline().fetch_articles(params.query, params.max_results)
+
+
+@register_action("fetch_news", FetchNewsPayload, upstream="news", timeout=90)
+def run_fetch_news(params: FetchNewsPayload):
+    digest = get_news_pipeline().digest(params.query, params.max_results, max_points=7)
+    if digest is None:
+        return {
+            "status": "error",
+            "message": "No news found"
+        }
+
+    return {
+        "status": "success",
+        "query": params.query,
+        "summary": digest["summary"],
+        "articles": digest["articles"],
+        "cache_age_seconds": cache_age(digest)
+    }
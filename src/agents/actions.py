@@ -0,0 +1,205 @@
+"""
+Action registry used by the executor.
+
+Each action declares its name, a pydantic input schema, its handler,
+whether the handler is sync or async, the upstream it calls (for the
+circuit breaker and bulkhead), a timeout and a cache policy.
+Dispatch is a dict lookup plus schema validation. A new tool is added
+by registering it:
+
+    @register_action("search_web", SearchWebPayload, upstream="tavily", timeout=20, cache_ttl=300)
+    def run_search_web(params: SearchWebPayload):
+        ...
+"""
+import asyncio
+import contextvars
+import inspect
+import json
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Type, Union
+from pydantic import BaseModel, ValidationError
+from src.core.cache import MemoryBackend
+from src.core.context import current_user_id
+from src.core.http import scoped_async_client
+from src.core.metrics import metrics
+from src.core.resilience import CallerError, UpstreamUnavailable, get_executor, guard, aguard
+
+
+@dataclass(frozen=True)
+class ActionSpec:
+    name: str
+    input_model: Type[BaseModel]
+    handler: Callable[[BaseModel], Any]
+    is_async: bool = False
+    upstream: Union[str, Callable[[BaseModel], str], None] = None
+    timeout: Optional[float] = None
+    cache_ttl: int = 0  # seconds; 0 disables result caching
+
+    def upstream_for(self, params):
+        if callable(self.upstream):
+            return self.upstream(params)
+        return self.upstream or self.name
+
+
+ACTIONS: Dict[str, ActionSpec] = {}
+
+_result_cache = MemoryBackend(max_entries=1000, namespace="action_cache")
+
+
+def register_action(name, input_model, upstream=None, timeout=None, cache_ttl=0):
+    def decorator(handler):
+        if name in ACTIONS:
+            raise ValueError(f"Action already registered: {name}")
+        ACTIONS[name] = ActionSpec(
+            name=name,
+            input_model=input_model,
+            handler=handler,
+            is_async=inspect.iscoroutinefunction(handler),
+            upstream=upstream,
+            timeout=timeout,
+            cache_ttl=cache_ttl,
+        )
+        return handler
+
+    return decorator
+
+
+def get_action(name) -> Optional[ActionSpec]:
+    return ACTIONS.get(name)
+
+
+def _prepare(name, payload):
+    """
+    Returns (spec, params, cache_key, None) or (None, None, None, error_dict).
+    """
+    spec = ACTIONS.get(name)
+    if spec is None:
+        return None, None, None, {
+            "error": "Unknown action",
+            "action": name
+        }
+
+    try:
+        params = spec.input_model.model_validate(payload)
+    except ValidationError as e:
+        return None, None, None, {
+            "error": "Invalid action payload",
+            "action": name,
+            "details": e.errors(include_url=False)
+        }
+
+    # Results may be per-user (contacts, mail), so the user is part of the key
+    cache_key = f"{name}:{current_user_id.get()}:{params.model_dump_json()}" if spec.cache_ttl else None
+    return spec, params, cache_key, None
+
+
+def _cached(cache_key):
+    if cache_key is None:
+        return None
+    value = _result_cache.get(cache_key)
+    metrics.incr("action_cache.hits" if value is not None else "action_cache.misses")
+    return json.loads(value) if value is not None else None
+
+
+def _store(spec, cache_key, result):
+    if cache_key is None or (isinstance(result, dict) and "error" in result):
+        return
+    _result_cache.set(cache_key, json.dumps(result, default=str).encode(), spec.cache_ttl)
+
+
+def _timed_out(spec):
+    metrics.incr(f"action.{spec.name}.timeouts")
+    return {
+        "error": "Action timed out",
+        "action": spec.name,
+        "timeout": spec.timeout
+    }
+
+
+def _unavailable(spec, error):
+    return {
+        "error": "Upstream unavailable",
+        "action": spec.name,
+        "upstream": error.upstream,
+        "reason": error.reason
+    }
+
+
+def _rejected(spec, error):
+    return {
+        "error": str(error),
+        "action": spec.name
+    }
+
+
+async def _run_async_handler(spec, params):
+    async with scoped_async_client():
+        return await asyncio.wait_for(spec.handler(params), timeout=spec.timeout)
+
+
+def _call_sync(spec, params, upstream):
+    if spec.is_async:
+        return asyncio.run(_run_async_handler(spec, params))
+    if spec.timeout is None:
+        return spec.handler(params)
+    # copy_context: handlers read the request's user from a ContextVar
+    context = contextvars.copy_context()
+    return get_executor(upstream).submit(context.run, spec.handler, params).result(timeout=spec.timeout)
+
+
+def run_action(name, payload):
+    spec, params, cache_key, error = _prepare(name, payload)
+    if error:
+        return error
+
+    cached = _cached(cache_key)
+    if cached is not None:
+        return cached
+
+    upstream = spec.upstream_for(params)
+    try:
+        with guard(upstream) as call:
+            result = call.check(_call_sync(spec, params, upstream))
+    except (FutureTimeoutError, asyncio.TimeoutError):
+        return _timed_out(spec)
+    except UpstreamUnavailable as e:
+        return _unavailable(spec, e)
+    except CallerError as e:
+        return _rejected(spec, e)
+
+    _store(spec, cache_key, result)
+    return result
+
+
+async def arun_action(name, payload):
+    spec, params, cache_key, error = _prepare(name, payload)
+    if error:
+        return error
+
+    cached = _cached(cache_key)
+    if cached is not None:
+        return cached
+
+    upstream = spec.upstream_for(params)
+    try:
+        async with aguard(upstream) as call:
+            if spec.is_async:
+                pending = spec.handler(params)
+            else:
+                # Blocking Google/Tavily clients run off the event loop, on
+                # the upstream's own pool: a timed-out call keeps its thread
+                context = contextvars.copy_context()
+                pending = asyncio.get_running_loop().run_in_executor(
+                    get_executor(upstream), context.run, spec.handler, params
+                )
+            result = call.check(await asyncio.wait_for(pending, timeout=spec.timeout))
+    except asyncio.TimeoutError:
+        return _timed_out(spec)
+    except UpstreamUnavailable as e:
+        return _unavailable(spec, e)
+    except CallerError as e:
+        return _rejected(spec, e)
+
+    _store(spec, cache_key, result)
+    return result
@@ -5,3 +5,6 @@ class Agent:
 
     def invoke(self, message):
         return self.llm.generate(self.system_prompt, message)
+
+    async def ainvoke(self, message):
+        return await self.llm.agenerate(self.system_prompt, message)
@@ -1,7 +1,7 @@
 import json
 from src.core.llm import PerplexityLLM
 from src.agents.base import Agent
-from src.agents.executor import execute_action
+from src.agents.executor import execute_action, aexecute_action
 
 CALENDAR_AGENT_PROMPT = """
 You are a Calendar Manager Agent.
@@ -29,16 +29,34 @@ Rules:
 
 class CalendarAgent:
     def __init__(self):
-        llm = PerplexityLLM()
+        # Not cached: the reply is an action with side effects (create_event),
+        # so a repeated request gets a fresh decision, not a replayed one.
+        llm = PerplexityLLM(use_cache=False)
         self.agent = Agent(llm, CALENDAR_AGENT_PROMPT)
 
     def invoke(self, message: str):
         response = self.agent.invoke(message)
+        content, error = self._parse_response(response)
+        if error:
+            return error
+        return execute_action(content)
 
+    async def ainvoke(self, message: str):
+        response = await self.agent.ainvoke(message)
+        content, error = self._parse_response(response)
+        if error:
+            return error
+        return await aexecute_action(content)
+
+    def _parse_response(self, response):
+        """
+        Returns (content, None) when the LLM produced an action,
+        otherwise (None, error_dict).
+        """
         try:
             content = response["choices"][0]["message"]["content"]
         except Exception:
-            return {
+            return None, {
                 "error": "Invalid LLM response format",
                 "raw": response
             }
@@ -46,15 +64,15 @@ class CalendarAgent:
         try:
             data = json.loads(content)
         except Exception:
-            return {
+            return None, {
                 "error": "LLM did not return valid JSON",
                 "raw": content
             }
 
         if "action" in data:
-            return execute_action(content)
+            return content, None
 
-        return {
+        return None, {
             "error": "No action found in response",
             "raw": data
         }
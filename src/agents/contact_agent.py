@@ -36,3 +36,7 @@ class ContactsAgent:
     def invoke(self, message):
         response = self.agent.invoke(message)
         return response["choices"][0]["message"]["content"]
+
+    async def ainvoke(self, message):
+        response = await self.agent.ainvoke(message)
+        return response["choices"][0]["message"]["content"]
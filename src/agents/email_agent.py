@@ -15,7 +15,8 @@ Supported actions:
   "data": {
     "to": ["email1@gmail.com", "email2@gmail.com"],
     "subject": "string",
-    "body": "string"
+    "body": "string",
+    "mode": "individual"
   }
 }
 
@@ -39,6 +40,8 @@ Supported actions:
 
 Rules:
 - If multiple emails are mentioned, include ALL in "to" as a list
+- "mode" is "individual" (one email each) unless the user asks for a single
+  group email ("to") or to BCC everyone ("bcc")
 - Auto-generate subject and body if user does not provide them
 - Dates must be ISO format (YYYY-MM-DDTHH:MM:SS)
 - Do not include markdown or text outside JSON
@@ -49,9 +52,15 @@ User request:
 
 class EmailAgent:
     def __init__(self):
-        llm = PerplexityLLM()
+        # Not cached: the payload holds dates resolved against "now"
+        # ("emails from the last hour"), which a replay would get wrong.
+        llm = PerplexityLLM(use_cache=False)
         self.agent = Agent(llm, EMAIL_AGENT_PROMPT)
 
     def invoke(self, message):
         response = self.agent.invoke(message)
         return response["choices"][0]["message"]["content"]
+
+    async def ainvoke(self, message):
+        response = await self.agent.ainvoke(message)
+        return response["choices"][0]["message"]["content"]
@@ -0,0 +1,192 @@
+"""
+Deterministic pre-router that picks an agent locally for obvious messages
+so they skip the MANAGER_PROMPT round trip.
+
+Offline tools:
+    python -m src.agents.fast_router evaluate decisions.jsonl [--model router.pkl]
+    python -m src.agents.fast_router train decisions.jsonl --out router.pkl
+
+decisions.jsonl holds logged LLM router decisions, one per line:
+    {"message": "...", "agent": "email_agent"}
+"""
+import argparse
+import json
+import pickle
+import re
+import sys
+from src.core.config import FAST_ROUTER_MODEL, FAST_ROUTER_MIN_CONFIDENCE
+from src.core.metrics import metrics
+
+EMAIL_RE = r"[\w.+-]+@[\w-]+\.[\w.-]+"
+URL_RE = r"(?:https?://|www\.)\S+"
+
+# (agent, pattern). A message is routed locally only when every matching
+# rule points at the same agent; conflicting matches fall through to the LLM.
+RULES = [
+    ("email_agent", rf"(?=.*{EMAIL_RE})(?=.*\b(?:send|mail|email|write|reply)\b)"),
+    ("email_agent", r"\b(?:my|unread|latest|new)\s+(?:e-?mails?|inbox|mails?)\b"),
+    ("email_agent", r"\b(?:summari[sz]e|check|read)\b.*\b(?:e-?mails?|inbox)\b"),
+    ("researcher_agent", rf"(?=.*{URL_RE})(?=.*\b(?:scrape|crawl|extract|read)\b)"),
+    ("researcher_agent", r"\b(?:search the web|google|look up|research)\b"),
+    ("google_news_agent", r"\b(?:news|headlines)\s+(?:about|on|for)\b"),
+    ("google_news_agent", r"\b(?:latest|today'?s|top|breaking)\s+(?:news|headlines)\b"),
+    ("calendar_agent", r"\b(?:schedule|remind me|set a reminder|book a meeting)\b"),
+    ("calendar_agent", r"\b(?:add|create|put)\b.*\b(?:event|meeting|calendar)\b"),
+    ("contacts_agent", r"\b(?:phone number|contact (?:info|details)|email address) (?:of|for)\b"),
+]
+
+# Broad patterns that never route on their own; they only turn a single
+# rule match into a conflict. "Email Bob the notes and put a meeting with
+# him tomorrow" must not go to calendar_agent alone.
+CONFLICT_RULES = [
+    ("email_agent", r"\b(?:send|mail|reply|draft)\b|\be-?mail\b(?!\s+address)"),
+]
+
+# Two intent verbs joined by a conjunction look like a multi-task request,
+# which only the LLM router can split.
+INTENT_VERBS = (
+    r"(?:send|e-?mail|mail|reply|draft|write|schedule|book|put|add|create|remind|"
+    r"search|find|look up|scrape|summari[sz]e|read|check)"
+)
+MULTI_INTENT_RE = re.compile(
+    rf"\b{INTENT_VERBS}\b.*\b(?:and|then|also|plus)\b.*\b{INTENT_VERBS}\b",
+    re.IGNORECASE
+)
+
+COMPILED_RULES = [(agent, re.compile(pattern, re.IGNORECASE)) for agent, pattern in RULES]
+COMPILED_CONFLICT_RULES = [(agent, re.compile(pattern, re.IGNORECASE)) for agent, pattern in CONFLICT_RULES]
+
+
+class FastRouter:
+    def __init__(self, model_path=FAST_ROUTER_MODEL, min_confidence=FAST_ROUTER_MIN_CONFIDENCE):
+        self.min_confidence = min_confidence
+        self.classifier = load_classifier(model_path) if model_path else None
+
+    def match_rules(self, message):
+        agents = {agent for agent, pattern in COMPILED_RULES if pattern.search(message)}
+        if len(agents) != 1:
+            return None
+
+        mentioned = agents | {agent for agent, pattern in COMPILED_CONFLICT_RULES if pattern.search(message)}
+        if len(mentioned) > 1:
+            return None
+        return agents.pop()
+
+    @staticmethod
+    def is_multi_intent(message):
+        return MULTI_INTENT_RE.search(message) is not None
+
+    def classify(self, message):
+        if self.classifier is None:
+            return None
+
+        probabilities = self.classifier.predict_proba([message])[0]
+        best = probabilities.argmax()
+        if probabilities[best] < self.min_confidence:
+            return None
+        return self.classifier.classes_[best]
+
+    def route(self, message):
+        """
+        Returns an agent name when confident, otherwise None.
+        """
+        metrics.incr("fast_router.lookups")
+
+        agent, source = None, "rules"
+        if not self.is_multi_intent(message):
+            agent = self.match_rules(message)
+            if agent is None:
+                agent = self.classify(message)
+                source = "classifier"
+
+        if agent is None:
+            metrics.incr("fast_router.misses")
+        else:
+            metrics.incr("fast_router.hits")
+            metrics.incr(f"fast_router.hits.{source}")
+
+        metrics.set_gauge("fast_router.hit_rate", self.hit_rate())
+        return agent
+
+    @staticmethod
+    def hit_rate():
+        lookups = metrics.get("fast_router.lookups")
+        return metrics.get("fast_router.hits") / lookups if lookups else 0.0
+
+
+def load_classifier(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def train_classifier(records):
+    """
+    TF-IDF + logistic regression over logged router decisions.
+    Requires scikit-learn, which is an optional dependency.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+
+    model = make_pipeline(
+        TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True),
+        LogisticRegression(max_iter=1000)
+    )
+    model.fit([r["message"] for r in records], [r["agent"] for r in records])
+    return model
+
+
+def read_decisions(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(router, records):
+    hits = correct = 0
+    for record in records:
+        predicted = router.route(record["message"])
+        if predicted is None:
+            continue
+        hits += 1
+        correct += predicted == record["agent"]
+
+    total = len(records)
+    return {
+        "total": total,
+        "hits": hits,
+        "hit_rate": hits / total if total else 0.0,
+        "precision": correct / hits if hits else 0.0,
+        "llm_calls_saved": correct,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.agents.fast_router")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    evaluate_cmd = commands.add_parser("evaluate", help="score the pre-router against past decisions")
+    evaluate_cmd.add_argument("decisions")
+    evaluate_cmd.add_argument("--model", default=None)
+    evaluate_cmd.add_argument("--min-confidence", type=float, default=FAST_ROUTER_MIN_CONFIDENCE)
+
+    train_cmd = commands.add_parser("train", help="fit the optional TF-IDF classifier")
+    train_cmd.add_argument("decisions")
+    train_cmd.add_argument("--out", required=True)
+
+    args = parser.parse_args(argv)
+    records = read_decisions(args.decisions)
+
+    if args.command == "train":
+        with open(args.out, "wb") as f:
+            pickle.dump(train_classifier(records), f)
+        print(f"Trained on {len(records)} decisions → {args.out}")
+        return 0
+
+    router = FastRouter(model_path=args.model, min_confidence=args.min_confidence)
+    json.dump(evaluate(router, records), sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import json
+from pydantic import ValidationError
+from src.agents.actions import get_action
+from src.agents import action_handlers  # noqa: F401  (registers the actions)
+from src.agents.email_agent import EMAIL_AGENT_PROMPT
+from src.agents.calendar_agent import CALENDAR_AGENT_PROMPT
+from src.agents.researcher_agent import RESEARCHER_AGENT_PROMPT
+from src.agents.contact_agent import CONTACTS_AGENT_PROMPT
+from src.agents.google_news_agent import GOOGLE_NEWS_AGENT_PROMPT
+
+# Returned in place of an agent name when the message was split into tasks
+TASKS = "tasks"
+
+# Actions each sub-agent is allowed to emit. Used to validate fused output.
+AGENT_ACTIONS = {
+    "email_agent": {"send_email", "read_emails", "summarize_emails"},
+    "calendar_agent": {"create_schedule", "list_events"},
+    "researcher_agent": {"search_web", "scrape_website", "scrape_websites", "search_linkedin"},
+    "contacts_agent": {"find_contact_email"},
+    "google_news_agent": {"fetch_news"},
+}
+
+AGENT_PROMPTS = {
+    "email_agent": EMAIL_AGENT_PROMPT,
+    "calendar_agent": CALENDAR_AGENT_PROMPT,
+    "researcher_agent": RESEARCHER_AGENT_PROMPT,
+    "contacts_agent": CONTACTS_AGENT_PROMPT,
+    "google_news_agent": GOOGLE_NEWS_AGENT_PROMPT,
+}
+
+
+def _agent_section(name, prompt):
+    # Sub-agent prompts end with a "User request: {input}" placeholder
+    # that only makes sense when they are sent on their own.
+    body = prompt.split("User request:")[0].strip()
+    return f"### {name}\n{body}"
+
+
+def build_fused_prompt():
+    sections = "\n\n".join(
+        _agent_section(name, prompt) for name, prompt in AGENT_PROMPTS.items()
+    )
+
+    return f"""
+You are a router AND action planner.
+
+Pick the agent that should handle the user message, then produce the
+final action exactly as that agent would.
+
+You MUST output only JSON:
+{{
+  "agent": "<email_agent | calendar_agent | researcher_agent | contacts_agent | google_news_agent | none>",
+  "action": "<action name from that agent's formats>",
+  "data": {{ ... }}
+}}
+
+If no agent applies, return {{"agent": "none"}}.
+
+If the message contains several requests for different agents, output instead:
+{{
+  "tasks": [
+    {{"id": "t1", "agent": "<agent>", "message": "<the part of the request for this agent>", "depends_on": []}},
+    {{"id": "t2", "agent": "<agent>", "message": "<the part of the request for this agent>", "depends_on": ["t1"]}}
+  ]
+}}
+Only use "depends_on" when a step needs another step's result
+(e.g. find a contact's email address, then send them an email).
+
+The agents and the actions they support:
+
+{sections}
+
+Do NOT explain anything. Do NOT add text. Only return valid JSON.
+"""
+
+
+FUSED_ROUTER_PROMPT = build_fused_prompt()
+
+
+def parse_fused_output(raw_text):
+    """
+    Validates fused router output.
+
+    Returns (agent, action_json):
+    - ("none", None) when no agent is needed
+    - (TASKS, [task, ...]) for a multi-intent message, to run as a task graph
+    - (agent, {"action", "data"}) when the output is directly executable
+    - (agent, None) when the agent is known but the action is unusable
+      (not one of its actions, not registered, or an invalid payload)
+    - (None, None) when the output can't be trusted at all
+    """
+    try:
+        data = json.loads(raw_text)
+    except Exception:
+        return None, None
+
+    if not isinstance(data, dict):
+        return None, None
+
+    tasks = data.get("tasks")
+    if isinstance(tasks, list) and tasks:
+        return TASKS, tasks
+
+    agent = data.get("agent")
+    if agent == "none":
+        return "none", None
+
+    if agent not in AGENT_ACTIONS:
+        return None, None
+
+    action = data.get("action")
+    payload = data.get("data")
+
+    if action not in AGENT_ACTIONS[agent] or not isinstance(payload, dict):
+        return agent, None
+
+    # Validate against the registry now, so an unregistered action or a
+    # payload the schema rejects falls back to the two-hop path instead
+    # of failing at execution.
+    spec = get_action(action)
+    if spec is None:
+        return agent, None
+    try:
+        spec.input_model.model_validate(payload)
+    except ValidationError:
+        return agent, None
+
+    return agent, {"action": action, "data": payload}
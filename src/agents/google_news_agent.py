@@ -2,7 +2,7 @@ import feedparser
 from src.core.llm import PerplexityLLM
 from src.agents.base import Agent
 import json
-import requests
+from src.core.http import post_with_retry
 
 GOOGLE_NEWS_AGENT_PROMPT = """
 You are a Google News routing agent.
@@ -34,6 +34,8 @@ User request:
 {input}
 """
 
+NEWS_SEARCH_PROMPT = "You are a news researcher. Report the latest news on the topic and cite your sources."
+
 
 class GoogleNewsAgent:
     def __init__(self):
@@ -46,10 +48,17 @@ class GoogleNewsAgent:
         """
         return self.route(message)
 
+    async def ainvoke(self, message):
+        return await self.aroute(message)
+
     def route(self, message):
         response = self.agent.invoke(message)
         return response["choices"][0]["message"]["content"]
 
+    async def aroute(self, message):
+        response = await self.agent.ainvoke(message)
+        return response["choices"][0]["message"]["content"]
+
     def fetch_news(self, query):
         headers = {
             "Authorization": f"Bearer {self.llm.api_key}",
@@ -65,7 +74,7 @@ class GoogleNewsAgent:
             "search": True
         }
 
-        response = requests.post(self.llm.url, json=payload, headers=headers)
+        response = post_with_retry(self.llm.url, json=payload, headers=headers)
         response.raise_for_status()
         return response.json()
 
@@ -73,8 +82,10 @@ class GoogleNewsAgent:
         """
         Calls Perplexity / Sonar model and returns RAW LLM response
         """
-        return self.agent.llm.call_perplexity_api(
-            prompt=f"Latest news about {query}"
+        # Straight to the API: news must not be served from the LLM cache
+        return self.llm.call_perplexity_api(
+            NEWS_SEARCH_PROMPT,
+            f"Latest news about {query}"
         )
 
     def extract_articles_from_search(self, llm_response, max_results=7):
@@ -0,0 +1,247 @@
+"""
+Long-lived news pipeline: Perplexity search-with-citations and a Google
+News RSS feed fetched in parallel, merged and deduplicated, then
+summarized. Built once per process; results are cached per
+(query, hour bucket) so repeat questions within the hour are free.
+"""
+import html
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+from urllib.parse import quote_plus, urlsplit
+import feedparser
+from src.agents.google_news_agent import GoogleNewsAgent
+from src.core.cache import MemoryBackend, normalize_message
+from src.core.config import (
+    NEWS_CACHE_BUCKET_SECONDS,
+    NEWS_CACHE_MAX_ENTRIES,
+    NEWS_RSS_ENABLED,
+    NEWS_RSS_URL,
+    NEWS_RSS_TIMEOUT,
+    NEWS_TITLE_SIMILARITY,
+    NEWS_PREWARM_WINDOW,
+)
+from src.core.http import get_session
+from src.core.metrics import metrics
+from src.core.resilience import guard
+from src.tools.news_agent import summarize_news, astream_summarize_news
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"\w+")
+# Google News RSS titles end in " - Publisher"
+_PUBLISHER_SUFFIX_RE = re.compile(r"\s+[-|–]\s+[^-|–]+$")
+
+
+def canonical_url(url):
+    parts = urlsplit(url or "")
+    host = parts.netloc.lower().removeprefix("www.")
+    return f"{host}{parts.path.rstrip('/')}"
+
+
+def title_key(title):
+    title = _PUBLISHER_SUFFIX_RE.sub("", title or "")
+    return " ".join(_WORD_RE.findall(title.lower()))
+
+
+def dedupe_articles(articles, similarity=NEWS_TITLE_SIMILARITY):
+    """
+    Keep the first article for each canonical URL, then drop articles
+    whose title is a near-duplicate of one already kept (the same story
+    syndicated under different URLs).
+    """
+    seen_urls = set()
+    kept, kept_titles = [], []
+
+    for article in articles:
+        url = canonical_url(article.get("link"))
+        if url and url in seen_urls:
+            continue
+
+        key = title_key(article.get("title"))
+        if key and any(
+            SequenceMatcher(None, key, other).ratio() >= similarity
+            for other in kept_titles
+        ):
+            continue
+
+        seen_urls.add(url)
+        kept_titles.append(key)
+        kept.append(article)
+
+    return kept
+
+
+def cache_age(digest):
+    return round(time.time() - digest["generated_at"], 1)
+
+
+def _clean_snippet(text):
+    return html.unescape(_TAG_RE.sub(" ", text or "")).strip()
+
+
+class NewsPipeline:
+    def __init__(self, agent=None, rss_enabled=NEWS_RSS_ENABLED):
+        self.agent = agent or GoogleNewsAgent()
+        self.llm = self.agent.llm
+        self.rss_enabled = rss_enabled
+        self._cache = MemoryBackend(max_entries=NEWS_CACHE_MAX_ENTRIES, namespace="news_cache")
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="news")
+        # normalized query -> [query, max_results, requests, last_requested]
+        self._topics = {}
+        self._topics_lock = threading.Lock()
+
+    def _key(self, kind, query, max_results):
+        bucket = int(time.time() // NEWS_CACHE_BUCKET_SECONDS)
+        return f"{kind}:{bucket}:{max_results}:{normalize_message(query).lower()}"
+
+    def _cache_get(self, key):
+        cached = self._cache.get(key)
+        if cached is None:
+            metrics.incr("news_cache.misses")
+            return None
+        metrics.incr("news_cache.hits")
+        return json.loads(cached)
+
+    def _cache_set(self, key, value):
+        self._cache.set(key, json.dumps(value).encode(), NEWS_CACHE_BUCKET_SECONDS)
+
+    def search_articles(self, query, max_results):
+        llm_response = self.agent.search_news_with_llm(query)
+        return self.agent.extract_articles_from_search(llm_response, max_results=max_results)
+
+    def rss_articles(self, query, max_results):
+        with guard("rss"):
+            response = get_session().get(
+                NEWS_RSS_URL.format(query=quote_plus(query)),
+                timeout=NEWS_RSS_TIMEOUT
+            )
+            response.raise_for_status()
+
+        feed = feedparser.parse(response.content)
+        return [
+            {
+                "title": entry.get("title"),
+                "link": entry.get("link"),
+                "snippet": _clean_snippet(entry.get("summary")),
+                "date": entry.get("published", "")
+            }
+            for entry in feed.entries[:max_results]
+        ]
+
+    def fetch_articles(self, query, max_results=7, force=False):
+        """
+        Both sources run at once; either may fail on its own. LLM search
+        results come first since they carry real snippets.
+        """
+        key = self._key("articles", query, max_results)
+        cached = None if force else self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        rss = self._executor.submit(self.rss_articles, query, max_results) if self.rss_enabled else None
+
+        articles = []
+        try:
+            articles.extend(self.search_articles(query, max_results))
+        except Exception as e:
+            print(f"News search failed for {query!r}: {e}")
+
+        if rss is not None:
+            try:
+                articles.extend(rss.result())
+            except Exception as e:
+                print(f"News RSS failed for {query!r}: {e}")
+
+        articles = dedupe_articles(articles)[:max_results]
+        if articles:
+            self._cache_set(key, articles)
+        return articles
+
+    def record_topic(self, query, max_results):
+        with self._topics_lock:
+            topic = self._topics.setdefault(normalize_message(query).lower(), [query, max_results, 0, 0])
+            topic[1] = max_results
+            topic[2] += 1
+            topic[3] = time.time()
+
+    def top_topics(self, n, window=NEWS_PREWARM_WINDOW):
+        """
+        The n most requested (query, max_results) pairs seen within window seconds.
+        """
+        cutoff = time.time() - window
+        with self._topics_lock:
+            for key in [k for k, t in self._topics.items() if t[3] < cutoff]:
+                del self._topics[key]
+            ranked = sorted(self._topics.values(), key=lambda t: (t[2], t[3]), reverse=True)
+        return [(t[0], t[1]) for t in ranked[:n]]
+
+    def cached_digest(self, query, max_results=7):
+        """
+        Digest for the current hour bucket, or None. Counts as a request
+        for the topic, which is what the pre-warmer ranks by.
+        """
+        self.record_topic(query, max_results)
+        return self._cache_get(self._key("digest", query, max_results))
+
+    def store_digest(self, query, max_results, summary, articles):
+        digest = {"summary": summary, "articles": articles, "generated_at": time.time()}
+        self._cache_set(self._key("digest", query, max_results), digest)
+        return digest
+
+    def peek_digest(self, query, max_results=7):
+        """
+        Like cached_digest, without counting a request or a cache hit.
+        """
+        cached = self._cache.get(self._key("digest", query, max_results))
+        return None if cached is None else json.loads(cached)
+
+    def digest(self, query, max_results=7, max_points=7):
+        """
+        Articles plus a summary for a query; None when no articles were found.
+        """
+        cached = self.cached_digest(query, max_results)
+        if cached is not None:
+            return cached
+        return self.refresh(query, max_results, max_points)
+
+    def refresh(self, query, max_results=7, max_points=7, force=False):
+        """
+        Recompute and store a digest. force skips the article cache
+        (used by the pre-warmer).
+        """
+        articles = self.fetch_articles(query, max_results, force=force)
+        if not articles:
+            return None
+
+        summary = summarize_news(articles, max_points=max_points, llm=self.llm)
+        return self.store_digest(query, max_results, summary, articles)
+
+    async def astream_summary(self, articles, max_points=7):
+        async for delta in astream_summarize_news(articles, max_points=max_points, llm=self.llm):
+            yield delta
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_news_pipeline():
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = NewsPipeline()
+    return _pipeline
+
+
+def close_news_pipeline():
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.close()
+        _pipeline = None
@@ -0,0 +1,81 @@
+"""
+Background refresh of news digests for the most requested topics, so
+/chat news questions are answered from the pipeline cache.
+
+Runs as an asyncio task started in the FastAPI lifespan. Every
+NEWS_PREWARM_INTERVAL seconds it takes the top NEWS_PREWARM_TOPICS
+topics and recomputes any digest that is missing for the current hour
+bucket or older than the interval, spending at most
+NEWS_PREWARM_MAX_REFRESHES_PER_HOUR refreshes (two LLM calls each).
+"""
+import asyncio
+import time
+from collections import deque
+from src.core.config import (
+    NEWS_PREWARM_INTERVAL,
+    NEWS_PREWARM_TOPICS,
+    NEWS_PREWARM_MAX_REFRESHES_PER_HOUR,
+)
+from src.core.metrics import metrics
+
+
+class NewsPrewarmer:
+    def __init__(self, pipeline, interval=NEWS_PREWARM_INTERVAL, topics=NEWS_PREWARM_TOPICS,
+                 max_refreshes_per_hour=NEWS_PREWARM_MAX_REFRESHES_PER_HOUR):
+        self.pipeline = pipeline
+        self.interval = interval
+        self.topics = topics
+        self.max_refreshes_per_hour = max_refreshes_per_hour
+        self._refreshed_at = deque()
+        self._task = None
+
+    def _budget_left(self):
+        cutoff = time.time() - 3600
+        while self._refreshed_at and self._refreshed_at[0] < cutoff:
+            self._refreshed_at.popleft()
+        return self.max_refreshes_per_hour - len(self._refreshed_at)
+
+    def _is_stale(self, query, max_results):
+        digest = self.pipeline.peek_digest(query, max_results)
+        return digest is None or time.time() - digest["generated_at"] >= self.interval
+
+    async def run_once(self):
+        """
+        One refresh pass. Returns the number of digests refreshed.
+        """
+        refreshed = 0
+        for query, max_results in self.pipeline.top_topics(self.topics):
+            if not self._is_stale(query, max_results):
+                continue
+            if self._budget_left() <= 0:
+                metrics.incr("news_prewarm.budget_exhausted")
+                break
+
+            self._refreshed_at.append(time.time())
+            try:
+                await asyncio.to_thread(self.pipeline.refresh, query, max_results, 7, True)
+                refreshed += 1
+                metrics.incr("news_prewarm.refreshed")
+            except Exception as e:
+                metrics.incr("news_prewarm.failures")
+                print(f"News pre-warm failed for {query!r}: {e}")
+
+        return refreshed
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -4,9 +4,25 @@ from src.agents.email_agent import EmailAgent
 from src.agents.calendar_agent import CalendarAgent
 from src.agents.researcher_agent import ResearcherAgent
 from src.agents.contact_agent import ContactsAgent
-from src.agents.executor import execute_action
-from src.agents.google_news_agent import GoogleNewsAgent
+from src.agents.executor import execute_action, aexecute_action, parse_reply
+from src.agents.action_handlers import FetchNewsPayload, fetch_news_articles
+from src.agents.news_pipeline import get_news_pipeline, cache_age
+from src.agents.fused_router import FUSED_ROUTER_PROMPT, TASKS, parse_fused_output
+from src.agents.fast_router import FastRouter
+from src.agents.task_graph import (
+    TaskGraphError,
+    normalize_tasks,
+    topological_order,
+    run_task_graph,
+    with_context,
+)
+from src.core.config import FUSED_ROUTING, FAST_ROUTER_ENABLED, ROUTER_DECISION_LOG
+from logging.handlers import QueueHandler, QueueListener
+import asyncio
+import atexit
 import json
+import logging
+import queue
 
 MANAGER_PROMPT = """
 You are a router.
@@ -17,6 +33,16 @@ You MUST output only JSON:
   "message": "<same user message>"
 }}
 
+If the message contains several requests for different agents, output instead:
+{{
+  "tasks": [
+    {{"id": "t1", "agent": "<agent>", "message": "<the part of the request for this agent>", "depends_on": []}},
+    {{"id": "t2", "agent": "<agent>", "message": "<the part of the request for this agent>", "depends_on": ["t1"]}}
+  ]
+}}
+Only use "depends_on" when a step needs another step's result
+(e.g. find a contact's email address, then send them an email).
+
 Rules:
 - If the user wants to schedule something, create an event,lists events, or set a reminder → agent = "calendar_agent"
 - If the user wants to send, read, check, summarize, reply to, or draft emails → agent = "email_agent"
@@ -28,18 +54,105 @@ Rules:
 Do NOT explain anything. Do NOT add text. Only return valid JSON.
 """
 
+_decision_log = logging.getLogger("router_decisions")
+_decision_log.propagate = False
+_decision_listener = None
+
+
+def _start_decision_log(path=ROUTER_DECISION_LOG):
+    """
+    Router decisions go through a QueueHandler: the caller (often the
+    event loop) only enqueues, and a listener thread appends the JSONL.
+    """
+    global _decision_listener
+    if _decision_listener is not None or not path:
+        return
+
+    records = queue.SimpleQueue()
+    file_handler = logging.FileHandler(path, delay=True)
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+    _decision_log.addHandler(QueueHandler(records))
+    _decision_log.setLevel(logging.INFO)
+
+    _decision_listener = QueueListener(records, file_handler)
+    _decision_listener.start()
+    atexit.register(_stop_decision_log)
+
+
+def _stop_decision_log():
+    """
+    Flushes queued decisions and closes the file.
+    """
+    global _decision_listener
+    if _decision_listener is None:
+        return
+    _decision_listener.stop()
+    _decision_listener = None
+    for handler in _decision_log.handlers[:]:
+        _decision_log.removeHandler(handler)
+
 
 class PersonalAssistant:
-    def __init__(self):
+    def __init__(self, fused_routing=FUSED_ROUTING, fast_routing=FAST_ROUTER_ENABLED):
         llm = PerplexityLLM()
 
         self.agent = Agent(llm, MANAGER_PROMPT)
+        self.fused_routing = fused_routing
+        # Fused output includes sub-agent payloads with dates resolved
+        # against "now", so it bypasses the response cache.
+        self.fused_agent = Agent(PerplexityLLM(use_cache=False), FUSED_ROUTER_PROMPT)
+        self.fast_router = FastRouter() if fast_routing else None
+        _start_decision_log()
 
         self.email_agent = EmailAgent()
         self.calendar_agent = CalendarAgent()
         self.researcher_agent = ResearcherAgent()
         self.contact_agent = ContactsAgent()
-        self.google_news_agent = GoogleNewsAgent()
+        self.news_pipeline = get_news_pipeline()
+        self.google_news_agent = self.news_pipeline.agent
+
+    def _sub_agents(self):
+        return {
+            "calendar_agent": self.calendar_agent,
+            "email_agent": self.email_agent,
+            "researcher_agent": self.researcher_agent,
+            "contacts_agent": self.contact_agent,
+            "google_news_agent": self.google_news_agent,
+        }
+
+    def _parse_router_output(self, router_output):
+        """
+        Returns (router_json, None) on success, otherwise (None, error_dict).
+        """
+        # Extract Perplexity text
+        raw_text = router_output["choices"][0]["message"]["content"]
+
+        print("\n--- ROUTER RAW TEXT ---")
+        print(raw_text)
+        print("-----------------------\n")
+
+        # Parse router JSON
+        try:
+            return json.loads(raw_text), None
+        except Exception:
+            return None, {
+                "error": "Router returned invalid JSON",
+                "raw": raw_text
+            }
+
+    def _log_decision(self, message, router_json):
+        """
+        Appends LLM router decisions to ROUTER_DECISION_LOG (JSONL) so the
+        fast router can be evaluated and trained offline.
+        """
+        if _decision_listener is None or "agent" not in router_json:
+            return
+        _decision_log.info(json.dumps({"message": message, "agent": router_json.get("agent")}))
+
+    def _fast_route(self, message):
+        if self.fast_router is None:
+            return None
+        return self.fast_router.route(message)
 
     def try_execute_action(self, reply_text):
         """
@@ -59,59 +172,308 @@ class PersonalAssistant:
 
         return reply_text
 
+    async def atry_execute_action(self, reply_text):
+        try:
+            data = json.loads(reply_text)
+        except Exception:
+            return reply_text  # Not JSON
+
+        if isinstance(data, dict) and "action" in data:
+            return await aexecute_action(data)
+
+        return reply_text
+
+    def _read_fused_output(self, router_output):
+        raw_text = router_output["choices"][0]["message"]["content"]
+
+        print("\n--- FUSED ROUTER RAW TEXT ---")
+        print(raw_text)
+        print("-----------------------------\n")
+
+        return parse_fused_output(raw_text)
+
+    def _no_agent(self, router_json):
+        return {
+            "response": "No agent required",
+            "raw": router_json
+        }
+
     def invoke(self, message):
         """
         Main routing function.
+        Obvious messages are routed locally by the fast router. Fused mode
+        answers in a single LLM hop and falls back to the two-hop
+        router → sub-agent path when its output doesn't validate.
+        """
+        fast_agent = self._fast_route(message)
+        if fast_agent is not None:
+            reply = self._sub_agents()[fast_agent].invoke(message)
+            return self.try_execute_action(reply)
+
+        if not self.fused_routing:
+            return self._invoke_two_hop(message)
+
+        agent_name, action = self._read_fused_output(self.fused_agent.invoke(message))
+
+        if agent_name == TASKS:
+            return self._run_tasks(action)
+
+        if agent_name == "none":
+            return self._no_agent({"agent": "none", "message": message})
+
+        if action is not None:
+            return execute_action(action)
+
+        if agent_name is not None:
+            # Agent is known, only the action was unusable: skip the router hop
+            reply = self._sub_agents()[agent_name].invoke(message)
+            return self.try_execute_action(reply)
+
+        return self._invoke_two_hop(message)
+
+    async def ainvoke(self, message):
+        """
+        Async version of invoke(): the router and sub-agent LLM hops are
+        awaited on the shared async client instead of blocking a worker.
+        """
+        fast_agent = self._fast_route(message)
+        if fast_agent is not None:
+            reply = await self._sub_agents()[fast_agent].ainvoke(message)
+            return await self.atry_execute_action(reply)
+
+        if not self.fused_routing:
+            return await self._ainvoke_two_hop(message)
+
+        router_output = await self.fused_agent.ainvoke(message)
+        agent_name, action = self._read_fused_output(router_output)
+
+        if agent_name == TASKS:
+            return await self._arun_tasks(action)
+
+        if agent_name == "none":
+            return self._no_agent({"agent": "none", "message": message})
+
+        if action is not None:
+            return await aexecute_action(action)
+
+        if agent_name is not None:
+            reply = await self._sub_agents()[agent_name].ainvoke(message)
+            return await self.atry_execute_action(reply)
+
+        return await self._ainvoke_two_hop(message)
+
+    def _invoke_two_hop(self, message):
+        """
         Sends user message → router → finds agent → executes agent.
         """
 
         # Router call
         router_output = self.agent.invoke(message)
 
-        # Extract Perplexity text
-        raw_text = router_output["choices"][0]["message"]["content"]
+        router_json, error = self._parse_router_output(router_output)
+        if error:
+            return error
 
-        print("\n--- ROUTER RAW TEXT ---")
-        print(raw_text)
-        print("-----------------------\n")
+        self._log_decision(message, router_json)
 
-        # Parse router JSON
-        try:
-            router_json = json.loads(raw_text)
-        except Exception:
-            return {
-                "error": "Router returned invalid JSON",
-                "raw": raw_text
-            }
+        if router_json.get("tasks"):
+            return self._run_tasks(router_json["tasks"])
 
-        agent = router_json["agent"]
-        user_message = router_json["message"]
+        agent = self._sub_agents().get(router_json["agent"])
 
-        # Route based on agent
-        if agent == "calendar_agent":
-            reply = self.calendar_agent.invoke(user_message)
-            return self.try_execute_action(reply)
+        # No agent needed
+        if agent is None:
+            return self._no_agent(router_json)
 
-        if agent == "email_agent":
-            reply = self.email_agent.invoke(user_message)
-            return self.try_execute_action(reply)
-        
-        if agent == "researcher_agent":
-            reply = self.researcher_agent.invoke(user_message)
-            return self.try_execute_action(reply)
-        
-        if agent == "contacts_agent":
-            reply = self.contact_agent.invoke(user_message)
-            return self.try_execute_action(reply)
+        reply = agent.invoke(router_json["message"])
+        return self.try_execute_action(reply)
 
-        if agent == "google_news_agent":
-            # Ask the agent to get the JSON action
-            reply = self.google_news_agent.invoke(user_message)
-            return self.try_execute_action(reply)
+    async def _ainvoke_two_hop(self, message):
+        router_output = await self.agent.ainvoke(message)
 
+        router_json, error = self._parse_router_output(router_output)
+        if error:
+            return error
 
-        # No agent needed
+        self._log_decision(message, router_json)
+
+        if router_json.get("tasks"):
+            return await self._arun_tasks(router_json["tasks"])
+
+        agent = self._sub_agents().get(router_json["agent"])
+
+        if agent is None:
+            return self._no_agent(router_json)
+
+        reply = await agent.ainvoke(router_json["message"])
+        return await self.atry_execute_action(reply)
+
+    def _merge_task_results(self, tasks, results):
         return {
-            "response": "No agent required",
-            "raw": router_json
+            "status": "multi_task",
+            "results": [
+                {"id": task["id"], "agent": task["agent"], "result": results[task["id"]]}
+                for task in tasks
+            ]
         }
+
+    def _run_tasks(self, raw_tasks):
+        """
+        Sync fan-out: runs sub-tasks one by one in dependency order.
+        """
+        try:
+            tasks = normalize_tasks(raw_tasks)
+        except TaskGraphError as e:
+            return {"error": str(e), "raw": raw_tasks}
+
+        results = {}
+        for task in topological_order(tasks):
+            dependency_results = {dep: results[dep] for dep in task["depends_on"]}
+            if any(isinstance(r, dict) and "error" in r for r in dependency_results.values()):
+                results[task["id"]] = {"skipped": True, "error": "Dependencies failed"}
+                continue
+
+            agent = self._sub_agents().get(task["agent"])
+            if agent is None:
+                results[task["id"]] = self._no_agent(task)
+                continue
+
+            try:
+                reply = agent.invoke(with_context(task, dependency_results))
+                results[task["id"]] = self.try_execute_action(reply)
+            except Exception as e:
+                results[task["id"]] = {"error": str(e)}
+
+        return self._merge_task_results(tasks, results)
+
+    async def _arun_tasks(self, raw_tasks):
+        """
+        Async fan-out: independent sub-tasks (agent hop + tool call) run
+        concurrently, and dependent ones start once their inputs are ready.
+        """
+        try:
+            tasks = normalize_tasks(raw_tasks)
+        except TaskGraphError as e:
+            return {"error": str(e), "raw": raw_tasks}
+
+        async def run_task(task, dependency_results):
+            agent = self._sub_agents().get(task["agent"])
+            if agent is None:
+                return self._no_agent(task)
+            reply = await agent.ainvoke(with_context(task, dependency_results))
+            return await self.atry_execute_action(reply)
+
+        results = await run_task_graph(tasks, run_task)
+        return self._merge_task_results(tasks, results)
+
+    async def _aroute(self, message):
+        """
+        Routing stage of astream(). Returns (route, None) where route has
+        "agent", "message", "source" and, when the fused router already
+        produced it, "action". Returns (None, error_dict) on failure.
+        """
+        fast_agent = self._fast_route(message)
+        if fast_agent is not None:
+            return {"agent": fast_agent, "message": message, "source": "fast_router", "action": None}, None
+
+        if self.fused_routing:
+            router_output = await self.fused_agent.ainvoke(message)
+            agent_name, action = self._read_fused_output(router_output)
+            if agent_name == TASKS:
+                return {"tasks": action, "agent": None, "message": message, "source": "fused", "action": None}, None
+            if agent_name is not None:
+                return {"agent": agent_name, "message": message, "source": "fused", "action": action}, None
+
+        router_output = await self.agent.ainvoke(message)
+        router_json, error = self._parse_router_output(router_output)
+        if error:
+            return None, error
+
+        self._log_decision(message, router_json)
+        return {
+            "tasks": router_json.get("tasks"),
+            "agent": router_json.get("agent"),
+            "message": router_json.get("message", message),
+            "source": "router",
+            "action": None
+        }, None
+
+    async def astream(self, message):
+        """
+        Same pipeline as ainvoke(), yielding {"event", "data"} dicts as
+        each stage finishes: routed, action, tool_started, token (news
+        summaries), tool_result and final.
+        """
+        route, error = await self._aroute(message)
+        if error:
+            yield {"event": "error", "data": error}
+            return
+
+        if route.get("tasks"):
+            yield {"event": "routed", "data": {"tasks": route["tasks"], "source": route["source"]}}
+            yield {"event": "final", "data": await self._arun_tasks(route["tasks"])}
+            return
+
+        yield {"event": "routed", "data": {"agent": route["agent"], "source": route["source"]}}
+
+        sub_agent = self._sub_agents().get(route["agent"])
+        if sub_agent is None:
+            yield {"event": "final", "data": self._no_agent({"agent": route["agent"], "message": message})}
+            return
+
+        action = route["action"]
+        if action is None:
+            # Every sub-agent wraps an Agent; call it directly so the action
+            # is surfaced before it runs (CalendarAgent.ainvoke executes it).
+            response = await sub_agent.agent.ainvoke(route["message"])
+            reply = response["choices"][0]["message"]["content"]
+            name, payload = parse_reply(reply)
+            if name is None:
+                yield {"event": "final", "data": payload}
+                return
+            action = {"action": name, "data": payload}
+
+        yield {"event": "action", "data": action}
+        yield {"event": "tool_started", "data": {"action": action["action"]}}
+
+        if action["action"] != "fetch_news":
+            result = await aexecute_action(action)
+            yield {"event": "tool_result", "data": result}
+            yield {"event": "final", "data": result}
+            return
+
+        news = FetchNewsPayload.model_validate(action["data"])
+        digest = self.news_pipeline.cached_digest(news.query, news.max_results)
+        if digest is not None:
+            yield {"event": "tool_result", "data": {"articles": digest["articles"]}}
+            yield {"event": "token", "data": digest["summary"]}
+            yield {"event": "final", "data": {
+                "status": "success",
+                "query": news.query,
+                "summary": digest["summary"],
+                "articles": digest["articles"],
+                "cache_age_seconds": cache_age(digest)
+            }}
+            return
+
+        articles = await asyncio.to_thread(fetch_news_articles, news)
+        yield {"event": "tool_result", "data": {"articles": articles}}
+
+        if not articles:
+            yield {"event": "final", "data": {"status": "error", "message": "No news found"}}
+            return
+
+        parts = []
+        async for delta in self.news_pipeline.astream_summary(articles, max_points=7):
+            parts.append(delta)
+            yield {"event": "token", "data": delta}
+
+        summary = "".join(parts)
+        self.news_pipeline.store_digest(news.query, news.max_results, summary, articles)
+        yield {"event": "final", "data": {
+            "status": "success",
+            "query": news.query,
+            "summary": summary,
+            "articles": articles,
+            "cache_age_seconds": 0
+        }}
@@ -9,7 +9,8 @@ You MUST output only JSON.
 Possible actions:
 1. search_web
 2. scrape_website
-3. search_linkedin
+3. scrape_websites
+4. search_linkedin
 
 Formats:
 
@@ -29,6 +30,14 @@ Scrape website:
   }
 }
 
+Scrape several websites:
+{
+  "action": "scrape_websites",
+  "data": {
+    "urls": ["<website url>", "<website url>"]
+  }
+}
+
 LinkedIn:
 {
   "action": "search_linkedin",
@@ -41,6 +50,7 @@ LinkedIn:
 Rules:
 - If user asks for news, research, info → search_web
 - If user provides a URL or says scrape → scrape_website
+- If user provides more than one URL → scrape_websites
 - If user asks about a person/company LinkedIn → search_linkedin
 
 Only JSON. No explanations.
@@ -55,3 +65,7 @@ class ResearcherAgent:
         response = self.agent.invoke(message)
         return response["choices"][0]["message"]["content"]
 
+    async def ainvoke(self, message):
+        response = await self.agent.ainvoke(message)
+        return response["choices"][0]["message"]["content"]
+
@@ -0,0 +1,115 @@
+"""
+Small DAG scheduler for multi-intent messages.
+
+A task is {"id": str, "agent": str, "message": str, "depends_on": [ids]}.
+Independent branches run concurrently (bounded by a semaphore). A task
+starts as soon as its dependencies finish, and it receives their results.
+"""
+import asyncio
+from src.core.config import MAX_TASK_CONCURRENCY
+
+
+class TaskGraphError(ValueError):
+    pass
+
+
+def normalize_tasks(tasks):
+    """
+    Fills in ids/depends_on and validates that the graph is a DAG.
+    Tasks come from LLM output, so any malformed entry is a TaskGraphError.
+    """
+    if not isinstance(tasks, list):
+        raise TaskGraphError("Tasks must be a list")
+
+    normalized = []
+    for i, task in enumerate(tasks):
+        if not isinstance(task, dict):
+            raise TaskGraphError(f"Task {i + 1} is not an object")
+        depends_on = task.get("depends_on") or []
+        if not isinstance(depends_on, list):
+            raise TaskGraphError(f"Task {i + 1} depends_on is not a list")
+        message = task.get("message", "")
+        if not isinstance(message, str):
+            raise TaskGraphError(f"Task {i + 1} message is not a string")
+
+        normalized.append({
+            "id": str(task.get("id") or f"t{i + 1}"),
+            "agent": task.get("agent"),
+            "message": message,
+            "depends_on": [str(d) for d in depends_on],
+        })
+
+    ids = {task["id"] for task in normalized}
+    if len(ids) != len(normalized):
+        raise TaskGraphError("Duplicate task ids")
+
+    for task in normalized:
+        unknown = set(task["depends_on"]) - ids
+        if unknown:
+            raise TaskGraphError(f"Task {task['id']} depends on unknown tasks: {sorted(unknown)}")
+
+    topological_order(normalized)
+    return normalized
+
+
+def topological_order(tasks):
+    by_id = {task["id"]: task for task in tasks}
+    order, state = [], {}
+
+    def visit(task_id):
+        if state.get(task_id) == "done":
+            return
+        if state.get(task_id) == "visiting":
+            raise TaskGraphError(f"Cycle detected at task {task_id}")
+        state[task_id] = "visiting"
+        for dep in by_id[task_id]["depends_on"]:
+            visit(dep)
+        state[task_id] = "done"
+        order.append(by_id[task_id])
+
+    for task in tasks:
+        visit(task["id"])
+    return order
+
+
+def with_context(task, dependency_results):
+    """
+    Appends dependency results to the task message so a step such as
+    "send it to Bob" can use the address found by a previous step.
+    """
+    if not dependency_results:
+        return task["message"]
+    return f"{task['message']}\n\nResults of previous steps: {dependency_results}"
+
+
+async def run_task_graph(tasks, run_task, max_concurrency=MAX_TASK_CONCURRENCY):
+    """
+    run_task(task, dependency_results) -> awaitable result.
+    Returns {task_id: result}. A failed task records {"error": ...}, and
+    its dependents are skipped.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    futures = {task["id"]: asyncio.get_running_loop().create_future() for task in tasks}
+    results = {}
+
+    async def run(task):
+        dependency_results = {}
+        for dep in task["depends_on"]:
+            dependency_results[dep] = await futures[dep]
+
+        failed = [dep for dep, r in dependency_results.items() if isinstance(r, dict) and r.get("skipped")]
+        failed += [dep for dep, r in dependency_results.items() if isinstance(r, dict) and "error" in r]
+        if failed:
+            result = {"skipped": True, "error": f"Dependencies failed: {sorted(set(failed))}"}
+        else:
+            async with semaphore:
+                try:
+                    result = await run_task(task, dependency_results)
+                except Exception as e:
+                    result = {"error": str(e)}
+
+        results[task["id"]] = result
+        futures[task["id"]].set_result(result)
+
+    await asyncio.gather(*(run(task) for task in tasks))
+    return results
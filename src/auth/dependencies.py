@@ -1,16 +1,28 @@
+from typing import Optional
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
-from src.utils.config import JWT_SECRET, JWT_ALGORITHM
+from jose import JOSEError
+from src.auth.jwt import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 def get_current_user(token: str = Depends(oauth2_scheme)):
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("user_id")
-        if not user_id:
-            raise Exception()
-        return user_id
-    except:
+        payload = decode_access_token(token)
+    except JOSEError:
         raise HTTPException(status_code=401, detail="Invalid token")
+
+    user_id = payload.get("user_id")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return user_id
+
+def get_optional_user(token: Optional[str] = Depends(optional_oauth2_scheme)):
+    """
+    user_id for a valid bearer token, None when there is no token.
+    A token that is present but invalid is still rejected.
+    """
+    if token is None:
+        return None
+    return get_current_user(token)
@@ -1,8 +1,96 @@
-from jose import jwt
+import threading
+import time
+from collections import OrderedDict
+from jose import jwt, JWTError
 from datetime import datetime, timedelta
-from src.utils.config import JWT_SECRET, JWT_ALGORITHM
+from src.utils.config import JWT_SECRET, JWT_ALGORITHM, JWT_SECRETS, JWT_ACTIVE_KID, JWT_CACHE_SIZE
+
+
+def check_signing_config():
+    """
+    Called at startup, so a bad JWT_ACTIVE_KID fails the deploy instead
+    of every login.
+    """
+    if JWT_ACTIVE_KID and JWT_ACTIVE_KID not in JWT_SECRETS:
+        raise ValueError(f"JWT_ACTIVE_KID {JWT_ACTIVE_KID!r} is not listed in JWT_SECRETS")
+    if not JWT_ACTIVE_KID and not JWT_SECRET:
+        raise ValueError("JWT_SECRET missing in environment variables")
+
+def _signing_key():
+    if JWT_ACTIVE_KID:
+        check_signing_config()
+        return JWT_ACTIVE_KID, JWT_SECRETS[JWT_ACTIVE_KID]
+    return None, JWT_SECRET
+
+def _verification_key(token):
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid is None:
+        if not JWT_SECRET:
+            raise JWTError("Token has no key id")
+        return JWT_SECRET
+    # The header is attacker-controlled: anything but a known kid is an invalid token
+    if not isinstance(kid, str) or kid not in JWT_SECRETS:
+        raise JWTError(f"Unknown key id {kid!r}")
+    return JWT_SECRETS[kid]
 
 def create_access_token(data: dict):
     payload = data.copy()
     payload["exp"] = datetime.utcnow() + timedelta(hours=12)
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    kid, secret = _signing_key()
+    headers = {"kid": kid} if kid else None
+    return jwt.encode(payload, secret, algorithm=JWT_ALGORITHM, headers=headers)
+
+
+class VerifiedTokenCache:
+    """
+    LRU of token -> verified claims. Entries are dropped at the token's
+    exp, so a cached token is never accepted after it would have failed
+    verification.
+    """
+
+    def __init__(self, max_entries=JWT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            claims, exp = entry
+            if exp <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return claims
+
+    def set(self, token, claims):
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._entries[token] = (claims, exp)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_verified = VerifiedTokenCache()
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verified claims for token; raises a JOSEError if it is invalid or expired.
+    """
+    claims = _verified.get(token)
+    if claims is not None:
+        return claims
+
+    claims = jwt.decode(token, _verification_key(token), algorithms=[JWT_ALGORITHM])
+    _verified.set(token, claims)
+    return claims
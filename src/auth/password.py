@@ -1,12 +1,83 @@
+"""
+bcrypt password hashing.
+
+hash_password / verify_password are the plain sync calls. The async
+API (ahash_password / averify_password) runs them in a bounded process
+pool so a burst of logins never stalls the event loop, and rejects new
+work with PasswordHasherBusy once PASSWORD_HASH_MAX_PENDING calls are
+queued instead of letting latency grow without bound.
+"""
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from passlib.context import CryptContext
+from src.utils.config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
 
+# min_rounds makes needs_update() flag hashes made with a lower cost factor
 pwd_context = CryptContext(
     schemes=["bcrypt"],
-    deprecated="auto"
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS
 )
 
+_pool = None
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(password: str, hashed_password: str) -> bool:
     return pwd_context.verify(password, hashed_password)
+
+def verify_and_update(password: str, hashed_password: str):
+    """
+    Returns (valid, new_hash). new_hash is set when the stored hash is
+    valid but needs_update() (e.g. BCRYPT_ROUNDS was raised).
+    """
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+def _get_pool():
+    global _pool
+    if _pool is None and PASSWORD_HASH_WORKERS > 0:
+        _pool = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+    return _pool
+
+
+def shutdown_password_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+    _pool = None
+
+
+async def _run(fn, *args):
+    global _pending
+    with _pending_lock:
+        if _pending >= PASSWORD_HASH_MAX_PENDING:
+            raise PasswordHasherBusy()
+        _pending += 1
+
+    try:
+        # A pool of 0 workers falls back to a thread (e.g. where fork is unavailable)
+        pool = _get_pool()
+        if pool is None:
+            return await asyncio.to_thread(fn, *args)
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+async def ahash_password(password: str) -> str:
+    return await _run(hash_password, password)
+
+async def averify_password(password: str, hashed_password: str):
+    return await _run(verify_and_update, password, hashed_password)
@@ -0,0 +1,268 @@
+"""
+Response cache for Perplexity calls.
+
+Keys are (model, sha256(system prompt), normalized user message). Values
+are the raw JSON completions. Backends are swappable: an in-process LRU
+and a SQLite file that several workers on one host can share. An opt-in
+semantic mode also matches near-duplicate messages by cosine similarity,
+but only for calls that ask for it (semantic=True). Router and agent
+outputs repeat the user's text or carry actions, so a near-duplicate hit
+there would hand back another request's content; they match exactly.
+"""
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from src.core.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_BACKEND,
+    LLM_CACHE_TTL,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_SQLITE_PATH,
+    LLM_CACHE_SEMANTIC,
+    LLM_CACHE_SIMILARITY,
+)
+from src.core.metrics import metrics
+
+_WS_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"\w+")
+# Emails, URLs and numbers must match exactly for a semantic hit:
+# "email bob@x.com" and "email bob@y.com" are similar but not interchangeable.
+_ENTITY_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+|https?://\S+|\d+")
+
+
+def normalize_message(message):
+    # Whitespace only: a cached action must not come back with another
+    # request's casing in its subject or body.
+    return _WS_RE.sub(" ", message.strip())
+
+
+def prompt_hash(system_prompt):
+    return hashlib.sha256(system_prompt.encode()).hexdigest()
+
+
+class MemoryBackend:
+    """
+    LRU with per-entry expiry, bounded by entry count and total bytes.
+    """
+
+    def __init__(self, max_entries=LLM_CACHE_MAX_ENTRIES, max_bytes=LLM_CACHE_MAX_BYTES, namespace="llm_cache"):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.time() + ttl)
+            self._bytes += len(value)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                metrics.incr(f"{self.namespace}.evictions")
+
+    def bytes_held(self):
+        return self._bytes
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value)
+
+
+class SQLiteBackend:
+    """
+    File-backed store that can be shared by several worker processes.
+    """
+
+    def __init__(self, path=LLM_CACHE_SQLITE_PATH, max_entries=LLM_CACHE_MAX_ENTRIES, namespace="llm_cache"):
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value BLOB, expires_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed_at)")
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now)
+            )
+            self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+            overflow = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN "
+                    "(SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                    (overflow,)
+                )
+                metrics.incr(f"{self.namespace}.evictions", overflow)
+
+    def bytes_held(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM cache").fetchone()[0]
+
+
+def _vectorize(text):
+    return Counter(_TOKEN_RE.findall(text.lower()))
+
+
+def _cosine(a, b):
+    dot = sum(count * b.get(token, 0) for token, count in a.items())
+    if not dot:
+        return 0.0
+    norm_a = math.sqrt(sum(c * c for c in a.values()))
+    norm_b = math.sqrt(sum(c * c for c in b.values()))
+    return dot / (norm_a * norm_b)
+
+
+class SemanticIndex:
+    """
+    Near-duplicate lookup over recently cached messages. The default
+    embedding is a bag of words. Pass embed/similarity functions to plug
+    in a real embedding model.
+    """
+
+    def __init__(self, threshold=LLM_CACHE_SIMILARITY, max_entries=LLM_CACHE_MAX_ENTRIES,
+                 embed=_vectorize, similarity=_cosine):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.embed = embed
+        self.similarity = similarity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, scope, message, key):
+        entry = (scope, self.embed(message), set(_ENTITY_RE.findall(message.lower())))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def nearest(self, scope, message):
+        vector = self.embed(message)
+        entities = set(_ENTITY_RE.findall(message.lower()))
+        best_key, best_score = None, self.threshold
+
+        with self._lock:
+            candidates = list(self._entries.items())
+
+        for key, (entry_scope, entry_vector, entry_entities) in candidates:
+            if entry_scope != scope or entry_entities != entities:
+                continue
+            score = self.similarity(vector, entry_vector)
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        return best_key
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl=LLM_CACHE_TTL, semantic_index=None):
+        self.backend = backend
+        self.ttl = ttl
+        self.semantic_index = semantic_index
+
+    @staticmethod
+    def _scope(model, system_prompt):
+        return f"{model}:{prompt_hash(system_prompt)}"
+
+    def _key(self, scope, message):
+        return f"{scope}:{hashlib.sha256(message.encode()).hexdigest()}"
+
+    def get(self, model, system_prompt, user_message, semantic=False):
+        scope = self._scope(model, system_prompt)
+        message = normalize_message(user_message)
+
+        value = self.backend.get(self._key(scope, message))
+        if value is None and semantic and self.semantic_index is not None:
+            near_key = self.semantic_index.nearest(scope, message)
+            if near_key is not None:
+                value = self.backend.get(near_key)
+                if value is not None:
+                    metrics.incr("llm_cache.semantic_hits")
+
+        if value is None:
+            metrics.incr("llm_cache.misses")
+            self._update_ratio()
+            return None
+
+        metrics.incr("llm_cache.hits")
+        self._update_ratio()
+        return json.loads(value)
+
+    def set(self, model, system_prompt, user_message, response, semantic=False):
+        scope = self._scope(model, system_prompt)
+        message = normalize_message(user_message)
+        key = self._key(scope, message)
+
+        self.backend.set(key, json.dumps(response).encode(), self.ttl)
+        if semantic and self.semantic_index is not None:
+            self.semantic_index.add(scope, message, key)
+
+        metrics.set_gauge("llm_cache.bytes", self.backend.bytes_held())
+
+    @staticmethod
+    def _update_ratio():
+        hits = metrics.get("llm_cache.hits")
+        total = hits + metrics.get("llm_cache.misses")
+        metrics.set_gauge("llm_cache.hit_ratio", hits / total if total else 0.0)
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    """
+    Process-wide cache configured from LLM_CACHE_* settings, or None when disabled.
+    """
+    global _response_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        backend = SQLiteBackend() if LLM_CACHE_BACKEND == "sqlite" else MemoryBackend()
+        semantic_index = SemanticIndex() if LLM_CACHE_SEMANTIC else None
+        _response_cache = ResponseCache(backend, semantic_index=semantic_index)
+    return _response_cache
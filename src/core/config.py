@@ -0,0 +1,115 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PPLX_API_URL = os.getenv("PPLX_API_URL", "https://api.perplexity.ai/chat/completions")
+
+# Shared HTTP transport (src/core/http.py)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "100"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "8"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+# Single-hop routing: one LLM call picks the agent AND produces the action
+FUSED_ROUTING = os.getenv("FUSED_ROUTING", "false").lower() == "true"
+
+# Local pre-router (src/agents/fast_router.py)
+# Off until `python -m src.agents.fast_router evaluate` shows high precision on logged decisions
+FAST_ROUTER_ENABLED = os.getenv("FAST_ROUTER_ENABLED", "false").lower() == "true"
+FAST_ROUTER_MODEL = os.getenv("FAST_ROUTER_MODEL")
+FAST_ROUTER_MIN_CONFIDENCE = float(os.getenv("FAST_ROUTER_MIN_CONFIDENCE", "0.9"))
+ROUTER_DECISION_LOG = os.getenv("ROUTER_DECISION_LOG")
+
+# LLM response cache (src/core/cache.py)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")  # memory | sqlite
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+LLM_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH", "llm_cache.sqlite3")
+# Near-duplicate matching, for calls that opt in (news summaries)
+LLM_CACHE_SEMANTIC = os.getenv("LLM_CACHE_SEMANTIC", "false").lower() == "true"
+LLM_CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY", "0.92"))
+
+# googleapiclient service objects cached per (API, version, credential, thread)
+GOOGLE_SERVICE_CACHE_SIZE = int(os.getenv("GOOGLE_SERVICE_CACHE_SIZE", "256"))
+
+# Refresh Google credentials this many seconds before they expire
+GOOGLE_REFRESH_MARGIN = int(os.getenv("GOOGLE_REFRESH_MARGIN", "300"))
+
+# Per-user Google credentials loaded from MongoDB (src/utils/google_auth.py)
+GOOGLE_CREDENTIAL_CACHE_TTL = int(os.getenv("GOOGLE_CREDENTIAL_CACHE_TTL", "300"))
+GOOGLE_CREDENTIAL_CACHE_SIZE = int(os.getenv("GOOGLE_CREDENTIAL_CACHE_SIZE", "1000"))
+
+# Let requests without a signed-in user use the server's token_*.json
+# files. Off by default: those files are the operator's own Google account.
+ALLOW_ANONYMOUS_GOOGLE = os.getenv("ALLOW_ANONYMOUS_GOOGLE", "false").lower() == "true"
+
+# Gmail read_emails paging / batching
+GMAIL_MAX_RESULTS = int(os.getenv("GMAIL_MAX_RESULTS", "20"))
+GMAIL_PAGE_SIZE = int(os.getenv("GMAIL_PAGE_SIZE", "100"))
+GMAIL_BATCH_SIZE = int(os.getenv("GMAIL_BATCH_SIZE", "50"))
+
+# Incremental Gmail sync (src/tools/gmail_index.py): "search" | "incremental"
+GMAIL_SYNC_MODE = os.getenv("GMAIL_SYNC_MODE", "search")
+GMAIL_INDEX_PATH = os.getenv("GMAIL_INDEX_PATH", "gmail_index.sqlite3")
+GMAIL_SYNC_BOOTSTRAP_DAYS = int(os.getenv("GMAIL_SYNC_BOOTSTRAP_DAYS", "30"))
+GMAIL_SYNC_BOOTSTRAP_MAX = int(os.getenv("GMAIL_SYNC_BOOTSTRAP_MAX", "500"))
+
+# Gmail bulk send
+GMAIL_SEND_CONCURRENCY = int(os.getenv("GMAIL_SEND_CONCURRENCY", "8"))
+GMAIL_SEND_MAX_RETRIES = int(os.getenv("GMAIL_SEND_MAX_RETRIES", "3"))
+
+# Multi-intent fan-out: max sub-tasks running at once per request
+MAX_TASK_CONCURRENCY = int(os.getenv("MAX_TASK_CONCURRENCY", "4"))
+
+# Tavily web search (src/tools/search_web.py)
+TAVILY_TIMEOUT = float(os.getenv("TAVILY_TIMEOUT", "20"))
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "3600"))
+SEARCH_CACHE_TTL_TIME_SENSITIVE = int(os.getenv("SEARCH_CACHE_TTL_TIME_SENSITIVE", "120"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1000"))
+
+# News pipeline (src/agents/news_pipeline.py)
+NEWS_CACHE_BUCKET_SECONDS = int(os.getenv("NEWS_CACHE_BUCKET_SECONDS", "3600"))
+NEWS_CACHE_MAX_ENTRIES = int(os.getenv("NEWS_CACHE_MAX_ENTRIES", "500"))
+NEWS_RSS_ENABLED = os.getenv("NEWS_RSS_ENABLED", "true").lower() == "true"
+NEWS_RSS_URL = os.getenv("NEWS_RSS_URL", "https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en")
+NEWS_RSS_TIMEOUT = float(os.getenv("NEWS_RSS_TIMEOUT", "10"))
+NEWS_TITLE_SIMILARITY = float(os.getenv("NEWS_TITLE_SIMILARITY", "0.8"))
+
+# Background pre-warming of popular news digests (src/agents/news_prewarm.py)
+NEWS_PREWARM_ENABLED = os.getenv("NEWS_PREWARM_ENABLED", "true").lower() == "true"
+NEWS_PREWARM_INTERVAL = int(os.getenv("NEWS_PREWARM_INTERVAL", "300"))
+NEWS_PREWARM_TOPICS = int(os.getenv("NEWS_PREWARM_TOPICS", "5"))
+NEWS_PREWARM_WINDOW = int(os.getenv("NEWS_PREWARM_WINDOW", str(24 * 3600)))
+NEWS_PREWARM_MAX_REFRESHES_PER_HOUR = int(os.getenv("NEWS_PREWARM_MAX_REFRESHES_PER_HOUR", "20"))
+
+# Circuit breakers / bulkheads per upstream (src/core/resilience.py)
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "30"))
+BULKHEAD_MAX_WAIT = float(os.getenv("BULKHEAD_MAX_WAIT", "5"))
+UPSTREAM_CONCURRENCY = {
+    "perplexity": int(os.getenv("PERPLEXITY_CONCURRENCY", "50")),
+    "tavily": int(os.getenv("TAVILY_CONCURRENCY", "10")),
+    "gmail": int(os.getenv("GMAIL_CONCURRENCY", "10")),
+    "calendar": int(os.getenv("CALENDAR_CONCURRENCY", "10")),
+    "people": int(os.getenv("PEOPLE_CONCURRENCY", "10")),
+    "scrape": int(os.getenv("SCRAPE_CONCURRENCY_PER_HOST", "4")),
+}
+
+# Web scraping (src/tools/scrape_website.py)
+SCRAPE_CONNECT_TIMEOUT = float(os.getenv("SCRAPE_CONNECT_TIMEOUT", "5"))
+SCRAPE_READ_TIMEOUT = float(os.getenv("SCRAPE_READ_TIMEOUT", "15"))
+SCRAPE_MAX_BYTES = int(os.getenv("SCRAPE_MAX_BYTES", str(2 * 1024 * 1024)))
+SCRAPE_MAX_TOKENS = int(os.getenv("SCRAPE_MAX_TOKENS", "6000"))
+SCRAPE_CACHE_ENABLED = os.getenv("SCRAPE_CACHE_ENABLED", "true").lower() == "true"
+SCRAPE_CACHE_DIR = os.getenv("SCRAPE_CACHE_DIR", ".scrape_cache")
+SCRAPE_CACHE_MAX_BYTES = int(os.getenv("SCRAPE_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+SCRAPE_MAX_CONCURRENCY = int(os.getenv("SCRAPE_MAX_CONCURRENCY", "8"))
+SCRAPE_MAX_URLS = int(os.getenv("SCRAPE_MAX_URLS", "20"))
+SCRAPE_CONVERT_WORKERS = int(os.getenv("SCRAPE_CONVERT_WORKERS", "2"))
+ROBOTS_CACHE_TTL = int(os.getenv("ROBOTS_CACHE_TTL", "3600"))
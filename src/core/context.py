@@ -0,0 +1,11 @@
+"""
+Per-request context. /chat sets current_user_id for authenticated
+requests and tools read it to pick that user's Google credentials.
+
+ContextVars follow asyncio tasks and asyncio.to_thread; work handed to
+a plain executor must be wrapped with contextvars.copy_context().run.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+current_user_id: ContextVar[Optional[str]] = ContextVar("current_user_id", default=None)
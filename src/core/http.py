@@ -0,0 +1,165 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from src.core.config import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_POOL_SIZE,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_MAX,
+    HTTP2_ENABLED,
+)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_session = None
+_async_client = None
+# Set by scoped_async_client() for code running on a short-lived loop
+_scoped_client: ContextVar = ContextVar("scoped_async_client", default=None)
+
+
+def get_session():
+    """
+    Process-wide requests.Session with a keep-alive connection pool,
+    so sync callers stop paying a TCP+TLS handshake per call.
+    """
+    global _session
+    if _session is None:
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE
+        )
+        _session = requests.Session()
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
+
+def _http2_available():
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_async_client():
+    """
+    Shared httpx.AsyncClient (keep-alive pool, optional HTTP/2).
+    """
+    scoped = _scoped_client.get()
+    if scoped is not None:
+        return scoped
+
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = _new_async_client()
+    return _async_client
+
+
+def _new_async_client():
+    return httpx.AsyncClient(
+        http2=_http2_available(),
+        timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=HTTP_POOL_SIZE,
+            max_keepalive_connections=HTTP_POOL_SIZE
+        )
+    )
+
+
+@asynccontextmanager
+async def scoped_async_client():
+    """
+    A private client for the duration of the block. The shared client's
+    connections belong to the app's event loop, so code run under a
+    throwaway loop (asyncio.run from a sync caller) must not touch it.
+    """
+    client = _new_async_client()
+    token = _scoped_client.set(client)
+    try:
+        yield client
+    finally:
+        _scoped_client.reset(token)
+        await client.aclose()
+
+
+async def aclose_async_client():
+    global _async_client
+    if _async_client is not None and not _async_client.is_closed:
+        await _async_client.aclose()
+    _async_client = None
+
+
+def close_session():
+    global _session
+    if _session is not None:
+        _session.close()
+    _session = None
+
+
+def backoff_delay(attempt, retry_after=None):
+    """
+    Full-jitter exponential backoff; honours a numeric Retry-After header.
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), HTTP_BACKOFF_MAX)
+        except ValueError:
+            pass
+    cap = min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+def post_with_retry(url, json=None, headers=None, max_retries=HTTP_MAX_RETRIES):
+    """
+    POST through the shared session with connect/read timeouts and
+    bounded retries on 429/5xx and connection errors.
+    """
+    session = get_session()
+    timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+    for attempt in range(max_retries + 1):
+        try:
+            response = session.post(url, json=json, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < max_retries:
+            time.sleep(backoff_delay(attempt, response.headers.get("Retry-After")))
+            continue
+
+        return response
+
+
+async def apost_with_retry(url, json=None, headers=None, max_retries=HTTP_MAX_RETRIES):
+    """
+    Async counterpart of post_with_retry on the shared httpx client.
+    """
+    client = get_async_client()
+
+    for attempt in range(max_retries + 1):
+        try:
+            response = await client.post(url, json=json, headers=headers)
+        except (httpx.ConnectError, httpx.TimeoutException):
+            if attempt == max_retries:
+                raise
+            await asyncio.sleep(backoff_delay(attempt))
+            continue
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < max_retries:
+            await asyncio.sleep(backoff_delay(attempt, response.headers.get("Retry-After")))
+            continue
+
+        return response
@@ -1,6 +1,10 @@
-import requests
+import json
 import os
 from dotenv import load_dotenv
+from src.core.config import PPLX_API_URL
+from src.core.http import post_with_retry, apost_with_retry, get_async_client
+from src.core.cache import get_response_cache
+from src.core.resilience import guard, aguard
 
 load_dotenv()
 
@@ -8,21 +12,24 @@ PPLX_API_KEY = os.getenv("PPLX_API_KEY")
 
 class PerplexityLLM:
 
-    def __init__(self):
+    def __init__(self, use_cache=True):
         if not PPLX_API_KEY:
             raise ValueError("PPLX_API_KEY missing in environment variables")
 
         self.api_key = PPLX_API_KEY
-        self.url = "https://api.perplexity.ai/chat/completions"
+        self.url = PPLX_API_URL
+        self.model = "sonar-pro"
+        self.cache = get_response_cache() if use_cache else None
 
-    def call_perplexity_api(self, system_prompt, user_message):
-        headers = {
+    def _headers(self):
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
 
-        payload = {
-            "model": "sonar-pro",
+    def _payload(self, system_prompt, user_message):
+        return {
+            "model": self.model,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_message}
@@ -31,16 +38,108 @@ class PerplexityLLM:
             "search": False
         }
 
-        response = requests.post(self.url, json=payload, headers=headers)
-
+    def _log_response(self, status_code, text):
         print("\n--- RAW RESPONSE ---")
-        print(response.status_code)
-        print(response.text)
+        print(status_code)
+        print(text)
         print("--------------------\n")
 
-        response.raise_for_status()
+    def call_perplexity_api(self, system_prompt, user_message):
+        with guard("perplexity"):
+            response = post_with_retry(
+                self.url,
+                json=self._payload(system_prompt, user_message),
+                headers=self._headers()
+            )
+
+            self._log_response(response.status_code, response.text)
+
+            response.raise_for_status()
+
+        return response.json()
+
+    async def acall_perplexity_api(self, system_prompt, user_message):
+        async with aguard("perplexity"):
+            response = await apost_with_retry(
+                self.url,
+                json=self._payload(system_prompt, user_message),
+                headers=self._headers()
+            )
+
+            self._log_response(response.status_code, response.text)
+
+            response.raise_for_status()
 
         return response.json()
 
-    def generate(self, system_prompt, user_message):
-        return self.call_perplexity_api(system_prompt, user_message)
+    def generate(self, system_prompt, user_message, semantic=False):
+        """
+        semantic=True lets near-duplicate messages share a cached answer.
+        Only for outputs that carry no user content or actions.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self.model, system_prompt, user_message, semantic)
+            if cached is not None:
+                return cached
+
+        response = self.call_perplexity_api(system_prompt, user_message)
+
+        if self.cache is not None:
+            self.cache.set(self.model, system_prompt, user_message, response, semantic)
+        return response
+
+    async def agenerate(self, system_prompt, user_message, semantic=False):
+        if self.cache is not None:
+            cached = self.cache.get(self.model, system_prompt, user_message, semantic)
+            if cached is not None:
+                return cached
+
+        response = await self.acall_perplexity_api(system_prompt, user_message)
+
+        if self.cache is not None:
+            self.cache.set(self.model, system_prompt, user_message, response, semantic)
+        return response
+
+    async def astream(self, system_prompt, user_message, semantic=False):
+        """
+        Yields content deltas as Perplexity generates them (stream: true).
+        A cached completion is yielded in one piece.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self.model, system_prompt, user_message, semantic)
+            if cached is not None:
+                yield cached["choices"][0]["message"]["content"]
+                return
+
+        payload = {**self._payload(system_prompt, user_message), "stream": True}
+        parts = []
+
+        # The breaker only sees opening the stream and its status. Tokens are
+        # yielded outside the guard: a consumer that stops early (client
+        # disconnect) says nothing about Perplexity's health.
+        client = get_async_client()
+        request = client.build_request("POST", self.url, json=payload, headers=self._headers())
+        async with aguard("perplexity"):
+            response = await client.send(request, stream=True)
+            if response.is_error:
+                await response.aclose()
+                response.raise_for_status()
+
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                delta = chunk["choices"][0].get("delta", {}).get("content")
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        finally:
+            await response.aclose()
+
+        if self.cache is not None:
+            response = {"choices": [{"message": {"role": "assistant", "content": "".join(parts)}}]}
+            self.cache.set(self.model, system_prompt, user_message, response, semantic)
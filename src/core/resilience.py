@@ -0,0 +1,307 @@
+"""
+Circuit breakers and bulkheads, one of each per upstream
+(perplexity, tavily, gmail, calendar, people, scrape:<host>).
+
+A breaker opens after `failure_threshold` consecutive failures and
+rejects calls until `reset_timeout` has passed. Then it lets a single
+probe through (half-open). A bulkhead caps concurrent calls per
+upstream, so a slow scrape target can't take every worker thread away
+from calendar calls. Blocking calls also run on a thread pool of their
+upstream's own (get_executor), since a call that outlives its deadline
+keeps its thread after the bulkhead slot is released.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from src.core.config import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    BULKHEAD_MAX_WAIT,
+    UPSTREAM_CONCURRENCY,
+)
+from src.core.metrics import metrics
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_GAUGE = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+
+class UpstreamUnavailable(Exception):
+    """
+    Raised when a breaker is open or a bulkhead is full.
+    """
+
+    def __init__(self, upstream, reason):
+        super().__init__(f"{upstream} unavailable: {reason}")
+        self.upstream = upstream
+        self.reason = reason
+
+
+class CallerError(Exception):
+    """
+    A problem with the request itself (e.g. a user with no connected
+    Google account), not with the upstream: guard() lets it through
+    without counting a breaker failure.
+    """
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._publish()
+
+    def allow(self):
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._set_state(HALF_OPEN)
+
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+        metrics.incr(f"breaker.{self.name}.rejections")
+        return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            self._set_state(CLOSED)
+
+    def record_ignored(self):
+        """
+        The call said nothing about upstream health (CallerError,
+        cancellation): leave the state alone but release the half-open
+        probe slot if it held it.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        metrics.incr(f"breaker.{self.name}.failures")
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def _set_state(self, state):
+        if state != self.state:
+            self.state = state
+            self._publish()
+
+    def _publish(self):
+        metrics.set_gauge(f"breaker.{self.name}.state", _STATE_GAUGE[self.state])
+
+
+class Bulkhead:
+    """
+    Concurrency cap for one upstream, shared by sync callers (worker
+    threads) and async callers (the event loop): one counter under a
+    thread lock. Waiting async callers park on a future of their own
+    loop instead of holding a thread, so nothing is bound to whichever
+    loop happened to use the bulkhead first.
+    """
+
+    def __init__(self, name, max_concurrent, max_wait=BULKHEAD_MAX_WAIT):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self.active = 0
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._async_waiters = []
+
+    def _try_acquire(self):
+        # Caller holds self._lock
+        if self.active < self.max_concurrent:
+            self.active += 1
+            return True
+        return False
+
+    def _reject(self):
+        metrics.incr(f"bulkhead.{self.name}.rejections")
+        return UpstreamUnavailable(self.name, "too many concurrent calls")
+
+    def _release(self):
+        with self._lock:
+            self.active -= 1
+            self._released.notify()
+            waiters, self._async_waiters = self._async_waiters, []
+        # Every parked task retries; the ones that lose the race park again
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass  # that loop has closed; its waiter is gone with it
+
+    @contextmanager
+    def acquire(self):
+        with self._lock:
+            if not self._released.wait_for(self._try_acquire, timeout=self.max_wait):
+                raise self._reject()
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aacquire(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while True:
+            with self._lock:
+                if self._try_acquire():
+                    break
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter[1], timeout=deadline - loop.time())
+            except asyncio.TimeoutError:
+                raise self._reject()
+            finally:
+                with self._lock:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+        try:
+            yield
+        finally:
+            self._release()
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+_breakers = {}
+_bulkheads = {}
+_executors = {}
+_registry_lock = threading.Lock()
+
+
+def _limit_for(upstream):
+    # "scrape:example.com" uses the "scrape" limit, applied per host
+    return UPSTREAM_CONCURRENCY.get(upstream, UPSTREAM_CONCURRENCY.get(upstream.split(":")[0], 10))
+
+
+def get_breaker(upstream):
+    with _registry_lock:
+        if upstream not in _breakers:
+            _breakers[upstream] = CircuitBreaker(upstream)
+        return _breakers[upstream]
+
+
+def get_bulkhead(upstream):
+    with _registry_lock:
+        if upstream not in _bulkheads:
+            _bulkheads[upstream] = Bulkhead(upstream, _limit_for(upstream))
+        return _bulkheads[upstream]
+
+
+def get_executor(upstream):
+    """
+    Thread pool for blocking calls to one upstream, sized to its bulkhead.
+    Hung Gmail threads can only exhaust the gmail pool, never calendar's.
+    """
+    with _registry_lock:
+        if upstream not in _executors:
+            _executors[upstream] = ThreadPoolExecutor(
+                max_workers=_limit_for(upstream),
+                thread_name_prefix=f"upstream-{upstream}"
+            )
+        return _executors[upstream]
+
+
+def shutdown_executors():
+    with _registry_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _is_failure(result):
+    return isinstance(result, dict) and "error" in result
+
+
+class _Call:
+    """
+    Lets the guarded block report a failed result that wasn't raised,
+    e.g. a tool that catches HttpError and returns {"error": ...}.
+    """
+
+    def __init__(self):
+        self.failed = False
+
+    def check(self, result):
+        self.failed = _is_failure(result)
+        return result
+
+
+@contextmanager
+def guard(upstream):
+    breaker = get_breaker(upstream)
+
+    with get_bulkhead(upstream).acquire():
+        if not breaker.allow():
+            raise UpstreamUnavailable(upstream, "circuit open")
+
+        call = _Call()
+        try:
+            yield call
+        except CallerError:
+            breaker.record_ignored()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.record_ignored()
+            raise
+
+        if call.failed:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+
+@asynccontextmanager
+async def aguard(upstream):
+    breaker = get_breaker(upstream)
+
+    async with get_bulkhead(upstream).aacquire():
+        if not breaker.allow():
+            raise UpstreamUnavailable(upstream, "circuit open")
+
+        call = _Call()
+        try:
+            yield call
+        except CallerError:
+            breaker.record_ignored()
+            raise
+        except Exception:
+            # Includes TimeoutError from a per-tool deadline inside the block
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled or closed early (client disconnect, aclose()): says
+            # nothing about the upstream, but must not keep the probe slot
+            breaker.record_ignored()
+            raise
+
+        if call.failed:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
@@ -1,10 +1,93 @@
-from pymongo import MongoClient
-from src.utils.config import MONGO_URI
+"""
+Motor client for the auth / OAuth routers.
 
-client = MongoClient(MONGO_URI)
-db = client.autopilot
+The client is created in the FastAPI lifespan (connect_mongo) rather
+than at import, with an explicit pool size and timeouts, and closed on
+shutdown. Handlers get repositories through the dependencies below.
+"""
+from pymongo import ASCENDING
+from motor.motor_asyncio import AsyncIOMotorClient
+from src.utils.config import (
+    MONGO_URI,
+    MONGO_DB_NAME,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_CONNECT_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS,
+)
+from src.db.repositories import UsersRepository, GoogleTokensRepository
 
-users_collection = db.users
-google_tokens_collection = db.google_tokens
-google_tokens_collection.create_index("user_id", unique=True)
+# (collection, keys, options). create_index is a no-op when an identical
+# index exists, so this runs on every boot.
+INDEXES = [
+    ("users", [("email", ASCENDING)], {"unique": True, "name": "email_unique"}),
+    ("google_tokens", [("user_id", ASCENDING)], {"unique": True}),
+    ("google_tokens", [("oauth_state", ASCENDING)], {"sparse": True}),
+]
 
+_client = None
+_db = None
+
+
+async def ensure_indexes(db):
+    """
+    Creates the indexes in INDEXES and prints what exists at boot. Fails
+    startup if one can't be built (e.g. duplicate emails already stored),
+    since signup relies on the unique email index.
+    """
+    for collection, keys, options in INDEXES:
+        name = await db[collection].create_index(keys, **options)
+        flags = ", ".join(k for k in ("unique", "sparse") if options.get(k))
+        print(f"MongoDB index ready: {collection}.{name}" + (f" ({flags})" if flags else ""))
+
+
+async def connect_mongo(uri=MONGO_URI, db_name=MONGO_DB_NAME):
+    global _client, _db
+    if _client is not None:
+        return _db
+
+    _client = AsyncIOMotorClient(
+        uri,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    )
+    _db = _client[db_name]
+
+    await ensure_indexes(_db)
+    return _db
+
+
+def close_mongo():
+    global _client, _db
+    if _client is not None:
+        _client.close()
+    _client = None
+    _db = None
+
+
+def get_db():
+    if _db is None:
+        raise RuntimeError("MongoDB is not connected; connect_mongo() runs in the app lifespan")
+    return _db
+
+
+def get_sync_db():
+    """
+    Blocking handle on the same connection pool (Motor's underlying
+    pymongo client), for code that already runs in worker threads.
+    """
+    return get_db().delegate
+
+
+def get_users_repository():
+    return UsersRepository(get_db())
+
+
+def get_google_tokens_repository():
+    return GoogleTokensRepository(get_db())
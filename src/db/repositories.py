@@ -0,0 +1,63 @@
+"""
+Data access for the users and google_tokens collections. Repositories
+wrap a Motor (or any API-compatible async) database handle; they are
+cheap to construct, so handlers build one per request.
+"""
+from pymongo.errors import DuplicateKeyError
+
+
+class UserAlreadyExists(Exception):
+    pass
+
+
+class UsersRepository:
+    def __init__(self, db):
+        self.collection = db.users
+
+    async def find_by_email(self, email):
+        return await self.collection.find_one({"email": email})
+
+    async def create(self, email, password_hash):
+        """
+        Single insert; the unique index on email rejects duplicates,
+        including concurrent signups for the same address.
+        """
+        try:
+            result = await self.collection.insert_one({
+                "email": email,
+                "password": password_hash
+            })
+        except DuplicateKeyError:
+            raise UserAlreadyExists(email)
+        return str(result.inserted_id)
+
+    async def update_password(self, user_id, password_hash):
+        await self.collection.update_one(
+            {"_id": user_id},
+            {"$set": {"password": password_hash}}
+        )
+
+
+class GoogleTokensRepository:
+    def __init__(self, db):
+        self.collection = db.google_tokens
+
+    async def find_by_user(self, user_id):
+        return await self.collection.find_one({"user_id": user_id})
+
+    async def find_by_state(self, state):
+        return await self.collection.find_one({"oauth_state": state})
+
+    async def set_oauth_state(self, user_id, state):
+        await self.collection.update_one(
+            {"user_id": user_id},
+            {"$set": {"oauth_state": state}},
+            upsert=True
+        )
+
+    async def save_tokens(self, user_id, token_data):
+        await self.collection.update_one(
+            {"user_id": user_id},
+            {"$set": token_data},
+            upsert=True
+        )
@@ -1,28 +1,46 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from src.models.user import UserCreate, UserLogin
-from src.db.mongo import users_collection
-from src.auth.password import hash_password, verify_password
+from src.db.mongo import get_users_repository
+from src.db.repositories import UsersRepository, UserAlreadyExists
+from src.auth.password import ahash_password, averify_password, PasswordHasherBusy
 from src.auth.jwt import create_access_token
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+
+def _busy():
+    return HTTPException(status_code=503, detail="Server busy, retry shortly", headers={"Retry-After": "1"})
+
 @router.post("/signup")
-def signup(user: UserCreate):
-    if users_collection.find_one({"email": user.email}):
-        raise HTTPException(status_code=400, detail="User already exists")
+async def signup(user: UserCreate, users: UsersRepository = Depends(get_users_repository)):
+    try:
+        password_hash = await ahash_password(user.password)
+    except PasswordHasherBusy:
+        raise _busy()
 
-    users_collection.insert_one({
-        "email": user.email,
-        "password": hash_password(user.password)
-    })
+    try:
+        await users.create(user.email, password_hash)
+    except UserAlreadyExists:
+        raise HTTPException(status_code=400, detail="User already exists")
 
     return {"message": "Signup successful"}
 
 @router.post("/login")
-def login(user: UserLogin):
-    db_user = users_collection.find_one({"email": user.email})
-    if not db_user or not verify_password(user.password, db_user["password"]):
+async def login(user: UserLogin, users: UsersRepository = Depends(get_users_repository)):
+    db_user = await users.find_by_email(user.email)
+    if not db_user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    try:
+        valid, new_hash = await averify_password(user.password, db_user["password"])
+    except PasswordHasherBusy:
+        raise _busy()
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # Stored hash used an outdated cost factor: upgrade it transparently
+    if new_hash:
+        await users.update_password(db_user["_id"], new_hash)
+
     token = create_access_token({"user_id": str(db_user["_id"])})
     return {"access_token": token}
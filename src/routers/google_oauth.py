@@ -1,8 +1,11 @@
+import asyncio
 from fastapi import APIRouter, Depends, Request, HTTPException
 from google_auth_oauthlib.flow import Flow
 from src.utils.config import GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET
-from src.db.mongo import google_tokens_collection
+from src.db.mongo import get_google_tokens_repository
+from src.db.repositories import GoogleTokensRepository
 from src.auth.dependencies import get_current_user
+from src.utils.google_auth import user_credentials
 from src.models.google_token import GoogleTokenCreate
 from datetime import datetime
 import os
@@ -13,12 +16,15 @@ router = APIRouter(prefix="/google", tags=["Google"])
 SCOPES = [
     "https://www.googleapis.com/auth/calendar",
     "https://www.googleapis.com/auth/gmail.send",
-    "https://www.googleapis.com/auth/contacts.readonly",
-    "https://www.googleapis.com/auth/calendar"
+    "https://www.googleapis.com/auth/gmail.readonly",
+    "https://www.googleapis.com/auth/contacts.readonly"
 ]
 
 @router.get("/connect")
-def connect_google(user_id: str = Depends(get_current_user)):
+async def connect_google(
+    user_id: str = Depends(get_current_user),
+    tokens: GoogleTokensRepository = Depends(get_google_tokens_repository)
+):
     flow = Flow.from_client_secrets_file(
         "credentials.json",
         scopes=SCOPES,
@@ -30,19 +36,18 @@ def connect_google(user_id: str = Depends(get_current_user)):
         access_type="offline"
     )
 
-    google_tokens_collection.update_one(
-        {"user_id": user_id},
-        {"$set": {"oauth_state": state}},
-        upsert=True
-    )
+    await tokens.set_oauth_state(user_id, state)
 
     return {"auth_url": auth_url}
 
 @router.get("/callback")
-def google_callback(request: Request):
+async def google_callback(
+    request: Request,
+    tokens: GoogleTokensRepository = Depends(get_google_tokens_repository)
+):
     state = request.query_params.get("state")
 
-    user_record = google_tokens_collection.find_one({"oauth_state": state})
+    user_record = await tokens.find_by_state(state)
     if not user_record:
         raise HTTPException(status_code=400, detail="Invalid OAuth state")
 
@@ -55,7 +60,8 @@ def google_callback(request: Request):
         state=state
     )
 
-    flow.fetch_token(authorization_response=str(request.url))
+    # Token exchange is a blocking HTTP call
+    await asyncio.to_thread(flow.fetch_token, authorization_response=str(request.url))
     creds = flow.credentials
 
     token_data = GoogleTokenCreate(
@@ -67,10 +73,7 @@ def google_callback(request: Request):
         oauth_state=None
     )
 
-    google_tokens_collection.update_one(
-        {"user_id": user_id},
-        {"$set": token_data.dict()},
-        upsert=True
-    )
+    await tokens.save_tokens(user_id, token_data.dict())
+    user_credentials.invalidate(user_id)
 
     return {"message": "Google account connected"}
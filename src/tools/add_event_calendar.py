@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 from langsmith import traceable
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
-from googleapiclient.discovery import build
+from src.utils.google_services import get_service
 from googleapiclient.errors import HttpError
 from src.utils.google_auth import get_calendar_credentials
 
@@ -33,7 +33,7 @@ def add_event_to_calendar(
     try:
         creds = get_calendar_credentials()
 
-        service = build("calendar", "v3", credentials=creds)
+        service = get_service("calendar", "v3", creds)
 
         event_start = datetime.fromisoformat(start_time)
 
@@ -2,7 +2,7 @@ import re
 from langsmith import traceable
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
-from googleapiclient.discovery import build
+from src.utils.google_services import get_service
 from googleapiclient.errors import HttpError
 from src.utils.google_auth import get_contacts_credentials  # <-- updated
 
@@ -15,7 +15,7 @@ def find_contact_email(name: str):
     "Get a contact's email and phone number from Google Contacts"
     try:
         creds = get_contacts_credentials() 
-        service = build('people', 'v1', credentials=creds)
+        service = get_service('people', 'v1', creds)
 
         results = service.people().searchContacts(
             query=name,
@@ -2,7 +2,7 @@ from datetime import datetime, timezone
 from langsmith import traceable
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
-from googleapiclient.discovery import build
+from src.utils.google_services import get_service
 from googleapiclient.errors import HttpError
 from src.utils.google_auth import get_calendar_credentials
 
@@ -19,7 +19,7 @@ def get_calendar_events(start_date: str, end_date: str):
     """
     try:
         creds = get_calendar_credentials()
-        service = build("calendar", "v3", credentials=creds)
+        service = get_service("calendar", "v3", creds)
 
         start_datetime = datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc)
         end_datetime = datetime.fromisoformat(end_date).replace(tzinfo=timezone.utc)
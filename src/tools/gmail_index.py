@@ -0,0 +1,238 @@
+"""
+Local Gmail message index kept up to date through users.history.list.
+
+The first sync bootstraps recent messages. Later syncs pull only the
+deltas since the stored historyId. read_emails then answers date-range
+and sender filters with indexed SQLite queries, with no remote search,
+for ranges inside the bootstrap horizon (see covers()).
+"""
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+from googleapiclient.errors import HttpError
+from src.core.config import GMAIL_INDEX_PATH, GMAIL_SYNC_BOOTSTRAP_DAYS, GMAIL_SYNC_BOOTSTRAP_MAX
+from src.core.metrics import metrics
+from src.tools.read_emails import list_message_ids, fetch_message_metadata, format_message
+
+
+class GmailIndex:
+    def __init__(self, path=GMAIL_INDEX_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS messages (
+                account TEXT NOT NULL,
+                id TEXT NOT NULL,
+                sender TEXT,
+                sender_key TEXT,
+                subject TEXT,
+                date TEXT,
+                internal_ts REAL,
+                snippet TEXT,
+                labels TEXT,
+                PRIMARY KEY (account, id)
+            );
+            CREATE INDEX IF NOT EXISTS messages_date ON messages(account, internal_ts);
+            CREATE INDEX IF NOT EXISTS messages_sender ON messages(account, sender_key);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                account TEXT PRIMARY KEY,
+                history_id TEXT NOT NULL,
+                covered_from REAL
+            );
+        """)
+        try:
+            # Indexes created before covered_from existed
+            self._conn.execute("ALTER TABLE sync_state ADD COLUMN covered_from REAL")
+        except sqlite3.OperationalError:
+            pass
+
+    # ---------------- SYNC ----------------
+
+    def sync(self, service) -> str:
+        """
+        Brings the index for the authenticated account up to date and
+        returns the account address.
+        """
+        profile = service.users().getProfile(userId="me").execute()
+        account = profile["emailAddress"]
+        history_id = self._history_id(account)
+
+        if history_id is None:
+            self._bootstrap(service, account, profile["historyId"])
+            return account
+
+        try:
+            self._apply_history(service, account, history_id)
+        except HttpError as error:
+            # historyId too old (404): Gmail only keeps about a week of history.
+            if error.resp.status != 404:
+                raise
+            self._reset(account)
+            self._bootstrap(service, account, profile["historyId"])
+
+        return account
+
+    def _bootstrap(self, service, account, history_id):
+        metrics.incr("gmail_index.bootstraps")
+        ids = list_message_ids(
+            service,
+            f"newer_than:{GMAIL_SYNC_BOOTSTRAP_DAYS}d",
+            GMAIL_SYNC_BOOTSTRAP_MAX
+        )
+        messages = fetch_message_metadata(service, ids)
+        self._upsert(account, messages)
+        self._set_history_id(account, history_id)
+
+        # Everything after covered_from is in the index (history keeps it
+        # current). When the bootstrap cap was hit, only back to the oldest
+        # message actually fetched.
+        covered_from = time.time() - GMAIL_SYNC_BOOTSTRAP_DAYS * 86400
+        if len(ids) >= GMAIL_SYNC_BOOTSTRAP_MAX and messages:
+            covered_from = max(covered_from, min(int(m.get("internalDate", 0)) / 1000 for m in messages))
+        self._set_covered_from(account, covered_from)
+
+    def covers(self, account, from_ts):
+        """
+        True when the index holds every message received since from_ts;
+        older ranges must go to remote search.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT covered_from FROM sync_state WHERE account = ?", (account,)
+            ).fetchone()
+        return row is not None and row[0] is not None and from_ts >= row[0]
+
+    def _apply_history(self, service, account, history_id):
+        changed, deleted = [], set()
+        page_token = None
+        latest = history_id
+
+        while True:
+            response = service.users().history().list(
+                userId="me",
+                startHistoryId=history_id,
+                pageToken=page_token
+            ).execute()
+
+            for record in response.get("history", []):
+                for key in ("messagesAdded", "labelsAdded", "labelsRemoved"):
+                    for item in record.get(key, []):
+                        changed.append(item["message"]["id"])
+                for item in record.get("messagesDeleted", []):
+                    deleted.add(item["message"]["id"])
+
+            latest = response.get("historyId", latest)
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+        ids = list(dict.fromkeys(i for i in changed if i not in deleted))
+        metrics.incr("gmail_index.delta_messages", len(ids) + len(deleted))
+
+        self._upsert(account, fetch_message_metadata(service, ids))
+        self._delete(account, deleted)
+        self._set_history_id(account, latest)
+
+    # ---------------- QUERIES ----------------
+
+    def query(
+        self,
+        account: str,
+        from_ts: float,
+        to_ts: float,
+        sender: Optional[str] = None,
+        unread_only: bool = True,
+        limit: int = 20
+    ) -> List[Dict]:
+        sql = (
+            "SELECT id, sender, subject, date, snippet FROM messages "
+            "WHERE account = ? AND internal_ts >= ? AND internal_ts < ?"
+        )
+        params = [account, from_ts, to_ts]
+
+        if sender:
+            sql += " AND sender_key LIKE ?"
+            params.append(f"%{sender.lower()}%")
+        if unread_only:
+            sql += " AND labels LIKE '%,UNREAD,%'"
+        # History deltas also bring in spam and trashed mail; search mode never returns them
+        sql += " AND labels NOT LIKE '%,SPAM,%' AND labels NOT LIKE '%,TRASH,%'"
+
+        sql += " ORDER BY internal_ts DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [
+            {"id": r[0], "from": r[1], "subject": r[2], "date": r[3], "snippet": r[4]}
+            for r in rows
+        ]
+
+    # ---------------- STORAGE ----------------
+
+    def _history_id(self, account):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT history_id FROM sync_state WHERE account = ?", (account,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_history_id(self, account, history_id):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sync_state (account, history_id) VALUES (?, ?) "
+                "ON CONFLICT(account) DO UPDATE SET history_id = excluded.history_id",
+                (account, str(history_id))
+            )
+
+    def _set_covered_from(self, account, covered_from):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE sync_state SET covered_from = ? WHERE account = ?", (covered_from, account)
+            )
+
+    def _upsert(self, account, messages):
+        rows = []
+        for msg in messages:
+            email = format_message(msg)
+            rows.append((
+                account,
+                email["id"],
+                email["from"],
+                email["from"].lower(),
+                email["subject"],
+                email["date"],
+                int(msg.get("internalDate", 0)) / 1000,
+                email["snippet"],
+                "," + ",".join(msg.get("labelIds", [])) + ",",
+            ))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def _delete(self, account, ids):
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM messages WHERE account = ? AND id = ?",
+                [(account, i) for i in ids]
+            )
+
+    def _reset(self, account):
+        with self._lock:
+            self._conn.execute("DELETE FROM messages WHERE account = ?", (account,))
+            self._conn.execute("DELETE FROM sync_state WHERE account = ?", (account,))
+
+
+_index = None
+
+
+def get_gmail_index():
+    global _index
+    if _index is None:
+        _index = GmailIndex()
+    return _index
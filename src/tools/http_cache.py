@@ -0,0 +1,253 @@
+"""
+On-disk HTTP cache for scraped pages.
+
+- Freshness follows Cache-Control (no-store, no-cache, max-age, s-maxage)
+  and Expires.
+- ETag / Last-Modified are stored, and stale entries are revalidated
+  with If-None-Match / If-Modified-Since.
+- Converted markdown is stored by content hash, so a 304 (or identical
+  content at another URL) skips both the download and the conversion.
+- Total markdown size is bounded; least recently used entries go first.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from src.core.config import SCRAPE_CACHE_DIR, SCRAPE_CACHE_MAX_BYTES
+from src.core.metrics import metrics
+
+_MAX_AGE_RE = re.compile(r"(?:s-maxage|max-age)\s*=\s*(\d+)")
+
+
+def freshness_lifetime(headers):
+    """
+    Seconds the response may be served without revalidation, or None
+    when it must not be stored at all.
+    """
+    cache_control = headers.get("Cache-Control", "").lower()
+
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0
+
+    match = _MAX_AGE_RE.search(cache_control)
+    if match:
+        return int(match.group(1))
+
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            return max(0, int(parsedate_to_datetime(expires).timestamp() - time.time()))
+        except (TypeError, ValueError):
+            return 0
+
+    # No freshness info: cache only if it can be revalidated
+    if headers.get("ETag") or headers.get("Last-Modified"):
+        return 0
+    return None
+
+
+class HttpCache:
+    def __init__(self, directory=SCRAPE_CACHE_DIR, max_bytes=SCRAPE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "index.sqlite3"),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                fresh_until REAL,
+                content_hash TEXT,
+                accessed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at);
+            CREATE TABLE IF NOT EXISTS blobs (
+                content_hash TEXT PRIMARY KEY,
+                size INTEGER
+            );
+        """)
+
+    # ---------------- LOOKUP ----------------
+
+    def lookup(self, url):
+        """
+        Returns (markdown, fresh, validators). markdown is None on a miss.
+        validators are request headers for a conditional GET.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, fresh_until, content_hash FROM entries WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url))
+
+        if row is None:
+            return None, False, {}
+
+        etag, last_modified, fresh_until, content_hash = row
+        markdown = self._read_blob(content_hash)
+        if markdown is None:
+            return None, False, {}
+
+        validators = {}
+        if etag:
+            validators["If-None-Match"] = etag
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+
+        return markdown, fresh_until > time.time(), validators
+
+    def markdown_for(self, content_hash):
+        return self._read_blob(content_hash)
+
+    # ---------------- STORE ----------------
+
+    def store(self, url, headers, content_hash, markdown):
+        lifetime = freshness_lifetime(headers)
+        if lifetime is None:
+            return
+
+        path = self._blob_path(content_hash)
+        tmp_path = None
+        if not os.path.exists(path):
+            # Unique per write: concurrent stores of the same page must not
+            # write to one temp file. Written outside the lock, moved under it.
+            tmp_path = self._write_temp(markdown)
+
+        with self._lock:
+            if tmp_path is not None:
+                os.replace(tmp_path, path)
+            elif not os.path.exists(path):
+                return  # evicted since the check above; stored on the next scrape
+
+            previous = self._conn.execute(
+                "SELECT content_hash FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blobs VALUES (?, ?)",
+                (content_hash, os.path.getsize(path))
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (url, headers.get("ETag"), headers.get("Last-Modified"),
+                 time.time() + lifetime, content_hash, time.time())
+            )
+            # The page changed: its old markdown is garbage unless another URL shares it
+            if previous is not None and previous[0] != content_hash:
+                self._drop_blob_if_unused(previous[0])
+        self._evict()
+
+    def revalidated(self, url, headers):
+        """
+        Called on 304 Not Modified: extends freshness from the new headers.
+        """
+        lifetime = freshness_lifetime(headers) or 0
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET fresh_until = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+                "WHERE url = ?",
+                (time.time() + lifetime, headers.get("ETag"), headers.get("Last-Modified"), url)
+            )
+
+    # ---------------- EVICTION ----------------
+
+    def bytes_held(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def _evict(self):
+        with self._lock:
+            # Blobs no entry points at (e.g. left by a crash mid-store) count
+            # against max_bytes but can never be evicted through entries.
+            orphans = self._conn.execute(
+                "SELECT content_hash FROM blobs "
+                "WHERE content_hash NOT IN (SELECT content_hash FROM entries)"
+            ).fetchall()
+            for (orphan,) in orphans:
+                self._drop_blob_if_unused(orphan)
+
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            while total > self.max_bytes:
+                row = self._conn.execute(
+                    "SELECT url, content_hash FROM entries ORDER BY accessed_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    break
+                url, content_hash = row
+                self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+                metrics.incr("scrape_cache.evictions")
+                total -= self._drop_blob_if_unused(content_hash)
+
+        metrics.set_gauge("scrape_cache.bytes", total)
+
+    def _drop_blob_if_unused(self, content_hash):
+        """
+        Deletes a blob no entry references. Caller holds self._lock.
+        Returns the bytes freed.
+        """
+        still_used = self._conn.execute(
+            "SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)
+        ).fetchone()
+        if still_used:
+            return 0
+
+        size = self._conn.execute(
+            "SELECT size FROM blobs WHERE content_hash = ?", (content_hash,)
+        ).fetchone()
+        self._conn.execute("DELETE FROM blobs WHERE content_hash = ?", (content_hash,))
+        try:
+            os.remove(self._blob_path(content_hash))
+        except FileNotFoundError:
+            pass
+        return size[0] if size else 0
+
+    # ---------------- BLOBS ----------------
+
+    def _blob_path(self, content_hash):
+        return os.path.join(self.directory, f"{content_hash}.md")
+
+    def _write_temp(self, markdown):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(markdown)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path
+
+    def _read_blob(self, content_hash):
+        try:
+            with open(self._blob_path(content_hash), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+def content_hash(body: bytes, variant: str = "") -> str:
+    return hashlib.sha256(variant.encode() + body).hexdigest()
+
+
+_cache = None
+
+
+def get_http_cache():
+    global _cache
+    if _cache is None:
+        _cache = HttpCache()
+    return _cache
@@ -1,21 +1,44 @@
 from src.core.llm import PerplexityLLM
 
-def summarize_news(articles, max_points=7):
-    llm = PerplexityLLM()
+SYSTEM_PROMPT = "You are a professional news editor."
 
+_llm = None
+
+
+def _get_llm():
+    global _llm
+    if _llm is None:
+        _llm = PerplexityLLM()
+    return _llm
+
+
+def _build_prompt(articles, max_points):
     text = "\n".join(
         f"- {a['title']}: {a['snippet']}"
         for a in articles
     )
 
-    system_prompt = "You are a professional news editor."
-    user_prompt = f"""
+    return f"""
 Summarize the following news into {max_points} concise bullet points.
 Avoid repeating headlines verbatim.
 
 {text}
 """
 
-    response = llm.generate(system_prompt, user_prompt)
+
+def summarize_news(articles, max_points=7, llm=None):
+    llm = llm or _get_llm()
+
+    # A summary of third-party articles: safe to share between near-duplicate inputs
+    response = llm.generate(SYSTEM_PROMPT, _build_prompt(articles, max_points), semantic=True)
     return response["choices"][0]["message"]["content"]
 
+
+async def astream_summarize_news(articles, max_points=7, llm=None):
+    """
+    Streaming variant of summarize_news: yields summary text as it is generated.
+    """
+    llm = llm or _get_llm()
+
+    async for delta in llm.astream(SYSTEM_PROMPT, _build_prompt(articles, max_points), semantic=True):
+        yield delta
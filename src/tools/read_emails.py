@@ -3,77 +3,139 @@ from typing import Optional, List, Dict
 from langsmith import traceable
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
-from googleapiclient.discovery import build
+from src.utils.google_services import get_service
 from googleapiclient.errors import HttpError
 from email.utils import parsedate_to_datetime
 from src.utils.google_auth import get_gmail_credentials
+from src.core.config import GMAIL_MAX_RESULTS, GMAIL_PAGE_SIZE, GMAIL_BATCH_SIZE, GMAIL_SYNC_MODE
 
 
 class ReadEmailsInput(BaseModel):
     from_date: str = Field(description="From date for reading emails (ISO format)")
     to_date: str = Field(description="To date for reading emails (ISO format)")
     email: Optional[str] = Field(description="Optional sender email filter")
+    max_results: int = Field(default=GMAIL_MAX_RESULTS, description="Maximum number of emails to return")
+
+
+def list_message_ids(service, query: str, max_results: int, page_size: int = GMAIL_PAGE_SIZE) -> List[str]:
+    """
+    Pages through messages.list until max_results ids are collected.
+    """
+    ids: List[str] = []
+    page_token = None
+
+    while len(ids) < max_results:
+        results = service.users().messages().list(
+            userId="me",
+            q=query,
+            maxResults=min(page_size, max_results - len(ids)),
+            pageToken=page_token
+        ).execute()
+
+        ids.extend(m["id"] for m in results.get("messages", []))
+
+        page_token = results.get("nextPageToken")
+        if not page_token:
+            break
+
+    return ids[:max_results]
+
+
+def fetch_message_metadata(service, ids: List[str], batch_size: int = GMAIL_BATCH_SIZE) -> List[Dict]:
+    """
+    Fetches From/Subject/Date metadata through Gmail's batch endpoint,
+    one HTTP round trip per `batch_size` messages instead of one per
+    message. Results keep the order of `ids`. Items that fail inside a
+    batch (e.g. rate limited) are retried once individually.
+    """
+    messages: Dict[str, Dict] = {}
+    failed: List[str] = []
+
+    def callback(request_id, response, exception):
+        if exception is not None:
+            failed.append(request_id)
+        else:
+            messages[request_id] = response
+
+    def get_request(message_id):
+        return service.users().messages().get(
+            userId="me",
+            id=message_id,
+            format="metadata",
+            metadataHeaders=["From", "Subject", "Date"]
+        )
+
+    for offset in range(0, len(ids), batch_size):
+        batch = service.new_batch_http_request(callback=callback)
+        for message_id in ids[offset:offset + batch_size]:
+            batch.add(get_request(message_id), request_id=message_id)
+        batch.execute()
+
+    for message_id in failed:
+        try:
+            messages[message_id] = get_request(message_id).execute()
+        except HttpError:
+            continue
+
+    return [messages[message_id] for message_id in ids if message_id in messages]
+
+
+def format_message(msg: Dict) -> Dict:
+    headers = {h["name"]: h["value"] for h in msg["payload"]["headers"]}
+
+    date_str = headers.get("Date", "")
+    try:
+        date_obj = parsedate_to_datetime(date_str)
+        if date_obj and date_obj.tzinfo is None:
+            date_obj = date_obj.replace(tzinfo=timezone.utc)
+        date_iso = date_obj.isoformat() if date_obj else date_str
+    except Exception:
+        date_iso = date_str
+
+    return {
+        "id": msg["id"],
+        "from": headers.get("From", "Unknown Sender"),
+        "subject": headers.get("Subject", "No Subject"),
+        "date": date_iso,
+        "snippet": msg.get("snippet", "")
+    }
 
 
 @tool("ReadEmails", args_schema=ReadEmailsInput)
 @traceable(run_type="tool", name="ReadEmails")
-def read_emails(from_date: str, to_date: str, email: Optional[str] = None):
+def read_emails(from_date: str, to_date: str, email: Optional[str] = None, max_results: int = GMAIL_MAX_RESULTS):
     """
-    Fetch Google Calendar events between a start date and end date
-    for the authenticated user.
+    Fetch unread Gmail messages received between from_date and to_date,
+    optionally filtered by sender. With GMAIL_SYNC_MODE=incremental the
+    answer comes from the local index, synced via history deltas.
     """
     try:
         creds = get_gmail_credentials()
-        service = build("gmail", "v1", credentials=creds)
+        service = get_service("gmail", "v1", creds)
 
         from_ts = int(datetime.fromisoformat(from_date).timestamp())
         to_ts = int(datetime.fromisoformat(to_date).timestamp())
 
+        if GMAIL_SYNC_MODE == "incremental":
+            # Imported here: gmail_index builds on the helpers above.
+            from src.tools.gmail_index import get_gmail_index
+
+            index = get_gmail_index()
+            account = index.sync(service)
+            # Ranges older than the bootstrap horizon fall through to remote search
+            if index.covers(account, from_ts):
+                return index.query(account, from_ts, to_ts, sender=email, limit=max_results)
+
         query = f"is:unread after:{from_ts} before:{to_ts}"
         if email:
             query += f" from:{email}"
 
-        results = service.users().messages().list(
-            userId="me",
-            q=query,
-            maxResults=20
-        ).execute()
-
-        messages = results.get("messages", [])
+        ids = list_message_ids(service, query, max_results)
 
-        if not messages:
+        if not ids:
             return []
 
-        email_list: List[Dict] = []
-
-        for message in messages:
-            msg = service.users().messages().get(
-                userId="me",
-                id=message["id"],
-                format="metadata",
-                metadataHeaders=["From", "Subject", "Date"]
-            ).execute()
-
-            headers = {h["name"]: h["value"] for h in msg["payload"]["headers"]}
-
-            date_str = headers.get("Date", "")
-            try:
-                date_obj = parsedate_to_datetime(date_str)
-                if date_obj and date_obj.tzinfo is None:
-                    date_obj = date_obj.replace(tzinfo=timezone.utc)
-                date_iso = date_obj.isoformat() if date_obj else date_str
-            except Exception:
-                date_iso = date_str
-
-            email_list.append({
-                "id": msg["id"],
-                "from": headers.get("From", "Unknown Sender"),
-                "subject": headers.get("Subject", "No Subject"),
-                "date": date_iso,
-                "snippet": msg.get("snippet", "")
-            })
-
-        return email_list
+        return [format_message(msg) for msg in fetch_message_metadata(service, ids)]
 
     except HttpError as error:
         return {
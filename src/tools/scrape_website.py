@@ -1,43 +1,212 @@
 import re
+from typing import Mapping, NamedTuple, Optional
 import html2text
 import requests
 from bs4 import BeautifulSoup
 from langsmith import traceable
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
+from src.core.config import (
+    SCRAPE_CONNECT_TIMEOUT,
+    SCRAPE_READ_TIMEOUT,
+    SCRAPE_MAX_BYTES,
+    SCRAPE_MAX_TOKENS,
+    SCRAPE_CACHE_ENABLED,
+)
+from src.core.metrics import metrics
+from src.tools.http_cache import get_http_cache, content_hash
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    BS4_PARSER = "lxml"
+except ImportError:
+    BS4_PARSER = "html.parser"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.77 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate"
+}
+
+ALLOWED_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+# Elements that never carry the main content of a page
+BOILERPLATE_TAGS = ["script", "style", "noscript", "svg", "nav", "header", "footer", "aside", "form", "iframe"]
+MAIN_CONTENT_SELECTORS = ["main", "article", "[role=main]", "body"]
+
+CHUNK_SIZE = 64 * 1024
+
 
 class ScrapeWebsiteInput(BaseModel):
     url: str = Field(description="The URL of the website to scrape.")
 
-@tool("ScrapeWebsite", args_schema=ScrapeWebsiteInput)
-@traceable(run_type="tool", name="ScrapeWebsite")
-def scrape_website_to_markdown(url: str) -> str:
+
+class FetchedPage(NamedTuple):
+    status_code: int
+    headers: Mapping[str, str]
+    body: bytes
+    encoding: Optional[str]
+
+    def text(self):
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+
+def fetch_page(url: str, extra_headers=None, max_bytes: int = SCRAPE_MAX_BYTES) -> FetchedPage:
+    """
+    Streams the body and stops reading once max_bytes have arrived, so a
+    huge page costs at most max_bytes of memory. Non-HTML responses are
+    rejected from their headers, before the body is downloaded. A 304
+    is returned as-is with an empty body.
+    """
+    with requests.get(
+        url,
+        headers={**HEADERS, **(extra_headers or {})},
+        stream=True,
+        timeout=(SCRAPE_CONNECT_TIMEOUT, SCRAPE_READ_TIMEOUT)
+    ) as response:
+        if response.status_code == 304:
+            return FetchedPage(304, response.headers, b"", None)
+
+        if response.status_code != 200:
+            raise Exception(f"Failed to fetch the URL. Status code: {response.status_code}")
+
+        content_type = response.headers.get("Content-Type", "text/html").split(";")[0].strip().lower()
+        if content_type not in ALLOWED_CONTENT_TYPES:
+            raise Exception(f"Unsupported content type: {content_type}")
+
+        chunks, size = [], 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+
+        return FetchedPage(200, response.headers, b"".join(chunks)[:max_bytes], response.encoding)
+
+
+def fetch_html(url: str, max_bytes: int = SCRAPE_MAX_BYTES) -> str:
+    return fetch_page(url, max_bytes=max_bytes).text()
+
+
+def _take_children(children, max_chars):
     """
-    Fetch Google Calendar events between a start date and end date
-    for the authenticated user.
+    Keeps top-level children of the content node until about max_chars of
+    text are collected, so html2text never sees the rest of a huge page.
+    children: iterable of (html, text_length).
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.77 Safari/537.36",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate"
-    }
+    parts, total = [], 0
+    for child_html, text_length in children:
+        parts.append(child_html)
+        total += text_length
+        if total >= max_chars:
+            break
+    return "".join(parts)
 
 
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(f"Failed to fetch the URL. Status code: {response.status_code}")
+def extract_main_html(html: str, max_chars: int = SCRAPE_MAX_TOKENS * 4) -> str:
+    """
+    Drops boilerplate elements and returns the HTML of the main content
+    node, cut down to roughly max_chars of text. Uses selectolax when
+    installed, otherwise BeautifulSoup with lxml (or html.parser).
+    """
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        tree.strip_tags(BOILERPLATE_TAGS)
+        node = next(filter(None, (tree.css_first(s) for s in MAIN_CONTENT_SELECTORS)), tree.root)
+        if node is None:
+            return ""
+        return _take_children(
+            ((child.html or "", len(child.text())) for child in node.iter(include_text=True)),
+            max_chars
+        )
+
+    soup = BeautifulSoup(html, BS4_PARSER)
+    for element in soup(BOILERPLATE_TAGS):
+        element.decompose()
+    node = next(filter(None, (soup.select_one(s) for s in MAIN_CONTENT_SELECTORS)), soup)
+    return _take_children(
+        ((str(child), len(child.get_text()) if hasattr(child, "get_text") else len(child))
+         for child in node.children),
+        max_chars
+    )
+
+
+def truncate_to_tokens(text: str, max_tokens: int = SCRAPE_MAX_TOKENS) -> str:
+    """
+    Cuts text to roughly max_tokens (about 4 characters per token), ending
+    on a paragraph boundary when there is one.
+    """
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
 
+    cut = text[:max_chars]
+    boundary = cut.rfind("\n\n")
+    if boundary > max_chars // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + "\n\n[... truncated]"
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    html_content = soup.prettify() 
 
+def html_to_markdown(html: str, max_tokens: int = SCRAPE_MAX_TOKENS) -> str:
     h = html2text.HTML2Text()
     h.ignore_links = False
     h.ignore_images = True
     h.ignore_tables = True
-    markdown_content = h.handle(html_content)
+    h.body_width = 0
+    # Convert a little more than the budget; the final cut is made on the markdown
+    markdown_content = h.handle(extract_main_html(html, max_chars=max_tokens * 5))
 
     markdown_content = re.sub(r"\n{3,}", "\n\n", markdown_content)
     markdown_content = markdown_content.strip()
 
-    return markdown_content
\ No newline at end of file
+    return truncate_to_tokens(markdown_content, max_tokens)
+
+
+def scrape_url(url: str) -> str:
+    """
+    Fetch + convert through the on-disk HTTP cache: fresh entries are
+    served directly, stale ones are revalidated, and a 304 or unchanged
+    content skips the HTML → markdown conversion.
+    """
+    if not SCRAPE_CACHE_ENABLED:
+        return html_to_markdown(fetch_html(url))
+
+    cache = get_http_cache()
+    cached, fresh, validators = cache.lookup(url)
+
+    if cached is not None and fresh:
+        metrics.incr("scrape_cache.hits")
+        return cached
+
+    page = fetch_page(url, extra_headers=validators)
+
+    if page.status_code == 304 and cached is not None:
+        metrics.incr("scrape_cache.revalidated")
+        cache.revalidated(url, page.headers)
+        return cached
+
+    metrics.incr("scrape_cache.misses")
+    digest = content_hash(page.body, variant=f"{SCRAPE_MAX_TOKENS}:")
+    markdown = cache.markdown_for(digest)
+    if markdown is None:
+        markdown = html_to_markdown(page.text())
+
+    cache.store(url, page.headers, digest, markdown)
+    return markdown
+
+
+@tool("ScrapeWebsite", args_schema=ScrapeWebsiteInput)
+@traceable(run_type="tool", name="ScrapeWebsite")
+def scrape_website_to_markdown(url: str) -> str:
+    """
+    Fetch a web page and return its main content as markdown.
+    """
+    return scrape_url(url)
@@ -0,0 +1,195 @@
+"""
+Concurrent multi-URL scraping for the scrape_websites action.
+
+Pages are fetched on the event loop through the shared httpx client.
+There is a global cap (SCRAPE_MAX_CONCURRENCY), and the per-host
+breaker/bulkhead from src.core.resilience acts as the per-host
+connection limit. robots.txt is fetched once per host and cached. HTML
+→ markdown conversion is CPU-bound, so it runs in a process pool and
+the loop never serializes on it.
+"""
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+import httpx
+from src.core.config import (
+    SCRAPE_CONNECT_TIMEOUT,
+    SCRAPE_READ_TIMEOUT,
+    SCRAPE_MAX_BYTES,
+    SCRAPE_MAX_TOKENS,
+    SCRAPE_MAX_CONCURRENCY,
+    SCRAPE_CONVERT_WORKERS,
+    SCRAPE_CACHE_ENABLED,
+    ROBOTS_CACHE_TTL,
+)
+from src.core.http import get_async_client
+from src.core.metrics import metrics
+from src.core.resilience import aguard, UpstreamUnavailable
+from src.tools.http_cache import get_http_cache, content_hash
+from src.tools.scrape_website import (
+    HEADERS,
+    ALLOWED_CONTENT_TYPES,
+    FetchedPage,
+    html_to_markdown,
+)
+
+_timeout = httpx.Timeout(SCRAPE_READ_TIMEOUT, connect=SCRAPE_CONNECT_TIMEOUT)
+_convert_pool = None
+
+
+def _get_convert_pool():
+    global _convert_pool
+    if _convert_pool is None and SCRAPE_CONVERT_WORKERS > 0:
+        _convert_pool = ProcessPoolExecutor(max_workers=SCRAPE_CONVERT_WORKERS)
+    return _convert_pool
+
+
+def shutdown_convert_pool():
+    global _convert_pool
+    if _convert_pool is not None:
+        _convert_pool.shutdown(cancel_futures=True)
+    _convert_pool = None
+
+
+async def convert(html: str) -> str:
+    # A pool of 0 workers falls back to a thread (e.g. where fork is unavailable)
+    pool = _get_convert_pool()
+    if pool is None:
+        return await asyncio.to_thread(html_to_markdown, html)
+    return await asyncio.get_running_loop().run_in_executor(pool, html_to_markdown, html)
+
+
+class RobotsCache:
+    """
+    robots.txt per scheme+host, kept for ROBOTS_CACHE_TTL seconds.
+    Concurrent lookups for one host share a single fetch.
+    """
+
+    def __init__(self, ttl=ROBOTS_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[str, tuple] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def allowed(self, url: str) -> bool:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+
+        entry = self._entries.get(origin)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0].can_fetch(HEADERS["User-Agent"], url)
+
+        if origin not in self._pending:
+            self._pending[origin] = asyncio.ensure_future(self._fetch(origin))
+        try:
+            parser = await asyncio.shield(self._pending[origin])
+        finally:
+            self._pending.pop(origin, None)
+
+        return parser.can_fetch(HEADERS["User-Agent"], url)
+
+    async def _fetch(self, origin):
+        metrics.incr("robots_cache.fetches")
+        parser = RobotFileParser()
+        try:
+            response = await get_async_client().get(
+                f"{origin}/robots.txt", headers=HEADERS, timeout=_timeout, follow_redirects=True
+            )
+            if response.status_code in (401, 403):
+                parser.disallow_all = True
+            elif response.status_code >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse(response.text.splitlines())
+        except httpx.HTTPError:
+            parser.allow_all = True
+
+        self._entries[origin] = (parser, time.monotonic() + self.ttl)
+        return parser
+
+
+robots_cache = RobotsCache()
+
+
+async def afetch_page(url: str, extra_headers=None, max_bytes: int = SCRAPE_MAX_BYTES) -> FetchedPage:
+    """
+    Async counterpart of scrape_website.fetch_page with the same byte
+    budget and content-type checks.
+    """
+    client = get_async_client()
+    request_headers = {**HEADERS, **(extra_headers or {})}
+
+    async with client.stream("GET", url, headers=request_headers, timeout=_timeout, follow_redirects=True) as response:
+        if response.status_code == 304:
+            return FetchedPage(304, response.headers, b"", None)
+
+        if response.status_code != 200:
+            raise Exception(f"Failed to fetch the URL. Status code: {response.status_code}")
+
+        content_type = response.headers.get("Content-Type", "text/html").split(";")[0].strip().lower()
+        if content_type not in ALLOWED_CONTENT_TYPES:
+            raise Exception(f"Unsupported content type: {content_type}")
+
+        chunks, size = [], 0
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+
+        return FetchedPage(200, response.headers, b"".join(chunks)[:max_bytes], response.encoding)
+
+
+async def ascrape_url(url: str) -> str:
+    if not await robots_cache.allowed(url):
+        raise Exception("Disallowed by robots.txt")
+
+    # The cache does SQLite and file I/O under a lock that sync scrapes also
+    # take, so every call goes through a thread, never on the loop.
+    cache = get_http_cache() if SCRAPE_CACHE_ENABLED else None
+    cached, fresh, validators = await asyncio.to_thread(cache.lookup, url) if cache else (None, False, {})
+
+    if cached is not None and fresh:
+        metrics.incr("scrape_cache.hits")
+        return cached
+
+    async with aguard(f"scrape:{urlparse(url).hostname or 'unknown'}"):
+        page = await afetch_page(url, extra_headers=validators)
+
+    if page.status_code == 304 and cached is not None:
+        metrics.incr("scrape_cache.revalidated")
+        await asyncio.to_thread(cache.revalidated, url, page.headers)
+        return cached
+
+    if cache is None:
+        return await convert(page.text())
+
+    metrics.incr("scrape_cache.misses")
+    digest = content_hash(page.body, variant=f"{SCRAPE_MAX_TOKENS}:")
+    markdown = await asyncio.to_thread(cache.markdown_for, digest)
+    if markdown is None:
+        markdown = await convert(page.text())
+
+    await asyncio.to_thread(cache.store, url, page.headers, digest, markdown)
+    return markdown
+
+
+async def ascrape_urls(urls: List[str], max_concurrency: int = SCRAPE_MAX_CONCURRENCY) -> List[Dict]:
+    """
+    Scrapes every URL concurrently and returns one result per URL, in
+    input order, holding either markdown "content" or an "error".
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def one(url):
+        async with semaphore:
+            try:
+                return {"url": url, "content": await ascrape_url(url)}
+            except UpstreamUnavailable as e:
+                return {"url": url, "error": str(e)}
+            except Exception as e:
+                return {"url": url, "error": str(e) or type(e).__name__}
+
+    return await asyncio.gather(*(one(url) for url in dict.fromkeys(urls)))
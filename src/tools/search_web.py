@@ -1,39 +1,117 @@
+import json
 import os
+import re
+import threading
 from langsmith import traceable
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
 from tavily import TavilyClient
+from src.core.cache import MemoryBackend, normalize_message
+from src.core.config import (
+    TAVILY_TIMEOUT,
+    SEARCH_CACHE_TTL,
+    SEARCH_CACHE_TTL_TIME_SENSITIVE,
+    SEARCH_CACHE_MAX_ENTRIES,
+    UPSTREAM_CONCURRENCY,
+)
+from src.core.metrics import metrics
+
+# Queries whose answers go stale quickly get the short TTL.
+TIME_SENSITIVE_RE = re.compile(
+    r"\b(today|tonight|now|latest|breaking|live|current|currently|this (week|month)|"
+    r"yesterday|news|score|scores|price|prices|stock|weather|forecast|update|updates)\b",
+    re.IGNORECASE
+)
+
+_client = None
+_client_lock = threading.Lock()
+_results_cache = MemoryBackend(
+    max_entries=SEARCH_CACHE_MAX_ENTRIES,
+    namespace="search_cache"
+)
+
 
 class SearchWebInput(BaseModel):
     query: str = Field(description="The search query string")
 
-@tool("SearchWeb", args_schema=SearchWebInput)
-@traceable(run_type="tool", name="SearchWeb")
-def search_web(query: str, search_type: str = "basic", max_results: int = 5):
+
+def get_tavily_client():
     """
-    Fetch Google Calendar events between a start date and end date
-    for the authenticated user.
+    One TavilyClient per process. The client keeps its own
+    requests.Session (it sets auth headers on it, so it is not shared
+    with the global session); we widen its pool to the tavily bulkhead.
     """
-    try:
-        client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
-        search_response = client.search(query=query, search_depth=search_type, max_results=max_results)
-        results = search_response["results"]
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=UPSTREAM_CONCURRENCY["tavily"]
+                )
+                client.session.mount("https://", adapter)
+                _client = client
+    return _client
+
 
-        if not results:
-            return "No results found."
+def cache_ttl_for(query):
+    if TIME_SENSITIVE_RE.search(query):
+        return SEARCH_CACHE_TTL_TIME_SENSITIVE
+    return SEARCH_CACHE_TTL
 
-        formatted_output = ""
-        for result in results:
-            title = result.get('title', result.get('url', 'No Title'))
-            url = result.get('url', 'No URL')
-            content = result.get('content', 'No Content')
 
-            formatted_output += f"Title: {title}\n"
-            formatted_output += f"URL: {url}\n"
-            formatted_output += f"Content: {content}\n"
-            formatted_output += "-" * 20 + "\n"
+def search_web_results(query, search_type="basic", max_results=5):
+    """
+    Run a Tavily search and return a list of
+    {"title", "url", "content"} dicts, cached per normalized query.
+    """
+    key = f"{search_type}:{max_results}:{normalize_message(query).lower()}"
+    cached = _results_cache.get(key)
+    if cached is not None:
+        metrics.incr("search_cache.hits")
+        return json.loads(cached)
+    metrics.incr("search_cache.misses")
+
+    search_response = get_tavily_client().search(
+        query=query,
+        search_depth=search_type,
+        max_results=max_results,
+        timeout=TAVILY_TIMEOUT
+    )
+    results = [
+        {
+            "title": result.get("title") or result.get("url", "No Title"),
+            "url": result.get("url", "No URL"),
+            "content": result.get("content", "No Content"),
+        }
+        for result in search_response.get("results", [])
+    ]
 
-        return formatted_output
+    _results_cache.set(key, json.dumps(results).encode(), cache_ttl_for(query))
+    return results
+
+
+def format_results(results):
+    if not results:
+        return "No results found."
+
+    separator = "-" * 20
+    return "".join(
+        f"Title: {r['title']}\nURL: {r['url']}\nContent: {r['content']}\n{separator}\n"
+        for r in results
+    )
+
+
+@tool("SearchWeb", args_schema=SearchWebInput)
+@traceable(run_type="tool", name="SearchWeb")
+def search_web(query: str, search_type: str = "basic", max_results: int = 5):
+    """
+    Search the web with Tavily and return the results as formatted text.
+    """
+    try:
+        return format_results(search_web_results(query, search_type, max_results))
 
     except Exception as e:
-        return f"An error occurred: {e}"
\ No newline at end of file
+        return f"An error occurred: {e}"
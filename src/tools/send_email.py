@@ -1,19 +1,88 @@
 import base64
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
+from typing import Literal
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from src.utils.google_services import get_service
 from src.utils.google_auth import get_gmail_credentials
+from src.core.config import GMAIL_SEND_CONCURRENCY, GMAIL_SEND_MAX_RETRIES
+from src.core.http import backoff_delay
 
 
 class SendEmailInput(BaseModel):
     to: str | list = Field(description="Recipient email(s)")
     subject: str
     body: str
+    mode: Literal["individual", "to", "bcc"] = Field(
+        default="individual",
+        description="individual: one message per recipient; "
+                    "to/bcc: a single message with every recipient in that header"
+    )
+
+
+def build_message(recipients, subject, body, header="to"):
+    message = MIMEText(body)
+    message[header] = ", ".join(recipients)
+    message["subject"] = subject
+
+    return base64.urlsafe_b64encode(
+        message.as_bytes()
+    ).decode("utf-8")
+
+
+def _is_rate_limited(error: HttpError):
+    if error.resp.status == 429:
+        return True
+    return error.resp.status == 403 and b"rateLimitExceeded" in (error.content or b"")
+
+
+def _send_raw(creds, raw_message):
+    """
+    Sends one message, backing off on Gmail rate limits. The service is
+    fetched per call so every worker thread uses its own connection.
+    """
+    service = get_service("gmail", "v1", creds)
+
+    for attempt in range(GMAIL_SEND_MAX_RETRIES + 1):
+        try:
+            return service.users().messages().send(
+                userId="me",
+                body={"raw": raw_message}
+            ).execute()
+        except HttpError as error:
+            if not _is_rate_limited(error) or attempt == GMAIL_SEND_MAX_RETRIES:
+                raise
+            time.sleep(backoff_delay(attempt, error.resp.get("retry-after")))
+
+
+def send_bulk(creds, jobs, concurrency=GMAIL_SEND_CONCURRENCY):
+    """
+    jobs: list of (label, raw_message). Returns one result per job, in
+    order, with either a message_id or an error.
+    """
+
+    def run(job):
+        label, raw_message = job
+        try:
+            sent = _send_raw(creds, raw_message)
+            return {"to": label, "message_id": sent["id"]}
+        except Exception as error:
+            # Timeouts / connection errors too: raising here would lose the
+            # results of sends that already went out, and a retry would duplicate them.
+            return {"to": label, "error": str(error)}
+
+    if len(jobs) == 1:
+        return [run(jobs[0])]
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(jobs))) as pool:
+        return list(pool.map(run, jobs))
 
 
 @tool("SendEmail", args_schema=SendEmailInput)
-def send_email(to, subject: str, body: str):
+def send_email(to, subject: str, body: str, mode: str = "individual"):
     """
     Send email using Gmail API (OAuth)
     """
@@ -24,30 +93,20 @@ def send_email(to, subject: str, body: str):
         recipients = [to]
 
     creds = get_gmail_credentials()
-    service = build("gmail", "v1", credentials=creds)
-
-    results = []
-
-    for recipient in recipients:
-        message = MIMEText(body)
-        message["to"] = recipient
-        message["subject"] = subject
 
-        raw_message = base64.urlsafe_b64encode(
-            message.as_bytes()
-        ).decode("utf-8")
-
-        sent = service.users().messages().send(
-            userId="me",
-            body={"raw": raw_message}
-        ).execute()
+    # Build every MIME message before dispatching any of them
+    if mode == "individual":
+        jobs = [
+            (recipient, build_message([recipient], subject, body))
+            for recipient in recipients
+        ]
+    else:
+        jobs = [(recipients, build_message(recipients, subject, body, header=mode))]
 
-        results.append({
-            "to": recipient,
-            "message_id": sent["id"]
-        })
+    results = send_bulk(creds, jobs)
+    failed = sum(1 for r in results if "error" in r)
 
     return {
-        "status": "success",
+        "status": "success" if not failed else ("partial_failure" if failed < len(results) else "error"),
         "sent": results
     }
@@ -8,3 +8,26 @@ JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_ALGORITHM = "HS256"
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
+
+# MongoDB (src/db/mongo.py): Motor client created in the app lifespan
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "autopilot")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "10000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+
+# Password hashing (src/auth/password.py): bcrypt runs in a process pool
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+# JWT key rotation: JWT_SECRETS="kid1:secret1,kid2:secret2" lists every
+# accepted key; new tokens are signed with JWT_ACTIVE_KID. Without it,
+# JWT_SECRET alone is used and tokens carry no kid.
+JWT_SECRETS = dict(
+    entry.split(":", 1) for entry in os.getenv("JWT_SECRETS", "").split(",") if ":" in entry
+)
+JWT_ACTIVE_KID = os.getenv("JWT_ACTIVE_KID")
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
@@ -1,96 +1,290 @@
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 import os
+import threading
+import time
+import zlib
+from src.core.config import (
+    GOOGLE_REFRESH_MARGIN,
+    GOOGLE_CREDENTIAL_CACHE_TTL,
+    GOOGLE_CREDENTIAL_CACHE_SIZE,
+    ALLOW_ANONYMOUS_GOOGLE,
+)
+from src.core.context import current_user_id
+from src.core.metrics import metrics
+from src.core.resilience import CallerError
+from src.utils.config import GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET
+
+GOOGLE_TOKEN_URI = "https://oauth2.googleapis.com/token"
 
 CALENDAR_SCOPES = [
     "https://www.googleapis.com/auth/calendar"
 ]
 CALENDAR_TOKEN = "token_calendar.json"
 
+GMAIL_SCOPES = [
+    "https://www.googleapis.com/auth/gmail.send",
+     "https://www.googleapis.com/auth/gmail.readonly",
+]
+GMAIL_TOKEN = "token_gmail.json"
 
-def get_calendar_credentials():
-    creds = None
+CONTACTS_SCOPES = [
+    "https://www.googleapis.com/auth/contacts.readonly"
+]
+CONTACTS_TOKEN = "token_contacts.json"
 
-    if os.path.exists(CALENDAR_TOKEN):
-        creds = Credentials.from_authorized_user_file(
-            CALENDAR_TOKEN,
-            CALENDAR_SCOPES
-        )
+# scope set name -> (scopes, token file)
+SCOPE_SETS = {
+    "calendar": (CALENDAR_SCOPES, CALENDAR_TOKEN),
+    "gmail": (GMAIL_SCOPES, GMAIL_TOKEN),
+    "contacts": (CONTACTS_SCOPES, CONTACTS_TOKEN),
+}
+
+
+class CredentialManager:
+    """
+    Keeps Google credentials in memory, one per scope set.
+
+    - Expired credentials are refreshed single-flight: concurrent callers
+      wait on one refresh instead of each hitting the token endpoint.
+    - Credentials close to expiry are refreshed in the background while
+      callers keep using the still-valid token.
+    - Token files are written by a background thread, off the request path.
+    """
+
+    def __init__(self, refresh_margin=GOOGLE_REFRESH_MARGIN):
+        self.refresh_margin = timedelta(seconds=refresh_margin)
+        self._creds = {}
+        self._locks = {name: threading.Lock() for name in SCOPE_SETS}
+        self._background = set()
+        self._background_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="google-creds")
+
+    def get(self, scope_set):
+        creds = self._creds.get(scope_set)
+        if creds is not None and creds.valid:
+            if self._expiring_soon(creds):
+                self._refresh_in_background(scope_set)
+            return creds
+
+        with self._locks[scope_set]:
+            # Another caller may have refreshed while we waited.
+            creds = self._creds.get(scope_set)
+            if creds is not None and creds.valid:
+                return creds
+
+            creds = self._load(scope_set, creds)
+            self._creds[scope_set] = creds
+            return creds
+
+    def _expiring_soon(self, creds):
+        if creds.expiry is None:
+            return False
+        return creds.expiry - datetime.utcnow() < self.refresh_margin
+
+    def _load(self, scope_set, creds):
+        scopes, token_file = SCOPE_SETS[scope_set]
+
+        if creds is None and os.path.exists(token_file):
+            creds = Credentials.from_authorized_user_file(token_file, scopes)
+
+        if creds is not None and creds.valid:
+            return creds
 
-    if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             creds.refresh(Request())
+            metrics.incr("google_creds.refreshes")
         else:
             flow = InstalledAppFlow.from_client_secrets_file(
                 "credentials.json",
-                CALENDAR_SCOPES
+                scopes
             )
             creds = flow.run_local_server(port=0)
 
-        with open(CALENDAR_TOKEN, "w") as token:
-            token.write(creds.to_json())
+        self._persist(token_file, creds)
+        return creds
 
-    return creds
+    def _refresh_in_background(self, scope_set):
+        with self._background_lock:
+            if scope_set in self._background:
+                return
+            self._background.add(scope_set)
 
+        def refresh():
+            try:
+                with self._locks[scope_set]:
+                    creds = self._creds.get(scope_set)
+                    if creds is None or not self._expiring_soon(creds) or not creds.refresh_token:
+                        return
+                    creds.refresh(Request())
+                    metrics.incr("google_creds.refreshes")
+                    self._persist(SCOPE_SETS[scope_set][1], creds)
+            except Exception:
+                metrics.incr("google_creds.refresh_errors")
+            finally:
+                with self._background_lock:
+                    self._background.discard(scope_set)
 
-GMAIL_SCOPES = [
-    "https://www.googleapis.com/auth/gmail.send",
-     "https://www.googleapis.com/auth/gmail.readonly",
-]
-GMAIL_TOKEN = "token_gmail.json"
+        self._executor.submit(refresh)
 
+    def _persist(self, token_file, creds):
+        data = creds.to_json()
 
-def get_gmail_credentials():
-    creds = None
+        def write():
+            tmp_file = f"{token_file}.tmp"
+            with open(tmp_file, "w") as token:
+                token.write(data)
+            os.replace(tmp_file, token_file)
 
-    if os.path.exists(GMAIL_TOKEN):
-        creds = Credentials.from_authorized_user_file(
-            GMAIL_TOKEN,
-            GMAIL_SCOPES
-        )
+        self._executor.submit(write)
 
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                "credentials.json",
-                GMAIL_SCOPES
+
+class GoogleAccountNotConnected(CallerError):
+    pass
+
+
+class UserCredentialCache:
+    """
+    Per-user Google credentials stored by /google/callback in the
+    google_tokens collection.
+
+    - Loaded credentials are kept in memory for up to ttl seconds (LRU
+      bounded by max_entries), so reconnects and revocations are seen
+      without a restart.
+    - Refreshes are single-flight per user (striped locks), and the new
+      token is written back with one conditional update keyed on the old
+      access token; if another worker refreshed first, its write stands.
+    """
+
+    _STRIPES = 64
+
+    def __init__(self, ttl=GOOGLE_CREDENTIAL_CACHE_TTL, max_entries=GOOGLE_CREDENTIAL_CACHE_SIZE,
+                 refresh_margin=GOOGLE_REFRESH_MARGIN):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.refresh_margin = timedelta(seconds=refresh_margin)
+        self._entries = OrderedDict()
+        self._entries_lock = threading.Lock()
+        self._locks = [threading.Lock() for _ in range(self._STRIPES)]
+
+    def get(self, user_id, scopes):
+        creds = self._cached(user_id)
+        if creds is None or not creds.valid or self._expiring_soon(creds):
+            with self._locks[zlib.crc32(user_id.encode()) % self._STRIPES]:
+                creds = self._cached(user_id)
+                if creds is None:
+                    creds = self._load(user_id)
+                if (not creds.valid or self._expiring_soon(creds)) and creds.refresh_token:
+                    self._refresh(user_id, creds)
+                self._store(user_id, creds)
+
+        missing = set(scopes) - set(creds.scopes or [])
+        if missing:
+            raise GoogleAccountNotConnected(
+                f"Google account is missing scopes {sorted(missing)}; reconnect via /google/connect"
             )
-            creds = flow.run_local_server(port=0)
+        return creds
 
-        with open(GMAIL_TOKEN, "w") as token:
-            token.write(creds.to_json())
+    def invalidate(self, user_id=None):
+        with self._entries_lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
 
-    return creds
+    def _cached(self, user_id):
+        with self._entries_lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            creds, loaded_at = entry
+            if time.monotonic() - loaded_at > self.ttl:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return creds
 
-CONTACTS_SCOPES = [
-    "https://www.googleapis.com/auth/contacts.readonly"
-]
-CONTACTS_TOKEN = "token_contacts.json"
+    def _store(self, user_id, creds):
+        with self._entries_lock:
+            if user_id not in self._entries:
+                self._entries[user_id] = (creds, time.monotonic())
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
 
+    def _expiring_soon(self, creds):
+        if creds.expiry is None:
+            return False
+        return creds.expiry - datetime.utcnow() < self.refresh_margin
 
-def get_contacts_credentials():
-    creds = None
+    def _collection(self):
+        # Imported here so the file-based path works without MongoDB
+        from src.db.mongo import get_sync_db
+        return get_sync_db().google_tokens
+
+    def _load(self, user_id):
+        doc = self._collection().find_one({"user_id": user_id})
+        if not doc or not doc.get("access_token"):
+            raise GoogleAccountNotConnected("No Google account connected; connect one via /google/connect")
 
-    if os.path.exists(CONTACTS_TOKEN):
-        creds = Credentials.from_authorized_user_file(
-            CONTACTS_TOKEN,
-            CONTACTS_SCOPES
+        metrics.incr("google_creds.user_loads")
+        return Credentials(
+            token=doc["access_token"],
+            refresh_token=doc.get("refresh_token"),
+            token_uri=GOOGLE_TOKEN_URI,
+            client_id=GOOGLE_CLIENT_ID,
+            client_secret=GOOGLE_CLIENT_SECRET,
+            scopes=doc.get("scopes"),
+            expiry=doc.get("expiry")
         )
 
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                "credentials.json",  # Your OAuth client secrets
-                CONTACTS_SCOPES
-            )
-            creds = flow.run_local_server(port=0)
+    def _refresh(self, user_id, creds):
+        old_token = creds.token
+        creds.refresh(Request())
+        metrics.incr("google_creds.refreshes")
+
+        result = self._collection().update_one(
+            {"user_id": user_id, "access_token": old_token},
+            {"$set": {
+                "access_token": creds.token,
+                "refresh_token": creds.refresh_token,
+                "expiry": creds.expiry,
+                "updated_at": datetime.utcnow()
+            }}
+        )
+        if result.matched_count == 0:
+            metrics.incr("google_creds.writeback_conflicts")
+
+
+credential_manager = CredentialManager()
+user_credentials = UserCredentialCache()
+
 
-        with open(CONTACTS_TOKEN, "w") as token:
-            token.write(creds.to_json())
+def get_credentials(scope_set):
+    """
+    Credentials of the user in the request context (see
+    src.core.context). Without one, the process-wide token files are used
+    only if ALLOW_ANONYMOUS_GOOGLE is set.
+    """
+    user_id = current_user_id.get()
+    if user_id is None:
+        if not ALLOW_ANONYMOUS_GOOGLE:
+            raise GoogleAccountNotConnected("Sign in and connect a Google account via /google/connect")
+        return credential_manager.get(scope_set)
+    return user_credentials.get(user_id, SCOPE_SETS[scope_set][0])
 
-    return creds
\ No newline at end of file
+
+def get_calendar_credentials():
+    return get_credentials("calendar")
+
+
+def get_gmail_credentials():
+    return get_credentials("gmail")
+
+
+def get_contacts_credentials():
+    return get_credentials("contacts")
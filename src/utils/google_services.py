@@ -0,0 +1,63 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from googleapiclient.discovery import build
+from src.core.config import GOOGLE_SERVICE_CACHE_SIZE
+from src.core.metrics import metrics
+
+_services = OrderedDict()
+_lock = threading.Lock()
+
+
+def credential_identity(creds):
+    """
+    Stable identity for a credential across refreshes: the refresh token
+    (or the access token when there is none) plus the OAuth client id.
+    """
+    secret = getattr(creds, "refresh_token", None) or getattr(creds, "token", None) or ""
+    client_id = getattr(creds, "client_id", None) or ""
+    return hashlib.sha256(f"{client_id}:{secret}".encode()).hexdigest()
+
+
+def get_service(api, version, creds):
+    """
+    Cached googleapiclient service object, keyed by (API, version,
+    credential identity, thread).
+
+    httplib2 connections are not thread-safe, so each worker thread gets
+    its own service object. The access token is stored with the entry,
+    and a refreshed credential causes a rebuild.
+    """
+    key = (api, version, credential_identity(creds), threading.get_ident())
+
+    with _lock:
+        entry = _services.get(key)
+        if entry is not None and entry[1] == creds.token:
+            _services.move_to_end(key)
+            metrics.incr("google_services.hits")
+            return entry[0]
+
+    metrics.incr("google_services.misses")
+    service = build(api, version, credentials=creds, cache_discovery=False)
+
+    with _lock:
+        _services[key] = (service, creds.token)
+        _services.move_to_end(key)
+        while len(_services) > GOOGLE_SERVICE_CACHE_SIZE:
+            _services.popitem(last=False)
+            metrics.incr("google_services.evictions")
+
+    return service
+
+
+def invalidate_services(creds=None):
+    """
+    Drop cached services for one credential, or all of them.
+    """
+    with _lock:
+        if creds is None:
+            _services.clear()
+            return
+        identity = credential_identity(creds)
+        for key in [k for k in _services if k[2] == identity]:
+            del _services[key]
@@ -0,0 +1,69 @@
+"""
+Shared test setup and the in-memory MongoDB stand-in.
+
+MemoryDB is also used by benchmarks/bench_auth.py --memory, so importing
+this module must not change any settings; the test-only environment is
+applied in pytest_configure instead.
+"""
+import itertools
+import os
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+
+def pytest_configure(config):
+    # Settings are read at import time, so they must be in place before any
+    # src module is imported. Low bcrypt cost and thread offload keep tests fast.
+    os.environ.setdefault("JWT_SECRET", "test-secret")
+    os.environ.setdefault("PPLX_API_KEY", "test-key")
+    os.environ["BCRYPT_ROUNDS"] = "5"
+    os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+
+class _InsertResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+
+class MemoryCollection:
+    """
+    The subset of a motor collection the repositories use: equality
+    queries, unique fields (DuplicateKeyError) and $set updates with upsert.
+    """
+
+    def __init__(self, unique=()):
+        self.docs = []
+        self.unique = unique
+        self._ids = itertools.count(1)
+
+    async def find_one(self, query):
+        for doc in self.docs:
+            if all(doc.get(k) == v for k, v in query.items()):
+                return doc
+        return None
+
+    async def insert_one(self, doc):
+        for field in self.unique:
+            if await self.find_one({field: doc.get(field)}):
+                raise DuplicateKeyError(f"duplicate {field}")
+        doc = dict(doc, _id=next(self._ids))
+        self.docs.append(doc)
+        return _InsertResult(doc["_id"])
+
+    async def update_one(self, query, update, upsert=False):
+        doc = await self.find_one(query)
+        if doc is not None:
+            doc.update(update["$set"])
+        elif upsert:
+            await self.insert_one({**query, **update["$set"]})
+
+
+class MemoryDB:
+    def __init__(self):
+        self.users = MemoryCollection(unique=("email",))
+        self.google_tokens = MemoryCollection(unique=("user_id",))
+
+
+@pytest.fixture
+def memory_db():
+    return MemoryDB()
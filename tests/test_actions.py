@@ -0,0 +1,123 @@
+"""
+Action dispatch: deadlines, per-upstream pools, breaker and bulkhead accounting.
+"""
+import asyncio
+import threading
+import pytest
+from pydantic import BaseModel
+
+from src.agents import actions
+from src.agents.actions import ActionSpec, arun_action, run_action
+from src.core import resilience
+from src.core.context import current_user_id
+
+
+class Empty(BaseModel):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience, "_bulkheads", {})
+    monkeypatch.setattr(resilience, "_executors", {})
+    yield
+    resilience.shutdown_executors()
+
+
+@pytest.fixture
+def register(monkeypatch):
+    def register(name, handler, upstream, timeout=1.0):
+        spec = ActionSpec(name=name, input_model=Empty, handler=handler, upstream=upstream, timeout=timeout)
+        monkeypatch.setitem(actions.ACTIONS, name, spec)
+
+    return register
+
+
+def test_timed_out_threads_only_exhaust_their_upstream(monkeypatch, register):
+    monkeypatch.setitem(resilience.UPSTREAM_CONCURRENCY, "hung", 2)
+    release = threading.Event()
+    register("hang", lambda params: release.wait(), upstream="hung", timeout=0.05)
+    register("ok", lambda params: {"thread": threading.current_thread().name}, upstream="healthy")
+
+    async def run():
+        # Hang every thread the "hung" pool has, then some
+        for _ in range(4):
+            assert (await arun_action("hang", {}))["error"] == "Action timed out"
+        return await arun_action("ok", {})
+
+    try:
+        result = asyncio.run(run())
+    finally:
+        release.set()
+
+    assert result["thread"].startswith("upstream-healthy")
+    assert len(resilience.get_executor("hung")._threads) == 2
+
+
+def test_sync_path_applies_deadline(register):
+    release = threading.Event()
+    register("hang", lambda params: release.wait(), upstream="hung", timeout=0.05)
+
+    try:
+        assert run_action("hang", {})["error"] == "Action timed out"
+    finally:
+        release.set()
+
+
+def test_handlers_see_the_request_context(register):
+    register("whoami", lambda params: {"user": current_user_id.get()}, upstream="people")
+
+    async def run():
+        current_user_id.set("user-1")
+        return await arun_action("whoami", {})
+
+    assert asyncio.run(run()) == {"user": "user-1"}
+    token = current_user_id.set("user-2")
+    try:
+        assert run_action("whoami", {}) == {"user": "user-2"}
+    finally:
+        current_user_id.reset(token)
+
+
+def test_per_host_upstreams_use_the_family_limit(monkeypatch):
+    monkeypatch.setitem(resilience.UPSTREAM_CONCURRENCY, "scrape", 3)
+
+    assert resilience.get_bulkhead("scrape:a.test").max_concurrent == 3
+    assert resilience.get_bulkhead("scrape:a.test") is not resilience.get_bulkhead("scrape:b.test")
+
+
+def test_error_results_open_the_breaker(register):
+    register("broken", lambda params: {"error": "HttpError 500"}, upstream="flaky")
+    breaker = resilience.get_breaker("flaky")
+
+    for _ in range(breaker.failure_threshold):
+        assert asyncio.run(arun_action("broken", {})) == {"error": "HttpError 500"}
+
+    result = asyncio.run(arun_action("broken", {}))
+    assert result["error"] == "Upstream unavailable"
+    assert result["reason"] == "circuit open"
+
+
+def test_caller_errors_are_rejected_without_a_breaker_failure(register):
+    def no_account(params):
+        raise resilience.CallerError("No Google account connected")
+
+    register("mail", no_account, upstream="gmail")
+
+    assert asyncio.run(arun_action("mail", {})) == {"error": "No Google account connected", "action": "mail"}
+    assert run_action("mail", {}) == {"error": "No Google account connected", "action": "mail"}
+    assert resilience.get_breaker("gmail").failures == 0
+
+
+def test_full_bulkhead_is_reported_as_unavailable(monkeypatch, register):
+    monkeypatch.setitem(resilience.UPSTREAM_CONCURRENCY, "busy", 1)
+    register("ok", lambda params: {"ok": True}, upstream="busy")
+    bulkhead = resilience.get_bulkhead("busy")
+    bulkhead.max_wait = 0.01
+
+    with bulkhead.acquire():
+        result = run_action("ok", {})
+
+    assert result["reason"] == "too many concurrent calls"
+    assert run_action("ok", {}) == {"ok": True}
@@ -0,0 +1,80 @@
+"""
+/auth signup and login through the FastAPI app with the in-memory
+MongoDB stand-in.
+"""
+import asyncio
+import httpx
+from fastapi import FastAPI
+from passlib.hash import bcrypt
+
+from src.db import mongo
+from src.db.repositories import UsersRepository
+from src.routers.auth import router
+
+
+def make_app(db):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[mongo.get_users_repository] = lambda: UsersRepository(db)
+    return app
+
+
+def post(app, path, payload):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, json=payload)
+
+    return asyncio.run(run())
+
+
+def test_signup_then_login(memory_db):
+    app = make_app(memory_db)
+    credentials = {"email": "a@example.com", "password": "secret"}
+
+    assert post(app, "/auth/signup", credentials).status_code == 200
+    response = post(app, "/auth/login", credentials)
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+
+
+def test_duplicate_signup_is_400(memory_db):
+    app = make_app(memory_db)
+    credentials = {"email": "a@example.com", "password": "secret"}
+
+    assert post(app, "/auth/signup", credentials).status_code == 200
+    response = post(app, "/auth/signup", credentials)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "User already exists"
+
+
+def test_login_wrong_password_is_401(memory_db):
+    app = make_app(memory_db)
+    post(app, "/auth/signup", {"email": "a@example.com", "password": "secret"})
+
+    response = post(app, "/auth/login", {"email": "a@example.com", "password": "wrong"})
+    assert response.status_code == 401
+
+
+def test_login_rehashes_outdated_cost_factor(memory_db):
+    app = make_app(memory_db)
+    # Below BCRYPT_ROUNDS (5 in conftest), so needs_update() is true
+    old_hash = bcrypt.using(rounds=4).hash("secret")
+    asyncio.run(memory_db.users.insert_one({"email": "a@example.com", "password": old_hash}))
+
+    response = post(app, "/auth/login", {"email": "a@example.com", "password": "secret"})
+
+    assert response.status_code == 200
+    new_hash = memory_db.users.docs[0]["password"]
+    assert new_hash != old_hash
+    assert new_hash.startswith("$2b$05$")
+    assert post(app, "/auth/login", {"email": "a@example.com", "password": "secret"}).status_code == 200
+
+
+def test_login_keeps_current_hash(memory_db):
+    app = make_app(memory_db)
+    post(app, "/auth/signup", {"email": "a@example.com", "password": "secret"})
+    stored = memory_db.users.docs[0]["password"]
+
+    assert post(app, "/auth/login", {"email": "a@example.com", "password": "secret"}).status_code == 200
+    assert memory_db.users.docs[0]["password"] == stored
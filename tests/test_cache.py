@@ -0,0 +1,121 @@
+"""
+Response cache: memory and SQLite backends, exact-match keys and the
+opt-in semantic index.
+"""
+import pytest
+
+from src.core.cache import MemoryBackend, ResponseCache, SemanticIndex, SQLiteBackend
+
+ROUTER_PROMPT = "You are a router."
+SUMMARY_PROMPT = "You are a professional news editor."
+
+
+def completion(text):
+    return {"choices": [{"message": {"content": text}}]}
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(MemoryBackend(), semantic_index=SemanticIndex(threshold=0.8))
+
+
+def test_router_output_never_matches_semantically(cache):
+    cached = "Email Ana that I will be late to the meeting because of traffic on the highway"
+    query = "Email Ana that I will be late to the meeting because of rain on the highway"
+    cache.set("m", ROUTER_PROMPT, cached, completion(cached))
+
+    assert cache.get("m", ROUTER_PROMPT, query) is None
+
+
+def test_opted_in_calls_match_near_duplicates(cache):
+    cached = "Summarize: chip makers rally as AI demand grows"
+    cache.set("m", SUMMARY_PROMPT, cached, completion("summary"), semantic=True)
+
+    hit = cache.get("m", SUMMARY_PROMPT, "Summarize: chip makers rally as AI demand grows strongly", semantic=True)
+    assert hit == completion("summary")
+
+
+def test_normalization_collapses_whitespace_but_keeps_case(cache):
+    cache.set("m", ROUTER_PROMPT, "Email  Ana\n the report", completion("a"))
+
+    assert cache.get("m", ROUTER_PROMPT, "  Email Ana the report ") == completion("a")
+    assert cache.get("m", ROUTER_PROMPT, "email ana the report") is None
+
+
+def test_entries_are_scoped_by_model_and_prompt(cache):
+    cache.set("m", ROUTER_PROMPT, "hello", completion("a"))
+
+    assert cache.get("other-model", ROUTER_PROMPT, "hello") is None
+    assert cache.get("m", SUMMARY_PROMPT, "hello") is None
+
+
+@pytest.mark.parametrize("cached, query", [
+    ("Summarize the news for bob@example.com please", "Summarize the news for bob@example.org please"),
+    ("Summarize the top 5 stories about chip makers", "Summarize the top 7 stories about chip makers"),
+    ("Summarize https://a.test/story about chip makers", "Summarize https://b.test/story about chip makers"),
+])
+def test_semantic_hits_require_identical_entities(cache, cached, query):
+    cache.set("m", SUMMARY_PROMPT, cached, completion("x"), semantic=True)
+    assert cache.get("m", SUMMARY_PROMPT, query, semantic=True) is None
+
+
+def test_semantic_index_evicts_oldest():
+    index = SemanticIndex(threshold=0.5, max_entries=2)
+    index.add("s", "alpha beta", "k1")
+    index.add("s", "gamma delta", "k2")
+    index.add("s", "epsilon zeta", "k3")
+
+    assert index.nearest("s", "alpha beta") is None
+    assert index.nearest("s", "epsilon zeta") == "k3"
+
+
+def test_memory_backend_expires_entries():
+    backend = MemoryBackend(max_entries=10, max_bytes=1000)
+    backend.set("k", b"v", ttl=-1)
+
+    assert backend.get("k") is None
+    assert backend.bytes_held() == 0
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_entries=2, max_bytes=1000)
+    backend.set("a", b"1", 60)
+    backend.set("b", b"2", 60)
+    backend.get("a")
+    backend.set("c", b"3", 60)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+    assert backend.get("c") == b"3"
+
+
+def test_memory_backend_is_bounded_by_bytes():
+    backend = MemoryBackend(max_entries=100, max_bytes=10)
+    backend.set("a", b"123456", 60)
+    backend.set("b", b"123456", 60)
+
+    assert backend.get("a") is None
+    assert backend.bytes_held() == 6
+
+
+def test_sqlite_backend_round_trip_expiry_and_eviction(tmp_path):
+    backend = SQLiteBackend(path=str(tmp_path / "cache.sqlite3"), max_entries=2)
+    backend.set("a", b"1", 60)
+    backend.set("gone", b"x", -1)
+
+    assert backend.get("a") == b"1"
+    assert backend.get("gone") is None
+
+    backend.set("b", b"2", 60)
+    backend.set("c", b"3", 60)
+    assert backend.get("c") == b"3"
+    assert backend.bytes_held() == 2
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = ResponseCache(SQLiteBackend(path=path))
+    reader = ResponseCache(SQLiteBackend(path=path))
+
+    writer.set("m", ROUTER_PROMPT, "hello", completion("a"))
+    assert reader.get("m", ROUTER_PROMPT, "hello") == completion("a")
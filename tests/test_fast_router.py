@@ -0,0 +1,114 @@
+"""
+Fast router rules and the router decision log it is trained from.
+"""
+import json
+import pytest
+
+from src.agents import personal_assistant
+from src.agents.fast_router import FastRouter, evaluate
+from src.agents.personal_assistant import PersonalAssistant
+
+
+class _Row(list):
+    def argmax(self):
+        return max(range(len(self)), key=self.__getitem__)
+
+
+class StubClassifier:
+    classes_ = ["calendar_agent", "email_agent"]
+
+    def __init__(self, probabilities):
+        self.probabilities = probabilities
+
+    def predict_proba(self, messages):
+        return [_Row(self.probabilities)]
+
+
+@pytest.fixture
+def router():
+    return FastRouter(model_path=None)
+
+
+@pytest.mark.parametrize("message, agent", [
+    ("send the report to bob@example.com", "email_agent"),
+    ("summarize my unread emails", "email_agent"),
+    ("scrape https://example.com/pricing", "researcher_agent"),
+    ("search the web for python asyncio tutorials", "researcher_agent"),
+    ("what are the latest news on AI", "google_news_agent"),
+    ("schedule a dentist appointment tomorrow at 5pm", "calendar_agent"),
+    ("add a meeting with Sara to my calendar", "calendar_agent"),
+    ("phone number of Ana", "contacts_agent"),
+    ("email address of Ana", "contacts_agent"),
+])
+def test_obvious_messages_route_locally(router, message, agent):
+    assert router.route(message) == agent
+
+
+@pytest.mark.parametrize("message", [
+    # Conflicting agents: a calendar rule plus an email verb
+    "remind me to email Bob",
+    # Several intents joined by a conjunction
+    "email Bob the notes and put a meeting with him tomorrow",
+    "find Ana's email address and then send her the agenda",
+    "look up flights and book a meeting",
+    # Nothing obvious
+    "hello there",
+    "what's the weather like",
+])
+def test_ambiguous_messages_fall_through(router, message):
+    assert router.route(message) is None
+
+
+def test_multi_intent_skips_the_classifier():
+    router = FastRouter(model_path=None)
+    router.classifier = StubClassifier([0.99, 0.01])
+
+    assert router.route("schedule a call and email the team") is None
+    assert router.route("hello there") == "calendar_agent"
+
+
+def test_classifier_below_confidence_falls_through():
+    router = FastRouter(model_path=None, min_confidence=0.9)
+    router.classifier = StubClassifier([0.6, 0.4])
+
+    assert router.route("hello there") is None
+
+
+def test_evaluate_counts_only_confident_routes(router):
+    report = evaluate(router, [
+        {"message": "summarize my unread emails", "agent": "email_agent"},
+        {"message": "phone number of Ana", "agent": "email_agent"},
+        {"message": "hello there", "agent": "none"},
+    ])
+
+    assert report["hits"] == 2
+    assert report["precision"] == 0.5
+    assert report["llm_calls_saved"] == 1
+
+
+@pytest.fixture
+def decision_log(tmp_path, monkeypatch):
+    path = tmp_path / "decisions.jsonl"
+    monkeypatch.setattr(personal_assistant, "_decision_listener", None)
+    personal_assistant._start_decision_log(str(path))
+    yield path
+    personal_assistant._stop_decision_log()
+
+
+def test_decisions_are_written_by_the_listener(decision_log):
+    assistant = PersonalAssistant(fused_routing=False, fast_routing=False)
+
+    assistant._log_decision("email bob", {"agent": "email_agent", "message": "email bob"})
+    assistant._log_decision("two things", {"tasks": []})
+    personal_assistant._stop_decision_log()
+
+    lines = decision_log.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [{"message": "email bob", "agent": "email_agent"}]
+
+
+def test_no_log_configured_is_a_no_op(monkeypatch):
+    monkeypatch.setattr(personal_assistant, "_decision_listener", None)
+    personal_assistant._start_decision_log(None)
+
+    assert personal_assistant._decision_listener is None
+    PersonalAssistant(fused_routing=False, fast_routing=False)._log_decision("x", {"agent": "none"})
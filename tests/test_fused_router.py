@@ -0,0 +1,87 @@
+"""
+Fused router output validation, and multi-intent fan-out in fused mode.
+"""
+import asyncio
+import json
+
+from src.agents.fused_router import FUSED_ROUTER_PROMPT, TASKS, parse_fused_output
+from src.agents.personal_assistant import PersonalAssistant
+
+TWO_TASKS = [
+    {"id": "t1", "agent": "contacts_agent", "message": "find Ana's email", "depends_on": []},
+    {"id": "t2", "agent": "email_agent", "message": "email Ana the agenda", "depends_on": ["t1"]},
+]
+
+
+def completion(payload):
+    return {"choices": [{"message": {"content": json.dumps(payload)}}]}
+
+
+def test_prompt_documents_the_tasks_format():
+    assert '"tasks"' in FUSED_ROUTER_PROMPT
+    assert '"depends_on"' in FUSED_ROUTER_PROMPT
+
+
+def test_parse_tasks():
+    assert parse_fused_output(json.dumps({"tasks": TWO_TASKS})) == (TASKS, TWO_TASKS)
+
+
+def test_parse_valid_action():
+    raw = json.dumps({"agent": "contacts_agent", "action": "find_contact_email", "data": {"name": "Ana"}})
+    assert parse_fused_output(raw) == ("contacts_agent", {"action": "find_contact_email", "data": {"name": "Ana"}})
+
+
+def test_parse_action_of_another_agent_or_bad_payload():
+    wrong_agent = json.dumps({"agent": "email_agent", "action": "find_contact_email", "data": {"name": "Ana"}})
+    bad_payload = json.dumps({"agent": "contacts_agent", "action": "find_contact_email", "data": {}})
+
+    assert parse_fused_output(wrong_agent) == ("email_agent", None)
+    assert parse_fused_output(bad_payload) == ("contacts_agent", None)
+
+
+def test_parse_untrusted_output():
+    assert parse_fused_output("not json") == (None, None)
+    assert parse_fused_output(json.dumps({"agent": "nobody"})) == (None, None)
+    assert parse_fused_output(json.dumps({"agent": "none"})) == ("none", None)
+
+
+class FakeAgent:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def invoke(self, message):
+        return completion(self.payload)
+
+    async def ainvoke(self, message):
+        return completion(self.payload)
+
+
+def fused_assistant(monkeypatch, payload):
+    assistant = PersonalAssistant(fused_routing=True, fast_routing=False)
+    assistant.fused_agent = FakeAgent(payload)
+    ran = []
+    monkeypatch.setattr(assistant, "_run_tasks", lambda tasks: ran.append(tasks) or "sync")
+
+    async def arun_tasks(tasks):
+        ran.append(tasks)
+        return "async"
+
+    monkeypatch.setattr(assistant, "_arun_tasks", arun_tasks)
+    return assistant, ran
+
+
+def test_fused_mode_fans_out_multi_intent_messages(monkeypatch):
+    assistant, ran = fused_assistant(monkeypatch, {"tasks": TWO_TASKS})
+
+    assert assistant.invoke("find Ana's email and send her the agenda") == "sync"
+    assert asyncio.run(assistant.ainvoke("find Ana's email and send her the agenda")) == "async"
+    assert ran == [TWO_TASKS, TWO_TASKS]
+
+
+def test_fused_stream_routes_to_tasks(monkeypatch):
+    assistant, _ = fused_assistant(monkeypatch, {"tasks": TWO_TASKS})
+
+    route, error = asyncio.run(assistant._aroute("find Ana's email and send her the agenda"))
+    assert error is None
+    assert route["tasks"] == TWO_TASKS
+    assert route["source"] == "fused"
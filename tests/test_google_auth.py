@@ -0,0 +1,23 @@
+"""
+Anonymous requests only reach the server's token files when
+ALLOW_ANONYMOUS_GOOGLE is set.
+"""
+import pytest
+
+from src.utils import google_auth
+from src.utils.google_auth import GoogleAccountNotConnected, get_gmail_credentials
+
+
+def test_anonymous_request_without_opt_in_is_rejected(monkeypatch):
+    monkeypatch.setattr(google_auth, "ALLOW_ANONYMOUS_GOOGLE", False)
+    monkeypatch.setattr(google_auth.credential_manager, "get", pytest.fail)
+
+    with pytest.raises(GoogleAccountNotConnected):
+        get_gmail_credentials()
+
+
+def test_anonymous_request_with_opt_in_uses_token_files(monkeypatch):
+    monkeypatch.setattr(google_auth, "ALLOW_ANONYMOUS_GOOGLE", True)
+    monkeypatch.setattr(google_auth.credential_manager, "get", lambda scope_set: f"file:{scope_set}")
+
+    assert get_gmail_credentials() == "file:gmail"
@@ -0,0 +1,86 @@
+"""
+On-disk scrape cache: freshness rules, blob accounting and concurrent stores.
+"""
+import glob
+import os
+import threading
+
+from src.tools.http_cache import HttpCache, content_hash, freshness_lifetime
+
+CACHEABLE = {"Cache-Control": "max-age=60", "ETag": '"v1"'}
+
+
+def test_freshness_lifetime():
+    assert freshness_lifetime({"Cache-Control": "no-store"}) is None
+    assert freshness_lifetime({"Cache-Control": "no-cache"}) == 0
+    assert freshness_lifetime({"Cache-Control": "public, max-age=120"}) == 120
+    assert freshness_lifetime({"ETag": '"v1"'}) == 0
+    assert freshness_lifetime({}) is None
+
+
+def test_store_and_lookup(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=10_000)
+    cache.store("https://a.test/", CACHEABLE, "h1", "# A")
+
+    markdown, fresh, validators = cache.lookup("https://a.test/")
+    assert markdown == "# A"
+    assert fresh
+    assert validators == {"If-None-Match": '"v1"'}
+
+
+def test_concurrent_stores_of_the_same_page(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=10_000_000)
+    markdown = "x" * 100_000
+    digest = content_hash(markdown.encode())
+    errors = []
+
+    def store(i):
+        try:
+            cache.store(f"https://a.test/{i}", CACHEABLE, digest, markdown)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=store, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.markdown_for(digest) == markdown
+    assert cache.bytes_held() == len(markdown)
+    assert glob.glob(os.path.join(str(tmp_path), "*.tmp")) == []
+
+
+def test_stores_racing_eviction_keep_accounting_consistent(tmp_path):
+    # Every store evicts the previous page, so stores and evictions interleave
+    cache = HttpCache(str(tmp_path), max_bytes=1_500)
+    errors = []
+
+    def store(worker):
+        try:
+            for i in range(20):
+                cache.store(f"https://{worker}.test/{i}", CACHEABLE, f"{worker}-{i}", "y" * 1_000)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=store, args=(w,)) for w in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.bytes_held() <= 1_500
+    blobs = glob.glob(os.path.join(str(tmp_path), "*.md"))
+    assert sum(os.path.getsize(b) for b in blobs) == cache.bytes_held()
+
+
+def test_changed_page_drops_its_old_blob(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=10_000)
+    cache.store("https://a.test/", CACHEABLE, "old", "# Old")
+    cache.store("https://a.test/", CACHEABLE, "new", "# New")
+
+    assert cache.markdown_for("old") is None
+    assert cache.lookup("https://a.test/")[0] == "# New"
+    assert cache.bytes_held() == len("# New")
@@ -0,0 +1,47 @@
+"""
+Token signing and verification with kid-based key rotation.
+"""
+import pytest
+from fastapi import HTTPException
+from jose import JWTError, jwt as jose_jwt
+
+from src.auth import jwt
+from src.auth.dependencies import get_current_user
+
+
+@pytest.fixture(autouse=True)
+def rotation(monkeypatch):
+    monkeypatch.setattr(jwt, "JWT_SECRETS", {"k1": "old-secret", "k2": "new-secret"})
+    monkeypatch.setattr(jwt, "JWT_ACTIVE_KID", "k2")
+    jwt._verified.clear()
+
+
+def test_tokens_signed_with_the_active_kid_verify():
+    token = jwt.create_access_token({"user_id": "u1"})
+
+    assert jose_jwt.get_unverified_header(token)["kid"] == "k2"
+    assert get_current_user(token) == "u1"
+
+
+def test_tokens_of_a_retired_but_listed_kid_still_verify():
+    token = jose_jwt.encode({"user_id": "u1"}, "old-secret", algorithm="HS256", headers={"kid": "k1"})
+    assert get_current_user(token) == "u1"
+
+
+@pytest.mark.parametrize("kid", ["k9", ["k1"], {"k": 1}, 7])
+def test_unknown_kid_is_an_invalid_token(kid):
+    token = jose_jwt.encode({"user_id": "u1"}, "whatever", algorithm="HS256", headers={"kid": kid})
+
+    with pytest.raises(JWTError):
+        jwt.decode_access_token(token)
+    with pytest.raises(HTTPException) as error:
+        get_current_user(token)
+    assert error.value.status_code == 401
+
+
+def test_unlisted_active_kid_fails_the_startup_check(monkeypatch):
+    jwt.check_signing_config()
+
+    monkeypatch.setattr(jwt, "JWT_ACTIVE_KID", "k3")
+    with pytest.raises(ValueError):
+        jwt.check_signing_config()
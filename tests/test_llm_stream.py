@@ -0,0 +1,127 @@
+"""
+PerplexityLLM.astream against a mock SSE upstream: a consumer that
+disconnects mid-stream must not count against the perplexity breaker.
+"""
+import asyncio
+import json
+import httpx
+import pytest
+
+from src.core import llm, resilience
+from src.core.llm import PerplexityLLM
+from src.core.resilience import CLOSED, Bulkhead, aguard, get_breaker
+
+
+def sse(*deltas):
+    for delta in deltas:
+        chunk = {"choices": [{"delta": {"content": delta}}]}
+        yield f"data: {json.dumps(chunk)}\n\n".encode()
+
+
+class Upstream:
+    """
+    Streams the given deltas, then hangs until the client goes away.
+    """
+
+    def __init__(self, deltas, status_code=200):
+        self.deltas = deltas
+        self.status_code = status_code
+        self.closed = False
+
+    async def body(self):
+        try:
+            for line in sse(*self.deltas):
+                yield line
+            await asyncio.Event().wait()
+        finally:
+            self.closed = True
+
+    def handler(self, request):
+        return httpx.Response(self.status_code, content=self.body())
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience, "_bulkheads", {})
+
+
+def use_upstream(monkeypatch, upstream):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler))
+    monkeypatch.setattr(llm, "get_async_client", lambda: client)
+
+
+def test_early_close_does_not_trip_breaker(monkeypatch):
+    upstream = Upstream(["Hello", " world"])
+    use_upstream(monkeypatch, upstream)
+    model = PerplexityLLM(use_cache=False)
+    breaker = get_breaker("perplexity")
+
+    async def run():
+        for _ in range(breaker.failure_threshold + 1):
+            stream = model.astream("system", "user")
+            assert await stream.__anext__() == "Hello"
+            await stream.aclose()
+
+    asyncio.run(run())
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+    assert upstream.closed
+
+
+def test_disconnect_mid_stream_does_not_trip_breaker(monkeypatch):
+    upstream = Upstream(["Hello", " world"])
+    use_upstream(monkeypatch, upstream)
+    model = PerplexityLLM(use_cache=False)
+    breaker = get_breaker("perplexity")
+
+    async def consume(received):
+        async for delta in model.astream("system", "user"):
+            received.append(delta)
+
+    async def run():
+        for _ in range(breaker.failure_threshold + 1):
+            received = []
+            # Like Starlette on a client disconnect: cancel the body iterator
+            # while it waits for the next token
+            task = asyncio.create_task(consume(received))
+            while len(received) < 2:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert received == ["Hello", " world"]
+
+    asyncio.run(run())
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+    assert upstream.closed
+
+
+def test_stream_does_not_hold_the_bulkhead_while_yielding(monkeypatch):
+    use_upstream(monkeypatch, Upstream(["Hello", " world"]))
+    model = PerplexityLLM(use_cache=False)
+    resilience._bulkheads["perplexity"] = Bulkhead("perplexity", 1, max_wait=0.01)
+
+    async def run():
+        stream = model.astream("system", "user")
+        await stream.__anext__()
+        # The only slot is free while the consumer is between tokens
+        async with aguard("perplexity"):
+            pass
+        await stream.aclose()
+
+    asyncio.run(run())
+
+
+def test_error_status_counts_as_failure(monkeypatch):
+    use_upstream(monkeypatch, Upstream([], status_code=503))
+    model = PerplexityLLM(use_cache=False)
+
+    async def run():
+        async for _ in model.astream("system", "user"):
+            pass
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+    assert get_breaker("perplexity").failures == 1
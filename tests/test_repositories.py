@@ -0,0 +1,78 @@
+"""
+Repository tests against the in-memory MongoDB stand-in (tests/conftest.py),
+which has unique indexes on users.email and google_tokens.user_id.
+"""
+import asyncio
+from datetime import datetime
+import pytest
+
+from src.db.repositories import UsersRepository, GoogleTokensRepository, UserAlreadyExists
+
+
+def test_create_user_and_find_by_email(memory_db):
+    users = UsersRepository(memory_db)
+
+    async def run():
+        user_id = await users.create("a@example.com", "hash")
+        return user_id, await users.find_by_email("a@example.com")
+
+    user_id, doc = asyncio.run(run())
+    assert doc["password"] == "hash"
+    assert str(doc["_id"]) == user_id
+
+
+def test_create_duplicate_email_raises(memory_db):
+    users = UsersRepository(memory_db)
+
+    async def run():
+        await users.create("a@example.com", "hash")
+        await users.create("a@example.com", "other")
+
+    with pytest.raises(UserAlreadyExists):
+        asyncio.run(run())
+
+
+def test_update_password(memory_db):
+    users = UsersRepository(memory_db)
+
+    async def run():
+        await users.create("a@example.com", "old")
+        doc = await users.find_by_email("a@example.com")
+        await users.update_password(doc["_id"], "new")
+        return await users.find_by_email("a@example.com")
+
+    assert asyncio.run(run())["password"] == "new"
+
+
+def test_google_tokens_oauth_flow(memory_db):
+    tokens = GoogleTokensRepository(memory_db)
+    expiry = datetime(2030, 1, 1)
+
+    async def run():
+        await tokens.set_oauth_state("user-1", "state-1")
+        by_state = await tokens.find_by_state("state-1")
+        await tokens.save_tokens("user-1", {
+            "access_token": "access",
+            "refresh_token": "refresh",
+            "expiry": expiry,
+            "oauth_state": None,
+        })
+        return by_state, await tokens.find_by_user("user-1"), await tokens.find_by_state("state-1")
+
+    by_state, saved, stale_state = asyncio.run(run())
+    assert by_state["user_id"] == "user-1"
+    assert saved["access_token"] == "access"
+    assert saved["expiry"] == expiry
+    assert stale_state is None
+
+
+def test_set_oauth_state_updates_existing_user(memory_db):
+    tokens = GoogleTokensRepository(memory_db)
+
+    async def run():
+        await tokens.set_oauth_state("user-1", "first")
+        await tokens.set_oauth_state("user-1", "second")
+
+    asyncio.run(run())
+    assert len(memory_db.google_tokens.docs) == 1
+    assert memory_db.google_tokens.docs[0]["oauth_state"] == "second"
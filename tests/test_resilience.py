@@ -0,0 +1,276 @@
+"""
+Circuit breaker state changes, guard()/aguard() accounting and bulkhead limits.
+"""
+import asyncio
+import threading
+import pytest
+
+from src.core import resilience
+from src.core.resilience import (
+    CLOSED, OPEN, HALF_OPEN,
+    Bulkhead,
+    CallerError,
+    CircuitBreaker,
+    UpstreamUnavailable,
+    aguard,
+    get_breaker,
+    guard,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience, "_bulkheads", {})
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker("t", failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("t", failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker("t", failure_threshold=1, reset_timeout=0)
+    trip(breaker)
+
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker("t", failure_threshold=5, reset_timeout=0)
+    trip(breaker)
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_ignored_probe_releases_the_slot():
+    breaker = CircuitBreaker("t", failure_threshold=1, reset_timeout=0)
+    trip(breaker)
+    assert breaker.allow()
+
+    breaker.record_ignored()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+def test_guard_counts_exceptions_and_error_results():
+    breaker = get_breaker("up")
+
+    with pytest.raises(RuntimeError):
+        with guard("up"):
+            raise RuntimeError("boom")
+    with guard("up") as call:
+        call.check({"error": "HttpError"})
+
+    assert breaker.failures == 2
+
+
+def test_guard_ignores_caller_errors():
+    breaker = get_breaker("up")
+
+    with pytest.raises(CallerError):
+        with guard("up"):
+            raise CallerError("no account")
+
+    assert breaker.failures == 0
+
+
+def test_guard_rejects_when_open():
+    trip(get_breaker("up"))
+
+    with pytest.raises(UpstreamUnavailable):
+        with guard("up"):
+            pass
+
+
+def test_aguard_counts_deadline_timeouts():
+    async def run():
+        async with aguard("up"):
+            await asyncio.wait_for(asyncio.sleep(1), timeout=0.01)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run())
+    assert get_breaker("up").failures == 1
+
+
+def test_aguard_ignores_cancellation():
+    async def run():
+        started = asyncio.Event()
+
+        async def guarded():
+            async with aguard("up"):
+                started.set()
+                await asyncio.sleep(1)
+
+        task = asyncio.create_task(guarded())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert get_breaker("up").failures == 0
+
+
+def test_closing_a_generator_inside_aguard_is_not_a_failure():
+    breaker = get_breaker("up")
+
+    async def tokens():
+        async with aguard("up"):
+            for token in ("a", "b", "c"):
+                yield token
+
+    async def run():
+        for _ in range(breaker.failure_threshold):
+            stream = tokens()
+            await stream.__anext__()
+            await stream.aclose()
+
+    asyncio.run(run())
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+
+
+def test_cancelled_probe_releases_the_slot():
+    breaker = get_breaker("up")
+    breaker.reset_timeout = 0
+    trip(breaker)
+
+    async def tokens():
+        async with aguard("up"):
+            yield "a"
+            yield "b"
+
+    async def run():
+        stream = tokens()
+        await stream.__anext__()
+        await stream.aclose()
+
+    asyncio.run(run())
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+def test_bulkhead_cap_is_shared_by_sync_and_async_callers():
+    bulkhead = Bulkhead("b", 1, max_wait=0.05)
+
+    async def run():
+        async with bulkhead.aacquire():
+            pass
+
+    with bulkhead.acquire():
+        with pytest.raises(UpstreamUnavailable):
+            asyncio.run(run())
+
+    asyncio.run(run())
+    assert bulkhead.active == 0
+
+
+def test_sync_caller_waits_for_async_holder():
+    bulkhead = Bulkhead("b", 1, max_wait=0.05)
+
+    async def run():
+        async with bulkhead.aacquire():
+            with pytest.raises(UpstreamUnavailable):
+                await asyncio.to_thread(lambda: bulkhead.acquire().__enter__())
+
+    asyncio.run(run())
+    assert bulkhead.active == 0
+
+
+def test_async_waiter_gets_slot_released_by_a_thread():
+    bulkhead = Bulkhead("b", 1, max_wait=2)
+    holding = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with bulkhead.acquire():
+            holding.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    holding.wait()
+
+    async def run():
+        asyncio.get_running_loop().call_later(0.05, release.set)
+        async with bulkhead.aacquire():
+            return bulkhead.active
+
+    assert asyncio.run(run()) == 1
+    thread.join()
+
+
+def test_async_callers_never_exceed_the_cap():
+    bulkhead = Bulkhead("b", 2, max_wait=2)
+    peak = 0
+
+    async def one():
+        nonlocal peak
+        async with bulkhead.aacquire():
+            peak = max(peak, bulkhead.active)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(one() for _ in range(10)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert bulkhead.active == 0
+
+
+def test_bulkhead_works_across_event_loops():
+    bulkhead = Bulkhead("b", 1, max_wait=1)
+
+    async def contend():
+        async def one():
+            async with bulkhead.aacquire():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(one(), one())
+
+    # e.g. a throwaway asyncio.run() loop on the sync path, then the app loop
+    asyncio.run(contend())
+    asyncio.run(contend())
+    assert bulkhead.active == 0
+
+
+def test_cancelled_waiter_does_not_take_a_slot():
+    bulkhead = Bulkhead("b", 1, max_wait=2)
+
+    async def run():
+        async with bulkhead.aacquire():
+            waiter = asyncio.create_task(bulkhead.aacquire().__aenter__())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        return bulkhead.active
+
+    assert asyncio.run(run()) == 0
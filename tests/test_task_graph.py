@@ -0,0 +1,123 @@
+"""
+Task graph normalization, ordering and the async scheduler.
+"""
+import asyncio
+import pytest
+
+from src.agents.personal_assistant import PersonalAssistant
+from src.agents.task_graph import (
+    TaskGraphError,
+    normalize_tasks,
+    run_task_graph,
+    topological_order,
+    with_context,
+)
+
+
+@pytest.mark.parametrize("tasks", [
+    "find Ana's email",
+    ["find Ana's email"],
+    [{"agent": "contacts_agent", "message": "find Ana", "depends_on": "t0"}],
+    [{"agent": "contacts_agent", "message": {"name": "Ana"}}],
+])
+def test_malformed_tasks_raise_task_graph_error(tasks):
+    with pytest.raises(TaskGraphError):
+        normalize_tasks(tasks)
+
+
+def test_fills_in_ids_and_dependencies():
+    tasks = normalize_tasks([
+        {"agent": "contacts_agent", "message": "find Ana's email"},
+        {"agent": "email_agent", "message": "email her", "depends_on": ["t1"]},
+    ])
+
+    assert tasks == [
+        {"id": "t1", "agent": "contacts_agent", "message": "find Ana's email", "depends_on": []},
+        {"id": "t2", "agent": "email_agent", "message": "email her", "depends_on": ["t1"]},
+    ]
+
+
+def test_assistant_reports_malformed_tasks_as_an_error():
+    assistant = PersonalAssistant(fused_routing=False, fast_routing=False)
+
+    assert assistant._run_tasks(["find Ana's email"])["error"] == "Task 1 is not an object"
+    assert asyncio.run(assistant._arun_tasks(["find Ana's email"]))["error"] == "Task 1 is not an object"
+
+
+def task(task_id, *depends_on):
+    return {"id": task_id, "agent": "email_agent", "message": task_id, "depends_on": list(depends_on)}
+
+
+def test_topological_order_puts_dependencies_first():
+    tasks = normalize_tasks([task("send", "find"), task("find"), task("log", "send", "find")])
+    order = [t["id"] for t in topological_order(tasks)]
+
+    assert order.index("find") < order.index("send") < order.index("log")
+
+
+@pytest.mark.parametrize("tasks, message", [
+    ([task("a", "b"), task("b", "a")], "Cycle detected"),
+    ([task("a", "a")], "Cycle detected"),
+    ([task("a"), task("a")], "Duplicate task ids"),
+    ([task("a", "missing")], "unknown tasks"),
+])
+def test_invalid_graphs(tasks, message):
+    with pytest.raises(TaskGraphError, match=message):
+        normalize_tasks(tasks)
+
+
+def test_with_context_appends_dependency_results():
+    assert with_context(task("a"), {}) == "a"
+    assert with_context(task("b", "a"), {"a": "ana@example.com"}) == (
+        "b\n\nResults of previous steps: {'a': 'ana@example.com'}"
+    )
+
+
+def test_independent_tasks_run_concurrently_and_dependents_wait():
+    tasks = normalize_tasks([task("left"), task("right"), task("join", "left", "right")])
+    running, peak, seen = 0, 0, {}
+
+    async def run_task(t, dependency_results):
+        nonlocal running, peak
+        seen[t["id"]] = dependency_results
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return f"{t['id']} done"
+
+    results = asyncio.run(run_task_graph(tasks, run_task, max_concurrency=4))
+
+    assert peak == 2
+    assert seen["join"] == {"left": "left done", "right": "right done"}
+    assert results["join"] == "join done"
+
+
+def test_failed_task_skips_its_dependents():
+    tasks = normalize_tasks([task("find"), task("send", "find"), task("other")])
+
+    async def run_task(t, dependency_results):
+        if t["id"] == "find":
+            raise RuntimeError("contact not found")
+        return "ok"
+
+    results = asyncio.run(run_task_graph(tasks, run_task))
+
+    assert results["find"] == {"error": "contact not found"}
+    assert results["send"]["skipped"]
+    assert results["other"] == "ok"
+
+
+def test_max_concurrency_is_respected():
+    tasks = normalize_tasks([task(f"t{i}") for i in range(6)])
+    running, peak = 0, 0
+
+    async def run_task(t, dependency_results):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    asyncio.run(run_task_graph(tasks, run_task, max_concurrency=2))
+    assert peak == 2